@@ -4,11 +4,24 @@ Add Taxonomy IDs to Concept Dependency CSV
 
 Reads the concept dependency CSV and assigns appropriate taxonomy IDs
 based on concept labels and position in the concept hierarchy.
+
+The taxonomy config is compiled once into a TaxonomyMatcher: a single regex
+over every keyword and an interval table over the ID ranges, so each concept
+costs one regex scan of its label and one binary search, however many
+taxonomies and keywords the config has.
 """
 
 import csv
+import os
 import re
-from typing import Dict, List
+import sys
+from bisect import bisect_left
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Tuple
+
+# Profiling hooks shared by this skill's scripts (profile_hooks.py, next to this script)
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+from profile_hooks import phase, start_profile
 
 
 def assign_taxonomy(concept_id: int, concept_label: str, taxonomy_config: dict = None) -> str:
@@ -60,10 +73,140 @@ def assign_taxonomy(concept_id: int, concept_label: str, taxonomy_config: dict =
     return 'MISC'
 
 
+def _trie_pattern(node: dict) -> str:
+    """Regex for the keywords of a trie ('' marks the end of a keyword).
+
+    Each character is matched once per branch, and a greedy optional group
+    around the continuations makes the first match the longest keyword.
+    """
+    branches = [re.escape(ch) + _trie_pattern(child) for ch, child in sorted(node.items()) if ch]
+    if not branches:
+        return ''
+    if '' in node:
+        return '(?:' + '|'.join(branches) + ')?'
+    return branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+
+
+class TaxonomyMatcher:
+    """A taxonomy config compiled for fast assignment.
+
+    assign() gives the same result as assign_taxonomy() with the same config:
+    the first taxonomy, in config order, whose ID range contains the concept
+    or one of whose keywords occurs in the lowercased label, unless one of
+    its exclude keywords occurs there too.
+
+    Taxonomies are bits in an int mask, in config order. Keywords become one
+    trie-shaped regex that finds the longest keyword starting at each
+    position of the label. Every keyword occurring in the label is a prefix
+    of one of those matches, so each keyword carries the masks of the
+    keywords that are its prefixes. ID ranges become sorted boundaries with
+    the mask of the taxonomies covering each boundary and each gap between
+    boundaries.
+    """
+
+    def __init__(self, taxonomy_config: dict = None):
+        """
+        Compile a taxonomy config (see assign_taxonomy for the format).
+
+        Args:
+            taxonomy_config: Taxonomy configuration dictionary; None assigns MISC to everything
+        """
+        self.tax_ids = list(taxonomy_config or {})
+        configs = [taxonomy_config[tax_id] for tax_id in self.tax_ids]
+
+        # Taxonomies listing each keyword, and excluding it
+        keyword_masks: Dict[str, int] = {}
+        exclude_masks: Dict[str, int] = {}
+        for bit, config in enumerate(configs):
+            for kw in config.get('keywords', []):
+                keyword_masks[kw] = keyword_masks.get(kw, 0) | 1 << bit
+            for kw in config.get('exclude', []):
+                exclude_masks[kw] = exclude_masks.get(kw, 0) | 1 << bit
+
+        # An empty keyword occurs in every label
+        self.always_keyword = keyword_masks.pop('', 0)
+        self.always_exclude = exclude_masks.pop('', 0)
+
+        # Masks of each keyword together with the keywords that are its prefixes
+        keywords = set(keyword_masks) | set(exclude_masks)
+        self.masks: Dict[str, Tuple[int, int]] = {}
+        trie: dict = {}
+        for kw in keywords:
+            matched = excluded = 0
+            node = trie
+            for end in range(1, len(kw) + 1):
+                node = node.setdefault(kw[end - 1], {})
+                matched |= keyword_masks.get(kw[:end], 0)
+                excluded |= exclude_masks.get(kw[:end], 0)
+            node[''] = {}
+            self.masks[kw] = (matched, excluded)
+
+        # Lookahead, so matches starting inside an earlier match are found too
+        self.pattern = re.compile('(?=(' + _trie_pattern(trie) + '))') if keywords else None
+
+        # Range boundaries; at[i] covers bounds[i] itself, between[i] the gap before it
+        self.bounds = sorted({value for config in configs for value in config.get('range', (0, 0))})
+        self.at = [0] * len(self.bounds)
+        self.between = [0] * (len(self.bounds) + 1)
+        for bit, config in enumerate(configs):
+            range_start, range_end = config.get('range', (0, 0))
+            for i, value in enumerate(self.bounds):
+                if range_start <= value <= range_end:
+                    self.at[i] |= 1 << bit
+                    if i and range_start <= self.bounds[i - 1]:
+                        self.between[i] |= 1 << bit
+
+    def range_mask(self, concept_id: int) -> int:
+        """Taxonomies whose ID range contains the concept."""
+        i = bisect_left(self.bounds, concept_id)
+        if i < len(self.bounds) and self.bounds[i] == concept_id:
+            return self.at[i]
+        return self.between[i]
+
+    def assign(self, concept_id: int, concept_label: str) -> str:
+        """Taxonomy ID of one concept."""
+        matched, excluded = self.always_keyword, self.always_exclude
+        if self.pattern is not None:
+            for kw in set(self.pattern.findall(concept_label.lower())):
+                kw_matched, kw_excluded = self.masks[kw]
+                matched |= kw_matched
+                excluded |= kw_excluded
+
+        candidates = (self.range_mask(concept_id) | matched) & ~excluded
+        if not candidates:
+            return 'MISC'
+        return self.tax_ids[(candidates & -candidates).bit_length() - 1]
+
+    def assign_rows(self, rows: Iterable[Dict[str, str]]) -> Iterator[Dict]:
+        """
+        Add a TaxonomyID to a stream of concept CSV rows.
+
+        Args:
+            rows: Rows with ConceptID, ConceptLabel and Dependencies (e.g. a csv.DictReader)
+
+        Yields:
+            Rows with ConceptID, ConceptLabel, Dependencies and TaxonomyID
+        """
+        for row in rows:
+            concept_id = int(row['ConceptID'])
+            concept_label = row['ConceptLabel']
+            yield {
+                'ConceptID': concept_id,
+                'ConceptLabel': concept_label,
+                'Dependencies': row['Dependencies'],
+                'TaxonomyID': self.assign(concept_id, concept_label)
+            }
+
+
 def add_taxonomy_to_csv(input_csv: str, output_csv: str, taxonomy_config: dict = None):
     """
     Read CSV, add taxonomy column, and write updated CSV.
 
+    Rows are streamed from the input to the output through a TaxonomyMatcher
+    compiled once from the config. The output is written to a temp file and
+    renamed at the end, so input_csv may also be the output; if a row fails,
+    the temp file is removed and output_csv is left untouched.
+
     Args:
         input_csv: Path to input CSV file
         output_csv: Path to output CSV file
@@ -72,51 +215,48 @@ def add_taxonomy_to_csv(input_csv: str, output_csv: str, taxonomy_config: dict =
     Returns:
         Dictionary of taxonomy counts
     """
-    rows = []
-    with open(input_csv, 'r', encoding='utf-8') as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            concept_id = int(row['ConceptID'])
-            concept_label = row['ConceptLabel']
-            taxonomy_id = assign_taxonomy(concept_id, concept_label, taxonomy_config)
+    matcher = TaxonomyMatcher(taxonomy_config)
 
-            rows.append({
-                'ConceptID': concept_id,
-                'ConceptLabel': concept_label,
-                'Dependencies': row['Dependencies'],
-                'TaxonomyID': taxonomy_id
-            })
-
-    # Write updated CSV
-    with open(output_csv, 'w', encoding='utf-8', newline='') as f:
-        fieldnames = ['ConceptID', 'ConceptLabel', 'Dependencies', 'TaxonomyID']
-        writer = csv.DictWriter(f, fieldnames=fieldnames)
-        writer.writeheader()
-        writer.writerows(rows)
-
-    # Count concepts per taxonomy
+    # Count concepts per taxonomy while the rows are written
     taxonomy_counts = {}
-    for row in rows:
-        tax = row['TaxonomyID']
-        taxonomy_counts[tax] = taxonomy_counts.get(tax, 0) + 1
+    total = 0
+    tmp_file = Path(output_csv).with_name(Path(output_csv).name + '.tmp')
+    try:
+        with phase('parse', input_csv), open(input_csv, 'r', encoding='utf-8') as f_in, \
+                open(tmp_file, 'w', encoding='utf-8', newline='') as f_out:
+            fieldnames = ['ConceptID', 'ConceptLabel', 'Dependencies', 'TaxonomyID']
+            writer = csv.DictWriter(f_out, fieldnames=fieldnames)
+            writer.writeheader()
+            for row in matcher.assign_rows(csv.DictReader(f_in)):
+                writer.writerow(row)
+                tax = row['TaxonomyID']
+                taxonomy_counts[tax] = taxonomy_counts.get(tax, 0) + 1
+                total += 1
+    except BaseException:
+        # Leave no partial output behind when a row cannot be converted
+        if tmp_file.exists():
+            tmp_file.unlink()
+        raise
+    os.replace(tmp_file, output_csv)
 
     print(f"✅ Taxonomy added to CSV: {output_csv}")
     print(f"\n📊 Taxonomy Distribution:")
     for tax in sorted(taxonomy_counts.keys()):
         count = taxonomy_counts[tax]
-        percentage = (count / len(rows)) * 100
+        percentage = (count / total) * 100
         print(f"  {tax:6s}: {count:3d} concepts ({percentage:5.1f}%)")
 
     return taxonomy_counts
 
 
 if __name__ == "__main__":
-    import sys
     import json
 
+    start_profile('add-taxonomy')
+
     # Parse command line arguments
     if len(sys.argv) < 3:
-        print("Usage: python add-taxonomy.py <input_csv> <output_csv> [taxonomy_config.json]")
+        print("Usage: python add-taxonomy.py <input_csv> <output_csv> [taxonomy_config.json] [--profile]")
         print("\nExample taxonomy_config.json format:")
         print(json.dumps({
             'FOUNDATION': {
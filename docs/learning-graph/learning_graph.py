@@ -0,0 +1,566 @@
+#!/usr/bin/env python3
+"""
+Learning Graph Core
+
+Loads a learning graph into compact, integer-indexed arrays shared by
+analyze-graph.py, taxonomy-distribution.py and validate-learning-graph.py.
+Concepts are rows numbered 0..n-1 in file order:
+
+    ids[row]           ConceptID
+    labels[row]        ConceptLabel (a plain list of strings)
+    taxonomy[row]      index into taxonomy_ids (TaxonomyID values in order of first use)
+    indptr, indices    CSR adjacency: the prerequisites of row i are
+                       indices[indptr[i]:indptr[i + 1]], as rows (-1 for an unknown ID)
+    rindptr, rindices  reverse CSR: the rows that depend on row i, in file order
+
+This is the layout of the binary sidecar written by csv-to-json.py --csr.
+When a ConceptID appears on several rows, edges resolve to the last of them.
+
+With NumPy installed the arrays are NumPy int32 arrays and degrees, orphans,
+taxonomy counts, depth levels and connected components are computed with
+vectorized operations. Without it the arrays are array('i') and the same
+results are computed with plain loops.
+
+TaxonomyTally streams learning-graph CSVs row by row instead, keeping only
+the concept count and the lowest-ID concepts of each taxonomy, so reports
+over many books run in memory bounded by the number of taxonomies.
+
+Usage:
+    from learning_graph import LearningGraph, TaxonomyTally
+
+    graph = LearningGraph.from_csv('learning-graph.csv')
+    print(graph.node_count, graph.edge_count, graph.taxonomy_counts())
+    depth, ordered = graph.depth_levels()
+
+    tally = TaxonomyTally(sample_size=15)
+    tally.add_csv('learning-graph.csv')
+    print(tally.counts, tally.samples())
+"""
+
+import csv
+import heapq
+from array import array
+from itertools import accumulate, islice
+from typing import Dict, List, Optional, Sequence, Set, Tuple
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# CSV rows parsed per batch; columns are converted a batch at a time
+CSV_BATCH_ROWS = 65536
+
+
+def _int_array(values: array):
+    """Return an int array in the active backend (zero-copy for NumPy)."""
+    if np is not None:
+        return np.frombuffer(values, dtype=np.intc).astype(np.int32, copy=False)
+    return values
+
+
+def _offsets(degrees: array) -> array:
+    """Turn per-row counts into CSR row offsets."""
+    indptr = array('i', [0])
+    indptr.extend(accumulate(degrees))
+    return indptr
+
+
+class LearningGraph:
+    """A learning graph as CSR arrays (see the module docstring for the layout)."""
+
+    def __init__(self, ids: array, labels: List[str], taxonomy: array,
+                 taxonomy_ids: List[str], degrees: array, prereq_ids: array):
+        """Build the graph from per-row arrays.
+
+        Args:
+            ids: ConceptID of each row
+            labels: ConceptLabel of each row
+            taxonomy: Index into taxonomy_ids of each row
+            taxonomy_ids: TaxonomyID values in order of first use
+            degrees: Number of listed prerequisites of each row
+            prereq_ids: ConceptIDs of all prerequisites, row after row
+        """
+        self.labels = labels
+        self.taxonomy_ids = taxonomy_ids
+        # Filled in by from_vis_json: edges with an unknown endpoint, as
+        # (from, to) in input order, and ConceptIDs used by more than one node
+        self.invalid_edges: List[Tuple[int, int]] = []
+        self.duplicate_ids: Set[int] = set()
+        self.ids = _int_array(ids)
+        self.taxonomy = _int_array(taxonomy)
+        self.indptr = _int_array(_offsets(degrees))
+        self.indices = self._resolve(prereq_ids)
+        self.rindptr, self.rindices = self._reverse()
+
+    @classmethod
+    def from_csv(cls, csv_path: str) -> 'LearningGraph':
+        """Load a learning-graph CSV (ConceptID, ConceptLabel, Dependencies, TaxonomyID).
+
+        ConceptName is accepted in place of ConceptLabel, and a missing
+        TaxonomyID column leaves every concept in the '' taxonomy. Fields
+        missing from the end of a short row are read as empty.
+        """
+        ids, taxonomy, degrees, prereq_ids = array('i'), array('i'), array('i'), array('i')
+        labels = []
+        taxonomy_index = {}
+
+        with open(csv_path, 'r', encoding='utf-8', newline='') as f:
+            reader = csv.reader(f)
+            header = next(reader, [])
+            id_col = header.index('ConceptID')
+            label_col = header.index('ConceptLabel' if 'ConceptLabel' in header else 'ConceptName')
+            deps_col = header.index('Dependencies')
+            tax_col = header.index('TaxonomyID') if 'TaxonomyID' in header else None
+            width = len(header)
+
+            rows = filter(None, reader)
+            while True:
+                batch = list(islice(rows, CSV_BATCH_ROWS))
+                if not batch:
+                    break
+                if min(map(len, batch)) < width:
+                    # zip() stops at the shortest row, so pad short rows first
+                    batch = [row + [''] * (width - len(row)) for row in batch]
+                columns = list(zip(*batch))
+                ids.extend(map(int, columns[id_col]))
+                labels.extend(columns[label_col])
+                if tax_col is None:
+                    taxonomy.extend(array('i', [taxonomy_index.setdefault('', 0)]) * len(batch))
+                else:
+                    taxonomy.extend([taxonomy_index.setdefault(tax, len(taxonomy_index))
+                                     for tax in columns[tax_col]])
+                deps = columns[deps_col]
+                degrees.extend([d.count('|') + 1 if d else 0 for d in deps])
+                joined = '|'.join(filter(None, deps))
+                if joined:
+                    prereq_ids.extend(map(int, joined.split('|')))
+
+        return cls(ids, labels, taxonomy, list(taxonomy_index), degrees, prereq_ids)
+
+    @classmethod
+    def from_vis_json(cls, data: dict) -> 'LearningGraph':
+        """Build the graph from vis-network JSON as written by csv-to-json.py.
+
+        Edges point from a concept to its prerequisite. Nodes and edges are
+        read in a single pass each, which also records repeated node IDs in
+        duplicate_ids and edges with an unknown endpoint in invalid_edges.
+        Edges whose source node does not exist are left out of the CSR arrays.
+        """
+        ids, taxonomy = array('i'), array('i')
+        labels = []
+        taxonomy_index = {}
+        position: Dict[int, int] = {}
+        duplicates = set()
+        for row, node in enumerate(data.get('nodes', [])):
+            concept_id = node['id']
+            if concept_id in position:
+                duplicates.add(concept_id)
+            position[concept_id] = row
+            ids.append(concept_id)
+            labels.append(node.get('label', str(concept_id)))
+            taxonomy.append(taxonomy_index.setdefault(node.get('group', ''), len(taxonomy_index)))
+
+        by_row: Dict[int, List[int]] = {}
+        invalid = []
+        for edge in data.get('edges', []):
+            source, target = edge['from'], edge['to']
+            row = position.get(source)
+            if row is None or target not in position:
+                invalid.append((source, target))
+            if row is not None:
+                by_row.setdefault(row, []).append(target)
+
+        degrees, prereq_ids = array('i'), array('i')
+        for row in range(len(ids)):
+            prereqs = by_row.get(row, ())
+            degrees.append(len(prereqs))
+            prereq_ids.extend(prereqs)
+
+        graph = cls(ids, labels, taxonomy, list(taxonomy_index), degrees, prereq_ids)
+        graph.invalid_edges = invalid
+        graph.duplicate_ids = duplicates
+        return graph
+
+    @property
+    def node_count(self) -> int:
+        return len(self.labels)
+
+    @property
+    def edge_count(self) -> int:
+        return len(self.indices)
+
+    def _resolve(self, prereq_ids: array):
+        """Map prerequisite ConceptIDs to rows (-1 for unknown IDs; the last duplicate wins)."""
+        if np is None:
+            position = {concept_id: row for row, concept_id in enumerate(self.ids)}
+            return array('i', (position.get(pid, -1) for pid in prereq_ids))
+
+        wanted = _int_array(prereq_ids)
+        if not len(self.ids):
+            return np.full(len(wanted), -1, dtype=np.int32)
+        order = np.argsort(self.ids, kind='stable')
+        sorted_ids = self.ids[order]
+        pos = np.searchsorted(sorted_ids, wanted, side='right') - 1
+        clipped = np.clip(pos, 0, None)
+        found = (pos >= 0) & (sorted_ids[clipped] == wanted)
+        return np.where(found, order[clipped], -1).astype(np.int32)
+
+    def _edge_rows(self):
+        """Row (dependent concept) of every entry in indices."""
+        if np is None:
+            return array('i', (row for row in range(self.node_count)
+                               for _ in range(self.indptr[row + 1] - self.indptr[row])))
+        return np.repeat(np.arange(self.node_count, dtype=np.int32), np.diff(self.indptr))
+
+    def _reverse(self):
+        """Build the reverse CSR (prerequisite row -> dependent rows) from known edges."""
+        n = self.node_count
+        if np is None:
+            dependents = [[] for _ in range(n)]
+            for row, prereq in zip(self._edge_rows(), self.indices):
+                if prereq >= 0:
+                    dependents[prereq].append(row)
+            rindices = array('i')
+            for children in dependents:
+                rindices.extend(children)
+            return _offsets(array('i', map(len, dependents))), rindices
+
+        known = self.indices >= 0
+        sources = self.indices[known]
+        targets = self._edge_rows()[known]
+        order = np.argsort(sources, kind='stable')
+        rindptr = np.zeros(n + 1, dtype=np.int32)
+        np.cumsum(np.bincount(sources, minlength=n), out=rindptr[1:])
+        return rindptr, targets[order]
+
+    def prerequisites(self, row: int) -> Sequence[int]:
+        """Rows listed as prerequisites of a row (-1 for unknown IDs)."""
+        return self.indices[self.indptr[row]:self.indptr[row + 1]]
+
+    def dependents(self, row: int) -> Sequence[int]:
+        """Rows that list a row as a prerequisite."""
+        return self.rindices[self.rindptr[row]:self.rindptr[row + 1]]
+
+    def indegree(self):
+        """Number of concepts that depend on each row."""
+        if np is None:
+            return array('i', (self.rindptr[row + 1] - self.rindptr[row]
+                               for row in range(self.node_count)))
+        return np.diff(self.rindptr)
+
+    def outdegree(self):
+        """Number of listed prerequisites of each row, unknown IDs included."""
+        if np is None:
+            return array('i', (self.indptr[row + 1] - self.indptr[row]
+                               for row in range(self.node_count)))
+        return np.diff(self.indptr)
+
+    @staticmethod
+    def histogram(values) -> Dict[int, int]:
+        """Count how many rows have each value, in increasing order of value."""
+        if np is None:
+            counts: Dict[int, int] = {}
+            for value in values:
+                counts[value] = counts.get(value, 0) + 1
+            return dict(sorted(counts.items()))
+        counts = np.bincount(values) if len(values) else np.zeros(0, dtype=np.int64)
+        return {int(value): int(count) for value, count in enumerate(counts) if count}
+
+    @staticmethod
+    def ranked(values, limit: int) -> List[int]:
+        """Rows of the limit largest values, in decreasing order (ties in row order)."""
+        if np is None:
+            return sorted(range(len(values)), key=values.__getitem__, reverse=True)[:limit]
+        return np.argsort(-np.asarray(values), kind='stable')[:limit].tolist()
+
+    def _rows_where(self, mask) -> List[int]:
+        if np is None:
+            return [row for row, keep in enumerate(mask) if keep]
+        return np.flatnonzero(mask).tolist()
+
+    def foundational(self) -> List[int]:
+        """Rows with no prerequisites."""
+        if np is None:
+            return self._rows_where(degree == 0 for degree in self.outdegree())
+        return self._rows_where(self.outdegree() == 0)
+
+    def orphans(self) -> List[int]:
+        """Rows that have prerequisites but that no other concept depends on."""
+        if np is None:
+            return self._rows_where(i == 0 and o > 0 for i, o in zip(self.indegree(), self.outdegree()))
+        return self._rows_where((self.indegree() == 0) & (self.outdegree() > 0))
+
+    def isolated(self) -> List[int]:
+        """Rows without any edge in either direction, invalid edges included.
+
+        A repeated ConceptID counts as connected when any of its rows is.
+        """
+        connected = {to for _, to in self.invalid_edges}
+        rows = self._rows_where(
+            [i == 0 and o == 0 for i, o in zip(self.indegree(), self.outdegree())]
+            if np is None else (self.indegree() == 0) & (self.outdegree() == 0))
+        if self.duplicate_ids:
+            alone = set(rows)
+            connected.update(int(self.ids[row]) for row in range(self.node_count)
+                             if row not in alone and self.ids[row] in self.duplicate_ids)
+        return [row for row in rows if self.ids[row] not in connected] if connected else rows
+
+    def taxonomy_counts(self) -> Dict[str, int]:
+        """Number of concepts per TaxonomyID, in order of first use."""
+        if np is None:
+            counts = [0] * len(self.taxonomy_ids)
+            for code in self.taxonomy:
+                counts[code] += 1
+        else:
+            counts = np.bincount(self.taxonomy, minlength=len(self.taxonomy_ids)).tolist()
+        return dict(zip(self.taxonomy_ids, counts))
+
+    def concepts_by_taxonomy(self, limit: Optional[int] = None) -> Dict[str, List[Tuple[int, str]]]:
+        """(ConceptID, label) pairs of each taxonomy sorted by ID, at most limit per taxonomy."""
+        groups: Dict[str, List[Tuple[int, str]]] = {tax: [] for tax in self.taxonomy_ids}
+        if np is None:
+            rows = sorted(range(self.node_count), key=lambda row: (self.taxonomy[row], self.ids[row]))
+        else:
+            rows = np.lexsort((self.ids, self.taxonomy)).tolist()
+        for row in rows:
+            members = groups[self.taxonomy_ids[self.taxonomy[row]]]
+            if limit is None or len(members) < limit:
+                members.append((int(self.ids[row]), self.labels[row]))
+        return groups
+
+    def depth_levels(self) -> Tuple[Sequence[int], int]:
+        """Length of the longest prerequisite chain ending at each row.
+
+        Runs Kahn's algorithm one frontier at a time: a concept is released in
+        the level after its last prerequisite, so its level is its depth.
+        Concepts on a cycle, or depending on one, keep depth 0.
+
+        Returns:
+            Tuple of (depth per row, number of rows that received a depth);
+            the graph is a DAG exactly when that number equals node_count
+        """
+        n = self.node_count
+        if np is None:
+            remaining = [0] * n
+            for row, prereq in zip(self._edge_rows(), self.indices):
+                if prereq >= 0:
+                    remaining[row] += 1
+            depth = array('i', [0]) * n
+            frontier = [row for row in range(n) if remaining[row] == 0]
+            level = ordered = 0
+            while frontier:
+                level += 1
+                ordered += len(frontier)
+                released = []
+                for row in frontier:
+                    depth[row] = level
+                    for child in self.dependents(row):
+                        remaining[child] -= 1
+                        if remaining[child] == 0:
+                            released.append(child)
+                frontier = released
+            return depth, ordered
+
+        known = self.indices >= 0
+        remaining = np.bincount(self._edge_rows()[known], minlength=n)
+        depth = np.zeros(n, dtype=np.int32)
+        frontier = np.flatnonzero(remaining == 0)
+        level = ordered = 0
+        while frontier.size:
+            level += 1
+            ordered += frontier.size
+            depth[frontier] = level
+            # Dependents of the whole frontier, gathered from the reverse CSR at once
+            starts = self.rindptr[frontier]
+            counts = self.rindptr[frontier + 1] - starts
+            total = int(counts.sum())
+            if not total:
+                break
+            offsets = np.repeat(starts - (np.cumsum(counts) - counts), counts)
+            children, hits = np.unique(self.rindices[np.arange(total) + offsets], return_counts=True)
+            remaining[children] -= hits
+            frontier = children[remaining[children] == 0]
+        return depth, ordered
+
+    def longest_chain(self, depth: Sequence[int] = None) -> Tuple[int, List[int]]:
+        """Longest prerequisite chain, as (length, rows from the first prerequisite on).
+
+        The chain ends at the first row with the greatest depth and follows,
+        at each step, the first listed prerequisite one level shallower.
+        """
+        if depth is None:
+            depth, _ = self.depth_levels()
+        if not self.node_count:
+            return 0, []
+        if np is None:
+            length = max(depth)
+            row = depth.index(length)
+        else:
+            row = int(np.argmax(depth))
+            length = int(depth[row])
+        if length == 0:
+            return 0, []
+
+        chain = [row]
+        while depth[row] > 1:
+            row = next(int(p) for p in self.prerequisites(row) if p >= 0 and depth[p] == depth[row] - 1)
+            chain.append(row)
+        chain.reverse()
+        return length, chain
+
+    def find_cycles(self) -> List[List[int]]:
+        """Find cycles with an iterative DFS along prerequisite -> dependent edges.
+
+        Reports at most one cycle per DFS tree, as rows from the repeated
+        concept back to itself.
+        """
+        rindptr = self.rindptr.tolist()
+        rindices = self.rindices.tolist()
+        visited = [False] * self.node_count
+        cycles = []
+
+        for root in range(self.node_count):
+            if visited[root]:
+                continue
+
+            visited[root] = True
+            path = [root]
+            position = {root: 0}  # rows on the current DFS path -> index in path
+            stack = [iter(rindices[rindptr[root]:rindptr[root + 1]])]
+
+            while stack:
+                next_row = next(stack[-1], None)
+                if next_row is None:
+                    stack.pop()
+                    del position[path.pop()]
+                elif next_row in position:
+                    cycles.append(path[position[next_row]:] + [next_row])
+                    break
+                elif not visited[next_row]:
+                    visited[next_row] = True
+                    position[next_row] = len(path)
+                    path.append(next_row)
+                    stack.append(iter(rindices[rindptr[next_row]:rindptr[next_row + 1]]))
+
+        return cycles
+
+    def components(self) -> List[List[int]]:
+        """Connected components of the undirected graph, ordered by their first row."""
+        n = self.node_count
+        if np is None:
+            parent = list(range(n))
+
+            def find(row):
+                while parent[row] != row:
+                    parent[row] = parent[parent[row]]
+                    row = parent[row]
+                return row
+
+            for row, prereq in zip(self._edge_rows(), self.indices):
+                if prereq >= 0:
+                    a, b = find(row), find(prereq)
+                    if a != b:
+                        parent[max(a, b)] = min(a, b)
+            groups: Dict[int, List[int]] = {}
+            for row in range(n):
+                groups.setdefault(find(row), []).append(row)
+            return list(groups.values())
+
+        # Hook the larger root of every edge onto the smaller, then jump pointers to roots
+        known = self.indices >= 0
+        a = self.indices[known]
+        b = self._edge_rows()[known]
+        parent = np.arange(n, dtype=np.int32)
+        while True:
+            pa, pb = parent[a], parent[b]
+            differ = pa != pb
+            if not differ.any():
+                break
+            np.minimum.at(parent, np.maximum(pa, pb)[differ], np.minimum(pa, pb)[differ])
+            while True:
+                grand = parent[parent]
+                if np.array_equal(grand, parent):
+                    break
+                parent = grand
+
+        order = np.argsort(parent, kind='stable')
+        bounds = np.flatnonzero(np.diff(parent[order])) + 1
+        return [rows.tolist() for rows in np.split(order, bounds)] if n else []
+
+    def concept_ids(self, rows) -> List[int]:
+        """ConceptIDs of the given rows."""
+        return [int(self.ids[row]) for row in rows]
+
+    def component_sets(self) -> List[Set[int]]:
+        """Connected components as sets of ConceptIDs."""
+        return [set(self.concept_ids(rows)) for rows in self.components()]
+
+
+class TaxonomyTally:
+    """Concepts per TaxonomyID and the lowest-ID concepts of each, in bounded memory.
+
+    Each taxonomy keeps a counter and a heap of at most sample_size concepts,
+    so memory does not grow with the number of concepts. Several CSV files
+    can be added to one tally to report on a whole catalog of books.
+    """
+
+    def __init__(self, sample_size: int = 15):
+        """
+        Args:
+            sample_size: Number of concepts (lowest IDs first) kept per taxonomy
+        """
+        self.sample_size = sample_size
+        self.counts: Dict[str, int] = {}
+        self.sources: List[Tuple[str, int]] = []
+        # Max-heaps of (-ConceptID, -sequence, label, source); equal IDs keep file order
+        self._heaps: Dict[str, list] = {}
+        self._sequence = 0
+
+    @property
+    def total(self) -> int:
+        return sum(self.counts.values())
+
+    def add(self, concept_id: int, label: str, taxonomy: str, source: str = ''):
+        """Count one concept and keep it if it is among the lowest IDs of its taxonomy.
+
+        source names the learning graph the concept came from and is kept with
+        the sampled concept.
+        """
+        self.counts[taxonomy] = self.counts.get(taxonomy, 0) + 1
+        heap = self._heaps.setdefault(taxonomy, [])
+        self._sequence += 1
+        if len(heap) < self.sample_size:
+            heapq.heappush(heap, (-concept_id, -self._sequence, label, source))
+        elif heap and concept_id < -heap[0][0]:
+            heapq.heapreplace(heap, (-concept_id, -self._sequence, label, source))
+
+    def add_csv(self, csv_path: str) -> int:
+        """Stream a learning-graph CSV into the tally (same columns as LearningGraph.from_csv).
+
+        Returns:
+            Number of concepts in the file
+        """
+        before = self.total
+        source = str(csv_path)
+        with open(csv_path, 'r', encoding='utf-8', newline='') as f:
+            reader = csv.reader(f)
+            header = next(reader, [])
+            id_col = header.index('ConceptID')
+            label_col = header.index('ConceptLabel' if 'ConceptLabel' in header else 'ConceptName')
+            tax_col = header.index('TaxonomyID') if 'TaxonomyID' in header else None
+            width = len(header)
+            for row in reader:
+                if row:
+                    if len(row) < width:
+                        row += [''] * (width - len(row))
+                    self.add(int(row[id_col]), row[label_col],
+                             row[tax_col] if tax_col is not None else '', source)
+        concepts = self.total - before
+        self.sources.append((source, concepts))
+        return concepts
+
+    def samples(self) -> Dict[str, List[Tuple[int, str, str]]]:
+        """Kept (ConceptID, label, source) of each taxonomy sorted by ID, in order of first use."""
+        return {tax: [(-neg_id, label, source) for neg_id, _, label, source in sorted(heap, reverse=True)]
+                for tax, heap in self._heaps.items()}
@@ -1,19 +1,176 @@
 #!/usr/bin/env python3
 """
 MCP Server for listing Claude skills
-Provides zero-token skill listing by executing shell script directly
+Provides zero-token skill listing from an in-process skill catalog
 """
 
+import asyncio
 import json
-import subprocess
 import os
 from pathlib import Path
 from mcp.server import Server
 from mcp.types import Tool, TextContent
 import mcp.server.stdio
 
+# Seconds between watcher passes over the skills directories
+WATCH_INTERVAL = 2.0
+
 app = Server("skills-lister")
 
+
+def parse_frontmatter(skill_md: Path) -> dict:
+    """
+    Read the name and description fields from a SKILL.md YAML frontmatter.
+
+    Only the lines between the two leading '---' markers are read; the
+    body of the skill is never loaded.
+    """
+    fields = {}
+    with open(skill_md, 'r', encoding='utf-8', errors='replace') as f:
+        if f.readline().strip() != '---':
+            return fields
+        for line in f:
+            line = line.rstrip('\n')
+            if line.strip() == '---':
+                break
+            key, sep, value = line.partition(':')
+            if not sep or key not in ('name', 'description'):
+                continue
+            value = value.strip()
+            if len(value) >= 2 and value[0] == value[-1] and value[0] in '"\'':
+                value = value[1:-1]
+            fields[key] = value
+    return fields
+
+
+class SkillCatalog:
+    """
+    In-memory catalog of the skills in the user and project directories.
+
+    Each SKILL.md is parsed once and re-parsed only when its mtime changes.
+    A directory whose mtime is unchanged is not rescanned, so a refresh
+    costs one stat per root plus one per skill. Rendered outputs are
+    cached per format and dropped whenever the catalog changes.
+    """
+
+    def __init__(self, roots: list[tuple[str, Path]]):
+        self.roots = roots
+        self._dir_mtimes = {}
+        self._skill_dirs = {label: [] for label, _ in roots}
+        self._entries = {}
+        self._rendered = {}
+        self.refresh()
+
+    def _scan_root(self, label: str, root: Path) -> bool:
+        """Refresh one root directory; return True if anything changed."""
+        try:
+            mtime = root.stat().st_mtime_ns
+        except OSError:
+            mtime = None
+        changed = False
+        if mtime != self._dir_mtimes.get(label):
+            self._dir_mtimes[label] = mtime
+            skill_dirs = []
+            if mtime is not None:
+                with os.scandir(root) as it:
+                    skill_dirs = sorted(Path(e.path) for e in it
+                                        if e.is_dir() and not e.name.startswith('.'))
+            if skill_dirs != self._skill_dirs[label]:
+                for gone in set(self._skill_dirs[label]) - set(skill_dirs):
+                    self._entries.pop(gone, None)
+                self._skill_dirs[label] = skill_dirs
+                changed = True
+
+        for skill_dir in self._skill_dirs[label]:
+            skill_md = skill_dir / 'SKILL.md'
+            try:
+                skill_mtime = skill_md.stat().st_mtime_ns
+            except OSError:
+                if self._entries.pop(skill_dir, None) is not None:
+                    changed = True
+                continue
+            cached = self._entries.get(skill_dir)
+            if cached is not None and cached[0] == skill_mtime:
+                continue
+            try:
+                fields = parse_frontmatter(skill_md)
+            except OSError:
+                continue
+            self._entries[skill_dir] = (skill_mtime, {
+                'name': fields.get('name') or skill_dir.name,
+                'description': fields.get('description') or 'No description available',
+                'location': label,
+                'path': str(skill_dir),
+            })
+            changed = True
+        return changed
+
+    def refresh(self) -> bool:
+        """Bring the catalog up to date; return True if it changed."""
+        changed = False
+        for label, root in self.roots:
+            changed |= self._scan_root(label, root)
+        if changed:
+            self._rendered.clear()
+        return changed
+
+    async def watch(self, interval: float = WATCH_INTERVAL):
+        """Poll the skills directories for changes until cancelled."""
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                self.refresh()
+            except OSError:
+                pass
+
+    def skills(self) -> list[dict]:
+        """Return skill records, user skills first, each group in directory order."""
+        return [self._entries[d][1]
+                for label, _ in self.roots
+                for d in self._skill_dirs[label]
+                if d in self._entries]
+
+    def render(self, output_format: str) -> str:
+        """Return the catalog in the requested format, cached until it changes."""
+        text = self._rendered.get(output_format)
+        if text is not None:
+            return text
+
+        skills = self.skills()
+        if output_format == "names-only":
+            text = "\n".join(s['name'] for s in skills)
+        elif output_format == "json":
+            counts = {label: 0 for label, _ in self.roots}
+            for s in skills:
+                counts[s['location']] += 1
+            text = json.dumps({
+                "total": len(skills),
+                **counts,
+                "skills": [{k: s[k] for k in ('name', 'description', 'location')}
+                           for s in skills],
+            }, indent=2)
+        else:
+            lines = ["Available Claude Skills", "======================="]
+            for label, root in self.roots:
+                group = [s for s in skills if s['location'] == label]
+                if not group:
+                    continue
+                lines += ["", f"{label.capitalize()} skills ({root}):", ""]
+                for s in group:
+                    lines.append(f"📘 {s['name']}")
+                    lines.append(f"   {s['description']}")
+            lines += ["", "=======================", f"Total skills: {len(skills)}"]
+            text = "\n".join(lines)
+
+        self._rendered[output_format] = text
+        return text
+
+
+catalog = SkillCatalog([
+    ("user", Path.home() / ".claude" / "skills"),
+    ("project", Path.cwd() / ".claude" / "skills"),
+])
+
 @app.list_tools()
 async def list_tools() -> list[Tool]:
     """List available tools."""
@@ -44,68 +201,17 @@ async def call_tool(name: str, arguments: dict) -> list[TextContent]:
 
     # Get format from arguments (default to names-only)
     output_format = arguments.get("format", "names-only")
-
-    # Construct path to the shell script
-    script_path = os.path.expanduser("~/bin/list-skills.sh")
-
-    # Check if script exists
-    if not os.path.exists(script_path):
+    if output_format not in ("names-only", "json", "full"):
         return [TextContent(
             type="text",
-            text=f"Error: Script not found at {script_path}"
+            text=f"Error: Unknown format '{output_format}'"
         )]
 
-    # Build command with appropriate flag
-    cmd = [script_path]
-    if output_format == "json":
-        cmd.append("--json")
-    elif output_format == "names-only":
-        cmd.append("--names-only")
-    # For 'full', no flag needed
-
+    # Answer from the in-memory catalog; the watcher keeps it fresh
     try:
-        # Execute the shell script
-        result = subprocess.run(
-            cmd,
-            capture_output=True,
-            text=True,
-            check=True,
-            timeout=10
-        )
-
-        output = result.stdout.strip()
-
-        # Format the response based on output type
-        if output_format == "json":
-            # Validate JSON and pretty-print if requested
-            try:
-                parsed = json.loads(output)
-                formatted_output = json.dumps(parsed, indent=2)
-                return [TextContent(
-                    type="text",
-                    text=formatted_output
-                )]
-            except json.JSONDecodeError:
-                return [TextContent(
-                    type="text",
-                    text=output
-                )]
-        else:
-            # Return raw output for names-only or full format
-            return [TextContent(
-                type="text",
-                text=output
-            )]
-
-    except subprocess.TimeoutExpired:
         return [TextContent(
             type="text",
-            text="Error: Script execution timed out after 10 seconds"
-        )]
-    except subprocess.CalledProcessError as e:
-        return [TextContent(
-            type="text",
-            text=f"Error executing script:\n{e.stderr}"
+            text=catalog.render(output_format)
         )]
     except Exception as e:
         return [TextContent(
@@ -115,13 +221,16 @@ async def call_tool(name: str, arguments: dict) -> list[TextContent]:
 
 async def main():
     """Run the MCP server."""
-    async with mcp.server.stdio.stdio_server() as (read_stream, write_stream):
-        await app.run(
-            read_stream,
-            write_stream,
-            app.create_initialization_options()
-        )
+    watcher = asyncio.create_task(catalog.watch())
+    try:
+        async with mcp.server.stdio.stdio_server() as (read_stream, write_stream):
+            await app.run(
+                read_stream,
+                write_stream,
+                app.create_initialization_options()
+            )
+    finally:
+        watcher.cancel()
 
 if __name__ == "__main__":
-    import asyncio
     asyncio.run(main())
@@ -7,7 +7,7 @@ Outputs a JSON file with detection results that can be used to generate
 a feature-checklist.md file.
 
 Usage:
-    python detect-features.py /path/to/project [--output results.json]
+    python detect-features.py /path/to/project [--output results.json] [--profile]
 """
 
 import argparse
@@ -24,6 +24,10 @@ except ImportError:
     print("Error: PyYAML is required. Install with: pip install pyyaml")
     sys.exit(1)
 
+# Profiling hooks shared by this skill's scripts (profile_hooks.py, next to this script)
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+from profile_hooks import add_profile_argument, phase, start_profile
+
 
 def load_mkdocs_yml(project_path: Path) -> dict:
     """Load and parse mkdocs.yml file."""
@@ -31,7 +35,7 @@ def load_mkdocs_yml(project_path: Path) -> dict:
     if not mkdocs_path.exists():
         return {}
 
-    with open(mkdocs_path, 'r', encoding='utf-8') as f:
+    with phase('parse', mkdocs_path), open(mkdocs_path, 'r', encoding='utf-8') as f:
         try:
             return yaml.safe_load(f) or {}
         except yaml.YAMLError as e:
@@ -94,7 +98,7 @@ def count_glossary_terms(glossary_path: Path) -> int:
     if not glossary_path.exists():
         return 0
 
-    with open(glossary_path, 'r', encoding='utf-8') as f:
+    with phase('read', glossary_path), open(glossary_path, 'r', encoding='utf-8') as f:
         content = f.read()
 
     # Count ## or ### or #### headers (glossary terms use various formats)
@@ -116,7 +120,7 @@ def count_faq_questions(faq_path: Path) -> int:
     if not faq_path.exists():
         return 0
 
-    with open(faq_path, 'r', encoding='utf-8') as f:
+    with phase('read', faq_path), open(faq_path, 'r', encoding='utf-8') as f:
         content = f.read()
 
     # Count ### headers (FAQ questions)
@@ -301,7 +305,9 @@ def main():
         help="Pretty-print JSON output"
     )
 
+    add_profile_argument(parser)
     args = parser.parse_args()
+    start_profile('detect-features', args.profile)
     project_path = Path(args.project_path).resolve()
 
     if not project_path.exists():
@@ -312,15 +318,17 @@ def main():
         print(f"Error: No mkdocs.yml found in {project_path}", file=sys.stderr)
         sys.exit(1)
 
-    results = detect_features(project_path)
+    with phase('aggregate'):
+        results = detect_features(project_path)
 
     indent = 2 if args.pretty else None
-    json_output = json.dumps(results, indent=indent, default=str)
+    with phase('render'):
+        json_output = json.dumps(results, indent=indent, default=str)
 
     if args.output:
         output_path = Path(args.output)
         output_path.parent.mkdir(parents=True, exist_ok=True)
-        with open(output_path, 'w', encoding='utf-8') as f:
+        with phase('write'), open(output_path, 'w', encoding='utf-8') as f:
             f.write(json_output)
         print(f"Results written to: {output_path}")
     else:
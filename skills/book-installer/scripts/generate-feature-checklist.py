@@ -6,7 +6,7 @@ Combines the feature detection results with the template to generate
 a complete feature-checklist.md file for the project.
 
 Usage:
-    python generate-feature-checklist.py /path/to/project
+    python generate-feature-checklist.py /path/to/project [--profile]
 """
 
 import argparse
@@ -16,10 +16,11 @@ import sys
 from datetime import datetime
 from pathlib import Path
 
-# Import the detection module
+# Import the detection module and this skill's profiling hooks
 script_dir = Path(__file__).parent
 sys.path.insert(0, str(script_dir))
 from detect_features import detect_features
+from profile_hooks import add_profile_argument, phase, start_profile
 
 
 def status_icon(detected: bool) -> str:
@@ -31,7 +32,8 @@ def generate_checklist(project_path: Path) -> str:
     """Generate the feature checklist markdown content."""
 
     # Run detection
-    results = detect_features(project_path)
+    with phase('aggregate'):
+        results = detect_features(project_path)
 
     # Read the template
     template_path = script_dir.parent / "references" / "assets" / "templates" / "docs" / "feature-checklist.md"
@@ -39,7 +41,7 @@ def generate_checklist(project_path: Path) -> str:
         print(f"Error: Template not found at {template_path}", file=sys.stderr)
         sys.exit(1)
 
-    with open(template_path, 'r', encoding='utf-8') as f:
+    with phase('read', template_path), open(template_path, 'r', encoding='utf-8') as f:
         template = f.read()
 
     # Build replacements dictionary
@@ -162,7 +164,9 @@ def main():
         help="Also save detection results as JSON"
     )
 
+    add_profile_argument(parser)
     args = parser.parse_args()
+    start_profile('generate-feature-checklist', args.profile)
     project_path = Path(args.project_path).resolve()
 
     if not project_path.exists():
@@ -174,7 +178,8 @@ def main():
         sys.exit(1)
 
     # Generate the checklist
-    content, results = generate_checklist(project_path)
+    with phase('render'):
+        content, results = generate_checklist(project_path)
 
     # Output
     if args.dry_run:
@@ -182,7 +187,7 @@ def main():
     else:
         output_path = Path(args.output) if args.output else project_path / "docs" / "feature-checklist.md"
         output_path.parent.mkdir(parents=True, exist_ok=True)
-        with open(output_path, 'w', encoding='utf-8') as f:
+        with phase('write'), open(output_path, 'w', encoding='utf-8') as f:
             f.write(content)
         print(f"Feature checklist written to: {output_path}")
 
@@ -198,7 +203,7 @@ def main():
     if args.save_json:
         json_path = Path(args.save_json)
         json_path.parent.mkdir(parents=True, exist_ok=True)
-        with open(json_path, 'w', encoding='utf-8') as f:
+        with phase('write'), open(json_path, 'w', encoding='utf-8') as f:
             json.dump(results, f, indent=2, default=str)
         print(f"Detection results saved to: {json_path}")
 
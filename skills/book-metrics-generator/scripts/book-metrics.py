@@ -7,16 +7,21 @@ Generates comprehensive metrics for intelligent textbooks, including:
 - Chapter-level metrics (per-chapter statistics)
 
 Usage:
-    python book-metrics.py [docs_directory]
+    python book-metrics.py [docs_directory] [--profile]
 """
 
 import os
 import re
 import csv
+import sys
 from pathlib import Path
 from typing import Dict, List, Tuple, Any
 from collections import defaultdict
 
+# Profiling hooks shared by this skill's scripts (profile_hooks.py, next to this script)
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+from profile_hooks import phase, start_profile
+
 
 class BookMetricsGenerator:
     """Generates metrics for intelligent textbooks."""
@@ -511,23 +516,25 @@ class BookMetricsGenerator:
         output_dir.mkdir(parents=True, exist_ok=True)
 
         # Generate book metrics
-        book_metrics_content = self.generate_book_metrics_md()
+        with phase('aggregate'):
+            book_metrics_content = self.generate_book_metrics_md()
         book_metrics_file = output_dir / "book-metrics.md"
-        with open(book_metrics_file, 'w', encoding='utf-8') as f:
+        with phase('write'), open(book_metrics_file, 'w', encoding='utf-8') as f:
             f.write(book_metrics_content)
         print(f"✅ Generated {book_metrics_file}")
 
         # Generate chapter metrics
-        chapter_metrics_content = self.generate_chapter_metrics_md()
+        with phase('aggregate'):
+            chapter_metrics_content = self.generate_chapter_metrics_md()
         chapter_metrics_file = output_dir / "chapter-metrics.md"
-        with open(chapter_metrics_file, 'w', encoding='utf-8') as f:
+        with phase('write'), open(chapter_metrics_file, 'w', encoding='utf-8') as f:
             f.write(chapter_metrics_content)
         print(f"✅ Generated {chapter_metrics_file}")
 
 
 def main():
     """Main entry point."""
-    import sys
+    start_profile('book-metrics')
 
     # Get docs directory from command line or use default
     docs_dir = sys.argv[1] if len(sys.argv) > 1 else "docs"
@@ -27,16 +27,24 @@ Usage:
 
     # Enable verbose output for debugging
     python diagram-report.py -v
+
+    # Print a JSON timing summary to stderr on exit
+    python diagram-report.py --profile
 """
 
 import os
 import re
 import csv
+import sys
 from pathlib import Path
 from dataclasses import dataclass, field
 from typing import List, Dict, Tuple
 import argparse
 
+# Profiling hooks shared by this skill's scripts (profile_hooks.py, next to this script)
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+from profile_hooks import add_profile_argument, phase, start_profile
+
 
 @dataclass
 class VisualElement:
@@ -643,7 +651,9 @@ def main():
         help='Enable verbose output for debugging'
     )
 
+    add_profile_argument(parser)
     args = parser.parse_args()
+    start_profile('diagram-report', args.profile)
 
     # Use current working directory as the base
     cwd = Path.cwd()
@@ -692,7 +702,8 @@ def main():
 
     # Analyze chapters
     analyzer = DiagramAnalyzer(str(chapters_dir), verbose=args.verbose)
-    analyzer.analyze_all_chapters()
+    with phase('parse'):
+        analyzer.analyze_all_chapters()
 
     print(f"Found {len(analyzer.elements)} visual elements")
 
@@ -701,28 +712,32 @@ def main():
 
     if args.format == 'markdown':
         # Generate table report
-        table_content = generator.generate_markdown_table()
+        with phase('render'):
+            table_content = generator.generate_markdown_table()
         table_output = output_dir / 'diagram-table.md'
-        with open(table_output, 'w', encoding='utf-8') as f:
+        with phase('write'), open(table_output, 'w', encoding='utf-8') as f:
             f.write(table_content)
         print(f"Table report saved to: {table_output}")
 
         # Generate details report
-        details_content = generator.generate_markdown_details()
+        with phase('render'):
+            details_content = generator.generate_markdown_details()
         details_output = output_dir / 'diagram-details.md'
-        with open(details_output, 'w', encoding='utf-8') as f:
+        with phase('write'), open(details_output, 'w', encoding='utf-8') as f:
             f.write(details_content)
         print(f"Details report saved to: {details_output}")
 
     elif args.format == 'csv':
         csv_output = output_dir / 'diagrams.csv'
-        generator.generate_csv(str(csv_output))
+        with phase('write'):
+            generator.generate_csv(str(csv_output))
         print(f"CSV report saved to: {csv_output}")
 
     elif args.format == 'html':
         html_output = output_dir / 'diagrams.html'
-        content = generator.generate_html()
-        with open(html_output, 'w', encoding='utf-8') as f:
+        with phase('render'):
+            content = generator.generate_html()
+        with phase('write'), open(html_output, 'w', encoding='utf-8') as f:
             f.write(content)
         print(f"HTML report saved to: {html_output}")
 
@@ -0,0 +1,44 @@
+#!/usr/bin/env python3
+"""
+Profile Hooks
+
+Profiling hooks for the scripts of this skill. Inside the repository they
+are the shared hooks from src/book-metrics/tool_profile.py, so --profile
+prints one JSON timing summary on exit. A skill installed on its own has no
+tool_profile.py: the scripts still accept --profile and run unprofiled.
+
+Every skill with profiled scripts ships an identical copy of this file.
+
+Usage:
+    sys.path.insert(0, str(Path(__file__).resolve().parent))
+    from profile_hooks import add_profile_argument, phase, start_profile
+"""
+
+import sys
+from contextlib import nullcontext
+from pathlib import Path
+
+# src/book-metrics of the enclosing repository, or None when installed on its
+# own. It goes at the end of sys.path so it never shadows the skill's modules.
+BOOK_METRICS_DIR = next((parent / 'src' / 'book-metrics'
+                         for parent in Path(__file__).resolve().parents
+                         if (parent / 'src' / 'book-metrics' / 'tool_profile.py').is_file()), None)
+if BOOK_METRICS_DIR is not None and str(BOOK_METRICS_DIR) not in sys.path:
+    sys.path.append(str(BOOK_METRICS_DIR))
+
+try:
+    from tool_profile import add_profile_argument, phase, start_profile
+except ImportError:
+    def add_profile_argument(parser):
+        """Add the --profile flag, accepted but ignored without tool_profile.py."""
+        parser.add_argument('--profile', action='store_true',
+                            help='Print a JSON timing summary on exit (needs src/book-metrics/tool_profile.py)')
+
+    def phase(name, item=None):
+        """No-op stand-in for tool_profile.phase()."""
+        return nullcontext()
+
+    def start_profile(tool, enabled=None, patterns=()):
+        """Remove --profile from sys.argv as tool_profile does, so it is not read as an argument."""
+        if enabled is None and '--profile' in sys.argv:
+            sys.argv.remove('--profile')
@@ -7,18 +7,235 @@ used by the existing graph viewer (vis.js network format).
 IMPORTANT: For custom taxonomies, provide taxonomy-names.json to ensure
 human-readable classifierName values in the output. Without this file,
 taxonomy IDs will be used as fallback (which is usually wrong).
+
+Nodes and edges are streamed from the CSV to the output file, so memory use
+does not grow with the size of the graph. Optional outputs:
+  --compact     No indentation or spaces (still valid against the schema)
+  --short-keys  One-letter node/edge keys (see SHORT_KEYS); not schema-valid,
+                for consumers that expand the keys themselves
+  --csr PATH    Binary adjacency index (CSR arrays) that can be memory-mapped
+  --profile     Print a JSON timing summary on exit (src/book-metrics/tool_profile.py)
 """
 
-VERSION = "0.03"
+VERSION = "0.04"
 
+import argparse
 import csv
 import json
+import json.encoder
+import mmap
+import struct
+import sys
+from array import array
+from pathlib import Path
 from typing import Dict, List
 from datetime import datetime
 
+# Profiling hooks shared by this skill's scripts (profile_hooks.py, next to this script)
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+from profile_hooks import add_profile_argument, phase, start_profile
+
+# One-letter keys used by --short-keys output
+SHORT_KEYS = {
+    'id': 'i',
+    'label': 'l',
+    'group': 'g',
+    'shape': 's',
+    'from': 'f',
+    'to': 't',
+}
+SHORT_KEY_FORMAT = 'Learning Graph JSON v1.0 (short keys)'
+
+# CSR sidecar layout (all little-endian):
+#   header:  magic b'LGCS', uint32 version, uint32 node_count, uint32 edge_count
+#   int32 node_ids[node_count]     ConceptID of each row, in CSV order
+#   int32 indptr[node_count + 1]   row i's prerequisites are indices[indptr[i]:indptr[i+1]]
+#   int32 indices[edge_count]      row positions of prerequisites (-1 if the ID is unknown)
+CSR_MAGIC = b'LGCS'
+CSR_VERSION = 1
+CSR_HEADER = struct.Struct('<4sIII')
+
+
+def iter_graph_rows(csv_path: str):
+    """
+    Yield (concept_id, label, taxonomy, prereq_ids) for each CSV row.
+
+    Supports both ConceptLabel and ConceptName column names.
+    """
+    with open(csv_path, 'r', encoding='utf-8', newline='') as f:
+        for row in csv.DictReader(f):
+            dependencies_str = row['Dependencies']
+            prereq_ids = [int(pid) for pid in dependencies_str.split('|')] if dependencies_str else []
+            yield (int(row['ConceptID']),
+                   row.get('ConceptLabel') or row.get('ConceptName', ''),
+                   row['TaxonomyID'],
+                   prereq_ids)
+
+
+def scan_graph_csv(csv_path: str) -> dict:
+    """
+    First pass over the CSV: counts, taxonomies and compact per-row arrays.
+
+    Returns:
+        Dictionary with node_count, edge_count, foundational_ids,
+        used_taxonomies (in order of first use), node_ids and degrees
+        (int arrays used to build the CSR index)
+    """
+    node_ids = array('i')
+    degrees = array('i')
+    used_taxonomies = {}
+    foundational_ids = []
+    edge_count = 0
+
+    for concept_id, _label, taxonomy, prereq_ids in iter_graph_rows(csv_path):
+        node_ids.append(concept_id)
+        degrees.append(len(prereq_ids))
+        used_taxonomies.setdefault(taxonomy, None)
+        if not prereq_ids:
+            foundational_ids.append(concept_id)
+        edge_count += len(prereq_ids)
+
+    return {
+        'node_count': len(node_ids),
+        'edge_count': edge_count,
+        'foundational_ids': foundational_ids,
+        'used_taxonomies': list(used_taxonomies),
+        'node_ids': node_ids,
+        'degrees': degrees,
+    }
+
+
+def _dump_json(obj, level: int, compact: bool) -> str:
+    """Serialize obj as json.dump(indent=2) would at the given nesting level."""
+    if compact:
+        return json.dumps(obj, separators=(',', ':'))
+    return json.dumps(obj, indent=2).replace('\n', '\n' + '  ' * level)
+
+
+def write_graph_json(csv_path: str, json_path: str, metadata: dict, groups: dict,
+                     compact: bool = False, short_keys: bool = False):
+    """
+    Write the learning graph JSON, streaming nodes and edges from the CSV.
+
+    The indented output is byte-for-byte what json.dump(graph, indent=2)
+    produces; compact output matches separators=(',', ':'). Nodes and edges
+    are formatted from fixed templates instead of a json.dumps call each.
+    """
+    k = SHORT_KEYS if short_keys else {key: key for key in SHORT_KEYS}
+    quote = json.encoder.encode_basestring_ascii
+    newline = '' if compact else '\n'
+    colon = ':' if compact else ': '
+    pad1 = '' if compact else '  '
+    pad2, pad3 = pad1 * 2, pad1 * 3
+
+    # Item templates at nesting level 2 (inside the nodes/edges arrays)
+    field = ',' + newline + pad3
+    item_end = newline + pad2 + '}'
+    node_head = ('{' + newline + pad3 + f'"{k["id"]}"{colon}%d' +
+                 field + f'"{k["label"]}"{colon}%s' +
+                 field + f'"{k["group"]}"{colon}%s')
+    node_shape = field + f'"{k["shape"]}"{colon}"box"'
+    edge_item = ('{' + newline + pad3 + f'"{k["from"]}"{colon}%d' +
+                 field + f'"{k["to"]}"{colon}%d' + item_end)
+
+    def write_section(f, name, items):
+        f.write(f'{pad1}"{name}"{colon}[')
+        first = True
+        for item in items:
+            f.write(newline + pad2 if first else ',' + newline + pad2)
+            f.write(item)
+            first = False
+        if not first:
+            f.write(newline + pad1)
+        f.write(']')
+
+    def nodes():
+        for concept_id, label, taxonomy, prereq_ids in iter_graph_rows(csv_path):
+            # Create node - use taxonomy ID directly as group reference
+            node = node_head % (concept_id, quote(label), quote(taxonomy))
+            # Special styling for foundational concepts
+            if not prereq_ids:
+                node += node_shape
+            yield node + item_end
+
+    def edges():
+        # Create edges (from concept to its prerequisites)
+        for concept_id, _label, _taxonomy, prereq_ids in iter_graph_rows(csv_path):
+            for prereq_id in prereq_ids:
+                yield edge_item % (concept_id, prereq_id)
+
+    with open(json_path, 'w', encoding='utf-8') as f:
+        f.write('{' + newline)
+        f.write(f'{pad1}"metadata"{colon}{_dump_json(metadata, 1, compact)},{newline}')
+        f.write(f'{pad1}"groups"{colon}{_dump_json(groups, 1, compact)},{newline}')
+        write_section(f, 'nodes', nodes())
+        f.write(',' + newline)
+        write_section(f, 'edges', edges())
+        f.write(newline + '}')
+
+
+def write_csr_index(csv_path: str, csr_path: str, stats: dict):
+    """
+    Write the binary CSR adjacency sidecar (layout described at CSR_MAGIC).
+
+    Args:
+        csv_path: Input CSV, re-read to stream the prerequisite indices
+        csr_path: Output path for the index
+        stats: Result of scan_graph_csv for the same CSV
+    """
+    node_ids = stats['node_ids']
+    position = {concept_id: i for i, concept_id in enumerate(node_ids)}
+
+    indptr = array('i', [0])
+    total = 0
+    for degree in stats['degrees']:
+        total += degree
+        indptr.append(total)
+
+    def to_little_endian(values):
+        if sys.byteorder == 'big':
+            values = array('i', values)
+            values.byteswap()
+        return values
+
+    with open(csr_path, 'wb') as f:
+        f.write(CSR_HEADER.pack(CSR_MAGIC, CSR_VERSION, len(node_ids), total))
+        to_little_endian(node_ids).tofile(f)
+        to_little_endian(indptr).tofile(f)
+        for _concept_id, _label, _taxonomy, prereq_ids in iter_graph_rows(csv_path):
+            if prereq_ids:
+                to_little_endian(array('i', [position.get(pid, -1) for pid in prereq_ids])).tofile(f)
+
+
+def read_csr_index(csr_path: str) -> dict:
+    """
+    Memory-map a CSR sidecar written by write_csr_index.
+
+    Returns:
+        Dictionary with node_ids, indptr and indices as int32 memoryviews
+        over the mapped file (little-endian hosts), plus node_count and
+        edge_count
+    """
+    with open(csr_path, 'rb') as f:
+        mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    magic, version, node_count, edge_count = CSR_HEADER.unpack_from(mapped, 0)
+    if magic != CSR_MAGIC or version != CSR_VERSION:
+        raise ValueError(f"{csr_path} is not a version {CSR_VERSION} learning graph CSR index")
+
+    view = memoryview(mapped)[CSR_HEADER.size:].cast('i')
+    return {
+        'node_count': node_count,
+        'edge_count': edge_count,
+        'node_ids': view[:node_count],
+        'indptr': view[node_count:2 * node_count + 1],
+        'indices': view[2 * node_count + 1:2 * node_count + 1 + edge_count],
+    }
+
 
 def csv_to_json(csv_path: str, json_path: str, color_config: dict = None,
-                metadata: dict = None, taxonomy_names: dict = None):
+                metadata: dict = None, taxonomy_names: dict = None,
+                compact: bool = False, short_keys: bool = False,
+                csr_path: str = None):
     """
     Convert CSV dependency graph to vis.js JSON format with metadata and groups.
 
@@ -31,6 +248,13 @@ def csv_to_json(csv_path: str, json_path: str, color_config: dict = None,
                  If not provided, creates minimal metadata.
         taxonomy_names: Dictionary mapping taxonomy IDs to human-readable names.
                        STRONGLY RECOMMENDED for custom taxonomies.
+        compact: Write without indentation or spaces.
+        short_keys: Use the one-letter node/edge keys in SHORT_KEYS.
+        csr_path: Optional path for a binary CSR adjacency index.
+
+    Returns:
+        Dictionary with metadata, groups, node_count, edge_count and
+        foundational_ids (nodes and edges are streamed, not returned)
     """
     # Default taxonomy group colors for visualization
     # Uses web-safe pastel color names (no hex codes)
@@ -105,52 +329,15 @@ def csv_to_json(csv_path: str, json_path: str, color_config: dict = None,
     if taxonomy_names:
         all_taxonomy_names.update(taxonomy_names)
 
-    # Read CSV
-    nodes = []
-    edges = []
-    foundational_ids = []
-
-    with open(csv_path, 'r', encoding='utf-8') as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            concept_id = int(row['ConceptID'])
-            # Support both ConceptLabel and ConceptName column names
-            label = row.get('ConceptLabel') or row.get('ConceptName', '')
-            taxonomy = row['TaxonomyID']
-            dependencies_str = row['Dependencies']
-
-            # Determine if foundational (no dependencies)
-            is_foundational = (dependencies_str == '')
-            if is_foundational:
-                foundational_ids.append(concept_id)
-
-            # Create node - use taxonomy ID directly as group reference
-            node = {
-                'id': concept_id,
-                'label': label,
-                'group': taxonomy
-            }
-
-            # Special styling for foundational concepts
-            if is_foundational:
-                node['shape'] = 'box'
-
-            nodes.append(node)
-
-            # Create edges (from concept to its prerequisites)
-            if dependencies_str:
-                prereq_ids = [int(pid) for pid in dependencies_str.split('|')]
-                for prereq_id in prereq_ids:
-                    edge = {
-                        'from': concept_id,
-                        'to': prereq_id
-                    }
-                    edges.append(edge)
+    # Pass 1: collect what the header sections need without keeping nodes
+    with phase('parse', csv_path):
+        stats = scan_graph_csv(csv_path)
+    foundational_ids = stats['foundational_ids']
 
     # Create metadata section
     default_metadata = {
         'title': 'Learning Graph',
-        'description': f'Learning graph with {len(nodes)} concepts generated from CSV',
+        'description': f'Learning graph with {stats["node_count"]} concepts generated from CSV',
         'creator': 'CSV to JSON Converter',
         'date': datetime.now().strftime('%Y-%m-%d'),
         'version': '1.0',
@@ -167,7 +354,7 @@ def csv_to_json(csv_path: str, json_path: str, color_config: dict = None,
     groups = {}
 
     # Determine which taxonomy IDs are actually used
-    used_taxonomies = set(node['group'] for node in nodes)
+    used_taxonomies = stats['used_taxonomies']
 
     # Track taxonomies with missing human-readable names
     missing_names = []
@@ -215,23 +402,24 @@ def csv_to_json(csv_path: str, json_path: str, color_config: dict = None,
                 }
             }
 
-    # Create final JSON structure
-    graph_data = {
-        'metadata': default_metadata,
-        'groups': groups,
-        'nodes': nodes,
-        'edges': edges
-    }
+    if short_keys:
+        default_metadata['format'] = SHORT_KEY_FORMAT
 
-    # Write JSON
-    with open(json_path, 'w', encoding='utf-8') as f:
-        json.dump(graph_data, f, indent=2)
+    # Passes 2 and 3: stream nodes, then edges, straight to the output file
+    with phase('write', json_path):
+        write_graph_json(csv_path, json_path, default_metadata, groups,
+                         compact=compact, short_keys=short_keys)
+
+    if csr_path:
+        with phase('write', csr_path):
+            write_csr_index(csv_path, csr_path, stats)
+        print(f"✅ CSR adjacency index created: {csr_path}")
 
     print(f"✅ JSON graph created: {json_path} (csv-to-json v{VERSION})")
     print(f"   - Title: {default_metadata['title']}")
     print(f"   - {len(groups)} groups/taxonomies")
-    print(f"   - {len(nodes)} nodes")
-    print(f"   - {len(edges)} edges")
+    print(f"   - {stats['node_count']} nodes")
+    print(f"   - {stats['edge_count']} edges")
     print(f"   - {len(foundational_ids)} foundational concepts")
     print(f"\nFoundational concept IDs: {foundational_ids}")
     print(f"Groups: {list(groups.keys())}")
@@ -248,7 +436,13 @@ def csv_to_json(csv_path: str, json_path: str, color_config: dict = None,
         print(f"   }}")
         print(f"\n   Then run: python csv-to-json.py {csv_path} {json_path} [colors.json] [metadata.json] taxonomy-names.json")
 
-    return graph_data
+    return {
+        'metadata': default_metadata,
+        'groups': groups,
+        'node_count': stats['node_count'],
+        'edge_count': stats['edge_count'],
+        'foundational_ids': foundational_ids,
+    }
 
 
 def create_taxonomy_legend(groups: dict = None):
@@ -273,44 +467,63 @@ def create_taxonomy_legend(groups: dict = None):
 
 
 if __name__ == "__main__":
-    import sys
-
-    # Parse command line arguments
-    if len(sys.argv) < 3:
-        print(f"csv-to-json.py v{VERSION}")
-        print("\nUsage: python csv-to-json.py <input_csv> <output_json> [color_config.json] [metadata.json] [taxonomy_names.json]")
-        print("Looking for CSV column names: ConceptID, ConceptLabel, Dependencies, TaxonomyID")
-        print("\nExample:")
-        print("   python csv-to-json.py learning-graph.csv learning-graph.json")
-        print("   python csv-to-json.py learning-graph.csv learning-graph.json color-config.json metadata.json taxonomy-names.json")
-        print("\nOptional color_config.json format:")
-        print(json.dumps({
+    epilog = "\n".join([
+        "Looking for CSV column names: ConceptID, ConceptLabel, Dependencies, TaxonomyID",
+        "",
+        "Example:",
+        "   python csv-to-json.py learning-graph.csv learning-graph.json",
+        "   python csv-to-json.py learning-graph.csv learning-graph.json color-config.json metadata.json taxonomy-names.json",
+        "   python csv-to-json.py learning-graph.csv learning-graph.json --compact --csr learning-graph.csr",
+        "",
+        "Optional color_config.json format:",
+        json.dumps({
             'FOUND': 'MistyRose',
             'CORE': 'LightYellow',
             'ADV': 'PowderBlue'
-        }, indent=2))
-        print("\nOptional metadata.json format:")
-        print(json.dumps({
+        }, indent=2),
+        "",
+        "Optional metadata.json format:",
+        json.dumps({
             'title': 'My Learning Graph',
             'description': 'A comprehensive learning graph',
             'creator': 'Your Name',
             'license': 'CC BY 4.0'
-        }, indent=2))
-        print("\n⚠️  RECOMMENDED: taxonomy-names.json format (prevents ID-as-name bug):")
-        print(json.dumps({
+        }, indent=2),
+        "",
+        "⚠️  RECOMMENDED: taxonomy-names.json format (prevents ID-as-name bug):",
+        json.dumps({
             'FOUND': 'Foundation Concepts',
             'EDA1': 'Exploratory Data Analysis I',
             'REG': 'Regression & Correlation'
-        }, indent=2))
-        sys.exit(1)
-
-    csv_path = sys.argv[1]
-    json_path = sys.argv[2]
+        }, indent=2),
+    ])
+    parser = argparse.ArgumentParser(
+        description=f"csv-to-json.py v{VERSION} - convert a learning graph CSV to vis-network JSON",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog=epilog)
+    parser.add_argument('csv_path', help='Input CSV file')
+    parser.add_argument('json_path', help='Output JSON file')
+    parser.add_argument('color_config', nargs='?', help='Optional color_config.json')
+    parser.add_argument('metadata', nargs='?', help='Optional metadata.json')
+    parser.add_argument('taxonomy_names', nargs='?', help='Optional taxonomy_names.json (STRONGLY RECOMMENDED)')
+    parser.add_argument('--compact', action='store_true',
+                        help='Write JSON without indentation or spaces')
+    parser.add_argument('--short-keys', action='store_true',
+                        help='Use one-letter node/edge keys (not schema-valid; see SHORT_KEYS)')
+    parser.add_argument('--csr', metavar='PATH',
+                        help='Also write a binary CSR adjacency index to PATH')
+
+    add_profile_argument(parser)
+    args = parser.parse_args()
+    start_profile('csv-to-json', args.profile)
+
+    csv_path = args.csv_path
+    json_path = args.json_path
 
     # Load color config if provided
     color_config = None
-    if len(sys.argv) > 3:
-        config_file = sys.argv[3]
+    if args.color_config:
+        config_file = args.color_config
         try:
             with open(config_file, 'r', encoding='utf-8') as f:
                 color_config = json.load(f)
@@ -320,8 +533,8 @@ if __name__ == "__main__":
 
     # Load metadata config if provided
     metadata = None
-    if len(sys.argv) > 4:
-        metadata_file = sys.argv[4]
+    if args.metadata:
+        metadata_file = args.metadata
         try:
             with open(metadata_file, 'r', encoding='utf-8') as f:
                 metadata = json.load(f)
@@ -331,8 +544,8 @@ if __name__ == "__main__":
 
     # Load taxonomy names if provided (STRONGLY RECOMMENDED)
     taxonomy_names = None
-    if len(sys.argv) > 5:
-        names_file = sys.argv[5]
+    if args.taxonomy_names:
+        names_file = args.taxonomy_names
         try:
             with open(names_file, 'r', encoding='utf-8') as f:
                 taxonomy_names = json.load(f)
@@ -341,7 +554,9 @@ if __name__ == "__main__":
             print(f"⚠️  Taxonomy names file not found: {names_file}")
             print(f"   This may result in taxonomy IDs being used as display names.")
 
-    graph_data = csv_to_json(csv_path, json_path, color_config, metadata, taxonomy_names)
+    graph_data = csv_to_json(csv_path, json_path, color_config, metadata, taxonomy_names,
+                             compact=args.compact, short_keys=args.short_keys,
+                             csr_path=args.csr)
     create_taxonomy_legend(graph_data['groups'])
 
     print("\n✅ CSV to JSON format complete. Ready to use with graph-viewer!")
@@ -4,19 +4,60 @@ Generate Taxonomy Distribution Report
 
 Analyzes the taxonomy distribution in the concept dependency CSV
 and generates a detailed distribution report with recommendations.
+
+The CSV is streamed: only per-taxonomy counts and the 15 lowest-ID
+concepts of each taxonomy are kept. Given a directory, every
+learning-graph.csv below it is aggregated into one report.
 """
 
-import csv
-from collections import defaultdict
-from typing import Dict, List, Tuple
+import os
+import sys
+from pathlib import Path
+from typing import List, Union
+
+# Shared learning-graph core (learning_graph.py, next to this script)
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+from learning_graph import TaxonomyTally
+
+# Profiling hooks shared by this skill's scripts (profile_hooks.py, next to this script)
+from profile_hooks import phase, start_profile
+
+# Directories never searched for learning graphs (site/ holds mkdocs build copies)
+EXCLUDED_DIRS = {'.git', '__pycache__', 'node_modules', 'site'}
+
+# Concepts listed per category in the report
+SAMPLE_SIZE = 15
+
+
+def find_learning_graphs(path: str) -> List[Path]:
+    """
+    Find the learning graphs to report on.
+
+    Args:
+        path: A CSV file, or a directory searched recursively for learning-graph.csv
+
+    Returns:
+        Sorted list of CSV paths
+    """
+    path = Path(path)
+    if not path.is_dir():
+        return [path]
+
+    found = []
+    for root, dirs, files in os.walk(path):
+        dirs[:] = sorted(d for d in dirs if d not in EXCLUDED_DIRS and not d.startswith('.'))
+        if 'learning-graph.csv' in files:
+            found.append(Path(root) / 'learning-graph.csv')
+    return sorted(found)
 
 
-def analyze_taxonomy_distribution(csv_path: str, output_path: str, taxonomy_names: dict = None):
+def analyze_taxonomy_distribution(csv_path: Union[str, List[str]], output_path: str,
+                                  taxonomy_names: dict = None):
     """
     Analyze taxonomy distribution and generate report.
 
     Args:
-        csv_path: Path to input CSV file
+        csv_path: Path to input CSV file, a directory of learning graphs, or a list of CSV paths
         output_path: Path to output markdown report
         taxonomy_names: Optional dictionary mapping taxonomy IDs to full names
     """
@@ -35,16 +76,14 @@ def analyze_taxonomy_distribution(csv_path: str, output_path: str, taxonomy_name
 
     names = taxonomy_names if taxonomy_names is not None else default_names
 
-    # Read CSV and count by taxonomy
-    taxonomy_counts = defaultdict(int)
-    taxonomy_concepts = defaultdict(list)
-
-    with open(csv_path, 'r', encoding='utf-8') as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            tax = row['TaxonomyID']
-            taxonomy_counts[tax] += 1
-            taxonomy_concepts[tax].append((int(row['ConceptID']), row['ConceptLabel']))
+    # Stream the CSVs and count by taxonomy; only the first concepts by ID are kept per category
+    csv_paths = csv_path if isinstance(csv_path, (list, tuple)) else find_learning_graphs(csv_path)
+    tally = TaxonomyTally(sample_size=SAMPLE_SIZE)
+    for path in csv_paths:
+        with phase('parse', path):
+            tally.add_csv(path)
+    taxonomy_counts = tally.counts
+    taxonomy_concepts = tally.samples()
 
     total_concepts = sum(taxonomy_counts.values())
 
@@ -63,13 +102,24 @@ def analyze_taxonomy_distribution(csv_path: str, output_path: str, taxonomy_name
     under_represented = [(tax, name, count, pct) for tax, name, count, pct in taxonomy_data if pct < 3]
 
     # Generate markdown report
-    with open(output_path, 'w', encoding='utf-8') as f:
+    with phase('write'), open(output_path, 'w', encoding='utf-8') as f:
         f.write("# Taxonomy Distribution Report\n\n")
 
         f.write("## Overview\n\n")
         f.write(f"- **Total Concepts**: {total_concepts}\n")
         f.write(f"- **Number of Taxonomies**: {len(taxonomy_counts)}\n")
-        f.write(f"- **Average Concepts per Taxonomy**: {total_concepts / len(taxonomy_counts):.1f}\n\n")
+        f.write(f"- **Average Concepts per Taxonomy**: {total_concepts / len(taxonomy_counts):.1f}\n")
+        if len(tally.sources) > 1:
+            f.write(f"- **Learning Graphs**: {len(tally.sources)}\n")
+        f.write("\n")
+
+        if len(tally.sources) > 1:
+            f.write("## Learning Graphs\n\n")
+            f.write("| Learning Graph | Concepts |\n")
+            f.write("|----------------|----------|\n")
+            for source, count in tally.sources:
+                f.write(f"| {source} | {count} |\n")
+            f.write("\n")
 
         f.write("## Distribution Summary\n\n")
         f.write("| Category | TaxonomyID | Count | Percentage | Status |\n")
@@ -125,15 +175,14 @@ def analyze_taxonomy_distribution(csv_path: str, output_path: str, taxonomy_name
             f.write(f"### {name} ({tax})\n\n")
             f.write(f"**Count**: {count} concepts ({pct:.1f}%)\n\n")
 
-            concepts = taxonomy_concepts[tax]
-            concepts.sort(key=lambda x: x[0])  # Sort by ID
-
             f.write("**Concepts**:\n\n")
-            for concept_id, concept_label in concepts[:15]:  # Show first 15
-                f.write(f"- {concept_id}. {concept_label}\n")
+            for concept_id, concept_label, source in taxonomy_concepts[tax]:  # First 15 by ID
+                # Name the learning graph when concepts come from several books
+                origin = f" ({source})" if len(tally.sources) > 1 else ""
+                f.write(f"- {concept_id}. {concept_label}{origin}\n")
 
-            if len(concepts) > 15:
-                f.write(f"- *...and {len(concepts) - 15} more*\n")
+            if count > SAMPLE_SIZE:
+                f.write(f"- *...and {count - SAMPLE_SIZE} more*\n")
 
             f.write("\n")
 
@@ -177,14 +226,16 @@ def analyze_taxonomy_distribution(csv_path: str, output_path: str, taxonomy_name
 
 
 if __name__ == "__main__":
-    import sys
     import json
 
+    start_profile('taxonomy-distribution')
+
     # Parse command line arguments
     if len(sys.argv) < 3:
-        print("Usage: python taxonomy-distribution.py <input_csv> <output_report.md> [taxonomy_names.json]")
-        print("\nExample:")
+        print("Usage: python taxonomy-distribution.py <input_csv|directory> <output_report.md> [taxonomy_names.json] [--profile]")
+        print("\nExamples:")
         print("  python taxonomy-distribution.py data/concept-dependencies.csv reports/taxonomy-distribution.md")
+        print("  python taxonomy-distribution.py ~/textbooks reports/catalog-taxonomy-distribution.md")
         print("\nOptional taxonomy_names.json format:")
         print(json.dumps({
             'FOUNDATION': 'Foundation Concepts',
@@ -193,8 +244,11 @@ if __name__ == "__main__":
         }, indent=2))
         sys.exit(1)
 
-    csv_path = sys.argv[1]
+    csv_paths = find_learning_graphs(sys.argv[1])
     output_path = sys.argv[2]
+    if not csv_paths:
+        print(f"❌ No learning-graph.csv found under {sys.argv[1]}")
+        sys.exit(1)
 
     # Load taxonomy names if provided
     taxonomy_names = None
@@ -204,4 +258,4 @@ if __name__ == "__main__":
             taxonomy_names = json.load(f)
         print(f"📋 Loaded taxonomy names from: {config_file}")
 
-    analyze_taxonomy_distribution(csv_path, output_path, taxonomy_names)
+    analyze_taxonomy_distribution(csv_paths, output_path, taxonomy_names)
@@ -3,26 +3,98 @@
 validate-learning-graph.py
 Validates a learning graph JSON file against the learning-graph-schema.json
 
-Usage: python3 validate-learning-graph.py <data-file> <schema-file>
+The schema is compiled once per schema file and kept in memory. When
+fastjsonschema is installed the data is checked by code generated from the
+schema, and jsonschema is only run on invalid data to describe the error.
+Duplicate node IDs, orphan nodes and invalid edges are found in a single
+pass over the nodes and edges.
+
+Usage: python3 validate-learning-graph.py <data-file> <schema-file> [--profile]
 """
 
 import json
+import os
 import sys
 from pathlib import Path
 
+# Shared learning-graph core (learning_graph.py, next to this script)
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+from learning_graph import LearningGraph
+
+# Profiling hooks shared by this skill's scripts (profile_hooks.py, next to this script)
+from profile_hooks import phase, start_profile
+
 # ANSI color codes
 GREEN = '\033[0;32m'
 RED = '\033[0;31m'
 YELLOW = '\033[1;33m'
 NC = '\033[0m'  # No Color
 
+try:
+    import fastjsonschema
+except ImportError:
+    fastjsonschema = None
+
+# Schema validators by schema path, rebuilt when the schema file changes
+_VALIDATORS = {}
+
+
+def load_validator(schema_path):
+    """Load a schema and build its validator, once per version of the schema file.
+
+    Returns:
+        Function that raises jsonschema's ValidationError (the best match,
+        as jsonschema.validate reports it) when the data is invalid
+
+    Raises:
+        json.JSONDecodeError, OSError: The schema cannot be read
+        jsonschema.SchemaError: The schema itself is invalid
+    """
+    from jsonschema import validators
+    from jsonschema.exceptions import best_match
+
+    key = os.path.abspath(schema_path)
+    mtime = os.stat(key).st_mtime_ns
+    cached = _VALIDATORS.get(key)
+    if cached is not None and cached[0] == mtime:
+        return cached[1]
+
+    with open(schema_path, 'r') as f:
+        schema = json.load(f)
+    validator_class = validators.validator_for(schema)
+    validator_class.check_schema(schema)
+    validator = validator_class(schema)
+
+    fast_check = None
+    if fastjsonschema is not None:
+        try:
+            # jsonschema neither fills in defaults nor checks formats by default
+            fast_check = fastjsonschema.compile(schema, use_default=False, use_formats=False)
+        except Exception:
+            fast_check = None
+
+    def check(data):
+        if fast_check is not None:
+            try:
+                fast_check(data)
+                return
+            except fastjsonschema.JsonSchemaException:
+                pass
+        error = best_match(validator.iter_errors(data))
+        if error is not None:
+            raise error
+
+    _VALIDATORS[key] = (mtime, check)
+    return check
+
+
 def validate_learning_graph(data_path, schema_path):
     """Validate a learning graph JSON file against the schema."""
 
     # Try to import jsonschema
     try:
         import jsonschema
-        from jsonschema import validate, ValidationError, SchemaError
+        from jsonschema import ValidationError, SchemaError
     except ImportError:
         print(f"{RED}Error: jsonschema library not found{NC}")
         print("\nPlease install it with:")
@@ -31,20 +103,23 @@ def validate_learning_graph(data_path, schema_path):
         print("  conda install -c conda-forge jsonschema")
         return False
 
-    # Load schema
+    # Load schema and build its validator (cached across calls)
     try:
-        with open(schema_path, 'r') as f:
-            schema = json.load(f)
+        with phase('parse', schema_path):
+            check = load_validator(schema_path)
     except json.JSONDecodeError as e:
         print(f"{RED}✗ Schema file is not valid JSON: {e}{NC}")
         return False
+    except SchemaError as e:
+        print(f"{RED}✗ Schema itself is invalid: {e}{NC}")
+        return False
     except Exception as e:
         print(f"{RED}✗ Error reading schema file: {e}{NC}")
         return False
 
     # Load data
     try:
-        with open(data_path, 'r') as f:
+        with phase('parse', data_path), open(data_path, 'r') as f:
             data = json.load(f)
     except json.JSONDecodeError as e:
         print(f"{RED}✗ Data file is not valid JSON: {e}{NC}")
@@ -55,7 +130,8 @@ def validate_learning_graph(data_path, schema_path):
 
     # Validate
     try:
-        validate(instance=data, schema=schema)
+        with phase('aggregate'):
+            check(data)
         print(f"{GREEN}✓ Validation successful!{NC}")
         print("")
         print("Summary:")
@@ -68,38 +144,30 @@ def validate_learning_graph(data_path, schema_path):
         print(f"  Nodes: {len(data.get('nodes', []))}")
         print(f"  Edges: {len(data.get('edges', []))}")
 
-        # Check for orphan nodes
+        # Duplicate IDs, orphan nodes and invalid edges, from one pass over nodes and edges
         if 'nodes' in data and 'edges' in data:
-            node_ids = {node['id'] for node in data['nodes']}
-            connected_ids = set()
-            for edge in data['edges']:
-                connected_ids.add(edge['from'])
-                connected_ids.add(edge['to'])
-            orphans = node_ids - connected_ids
+            with phase('aggregate'):
+                graph = LearningGraph.from_vis_json(data)
+                orphans = graph.isolated()
             if orphans:
                 print(f"  {YELLOW}Orphan nodes: {len(orphans)} (nodes with no connections){NC}")
                 if len(orphans) <= 10:
-                    orphan_labels = [node['label'] for node in data['nodes'] if node['id'] in orphans]
+                    orphan_labels = [graph.labels[row] for row in orphans]
                     print(f"    {', '.join(orphan_labels)}")
             else:
                 print(f"  Orphan nodes: 0")
 
-        # Check for duplicate node IDs
-        node_ids_list = [node['id'] for node in data['nodes']]
-        if len(node_ids_list) != len(set(node_ids_list)):
-            duplicates = [id for id in node_ids_list if node_ids_list.count(id) > 1]
-            print(f"  {RED}Warning: Duplicate node IDs found: {set(duplicates)}{NC}")
-
-        # Check for edges referencing non-existent nodes
-        if 'nodes' in data and 'edges' in data:
-            node_ids = {node['id'] for node in data['nodes']}
-            invalid_edges = []
-            for edge in data['edges']:
-                if edge['from'] not in node_ids:
-                    invalid_edges.append(f"Edge from {edge['from']} -> {edge['to']}: source node {edge['from']} doesn't exist")
-                if edge['to'] not in node_ids:
-                    invalid_edges.append(f"Edge from {edge['from']} -> {edge['to']}: target node {edge['to']} doesn't exist")
-            if invalid_edges:
+            if graph.duplicate_ids:
+                print(f"  {RED}Warning: Duplicate node IDs found: {graph.duplicate_ids}{NC}")
+
+            if graph.invalid_edges:
+                node_ids = set(graph.concept_ids(range(graph.node_count)))
+                invalid_edges = []
+                for source, target in graph.invalid_edges:
+                    if source not in node_ids:
+                        invalid_edges.append(f"Edge from {source} -> {target}: source node {source} doesn't exist")
+                    if target not in node_ids:
+                        invalid_edges.append(f"Edge from {source} -> {target}: target node {target} doesn't exist")
                 print(f"  {RED}Warning: Invalid edges found:{NC}")
                 for invalid in invalid_edges[:5]:  # Show first 5
                     print(f"    - {invalid}")
@@ -132,6 +200,7 @@ def validate_learning_graph(data_path, schema_path):
 
 def main():
     """Main entry point."""
+    start_profile('validate-learning-graph')
     if len(sys.argv) != 3:
         print(f"{RED}Error: Wrong number of arguments{NC}")
         print(f"Usage: {sys.argv[0]} <data-file> <schema-file>")
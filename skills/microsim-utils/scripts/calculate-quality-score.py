@@ -22,7 +22,7 @@ Scoring Rubric (100 points total):
 - Type-specific (p5.js editor link): 5 pts
 
 Usage:
-    python calculate_quality_scores.py [--dry-run] [--verbose]
+    python calculate_quality_scores.py [--dry-run] [--verbose] [--profile]
 """
 
 import json
@@ -31,6 +31,10 @@ import argparse
 from pathlib import Path
 import sys
 
+# Profiling hooks shared by this skill's scripts (profile_hooks.py, next to this script)
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+from profile_hooks import add_profile_argument, phase, start_profile
+
 
 # Required Dublin Core fields for metadata.json validation
 REQUIRED_DUBLIN_CORE = [
@@ -386,17 +390,20 @@ def main():
         help="Only show MicroSims with score <= this value"
     )
 
+    add_profile_argument(parser)
     args = parser.parse_args()
+    start_profile('calculate-quality-score', args.profile)
 
     if not args.sims_dir.exists():
         print(f"Error: Sims directory not found: {args.sims_dir}")
         sys.exit(1)
 
     # Find all MicroSim directories
-    microsim_dirs = sorted([
-        d for d in args.sims_dir.iterdir()
-        if d.is_dir() and not d.name.startswith('.')
-    ])
+    with phase('walk'):
+        microsim_dirs = sorted([
+            d for d in args.sims_dir.iterdir()
+            if d.is_dir() and not d.name.startswith('.')
+        ])
 
     print(f"Scanning {len(microsim_dirs)} MicroSim directories...\n")
 
@@ -413,7 +420,7 @@ def main():
             continue
 
         # Read current content to check existing score
-        with open(index_md, 'r', encoding='utf-8') as f:
+        with phase('read', index_md), open(index_md, 'r', encoding='utf-8') as f:
             content = f.read()
 
         existing_score = get_existing_quality_score(content)
@@ -424,7 +431,8 @@ def main():
             continue
 
         # Calculate new score
-        new_score, details = calculate_quality_score(sim_dir, args.verbose)
+        with phase('parse', sim_dir.name):
+            new_score, details = calculate_quality_score(sim_dir, args.verbose)
 
         # Filter by score range
         if new_score < args.min_score or new_score > args.max_score:
@@ -443,8 +451,9 @@ def main():
 
         # Update file if needed
         if score_changed and not args.dry_run:
-            if update_quality_score(index_md, new_score):
-                updated_count += 1
+            with phase('write'):
+                if update_quality_score(index_md, new_score):
+                    updated_count += 1
 
     # Print results
     print(f"{'MicroSim':<40} {'Old':>5} {'New':>5} {'Status':<10}")
@@ -11,10 +11,15 @@ Scans a repository and collects metrics for README generation including:
 - Learning graph statistics
 
 Usage:
-    python collect-site-metrics.py [repo_path]
+    python collect-site-metrics.py [repo_path] [--profile]
 
 Output:
     JSON object with all collected metrics
+
+When run from (or symlinked into) the course repository, markdown files are
+read through the shared book corpus in src/book-metrics/book_corpus.py, so
+each file is read once even when several counters need it, and --profile
+prints a JSON timing summary (src/book-metrics/tool_profile.py) on exit.
 """
 
 import os
@@ -24,159 +29,171 @@ import sys
 from pathlib import Path
 from typing import Dict, List, Tuple
 
-def count_words_in_markdown(file_path: str) -> int:
-    """Count words in a markdown file, excluding code blocks and front matter."""
+# Profiling hooks shared by this skill's scripts (profile_hooks.py, next to this
+# script); inside the repository they also put src/book-metrics on sys.path
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+from profile_hooks import phase, start_profile
+
+# Shared parsed-document model from the repository's src/book-metrics; the
+# script falls back to plain file reads when it is installed on its own
+try:
+    from book_corpus import open_corpus
+except ImportError:
+    open_corpus = None
+
+def read_markdown(file_path: str, corpus=None) -> str:
+    """Read a markdown file, through the shared book corpus when available."""
     try:
+        if corpus is not None:
+            return corpus.text(Path(file_path))
         with open(file_path, 'r', encoding='utf-8') as f:
-            content = f.read()
+            return f.read()
+    except Exception as e:
+        print(f"Error reading {file_path}: {e}", file=sys.stderr)
+        return ''
+
+# Markdown patterns, compiled once. Patterns for matches at the start of a
+# line begin with "\n" and run over "\n" + content: a literal first character
+# lets the regex engine skip ahead, which re.MULTILINE "^" does not.
+FRONT_MATTER_PATTERN = re.compile(r'^---\s*\n.*?\n---\s*\n', re.DOTALL)
+CODE_BLOCK_PATTERN = re.compile(r'```.*?```', re.DOTALL)
+INLINE_CODE_PATTERN = re.compile(r'`[^`]+`')
+HTML_COMMENT_PATTERN = re.compile(r'<!--.*?-->', re.DOTALL)
+LINK_PATTERN = re.compile(r'\[([^\]]+)\]\([^\)]+\)')
+IMAGE_PATTERN = re.compile(r'!\[([^\]]*)\]\([^\)]+\)')
+UNORDERED_ITEM_PATTERN = re.compile(r'\n\s*[-*+]\s+')
+ORDERED_ITEM_PATTERN = re.compile(r'\n\s*\d+\.\s+')
+TABLE_SEPARATOR_PATTERN = re.compile(r'\n\|?\s*[-:]+\s*\|')
+DISPLAY_EQUATION_PATTERN = re.compile(r'\$\$.*?\$\$', re.DOTALL)
+# A "$" not preceded or followed by another "$" (the lookbehind comes after
+# the literal so the engine can scan for "$" directly)
+INLINE_EQUATION_PATTERN = re.compile(r'\$(?<!\$\$)(?!\$)[^$]+\$(?!\$)')
+
+# Image extensions counted under media (jpeg is reported with jpg)
+IMAGE_EXTENSIONS = ('png', 'jpg', 'jpeg', 'svg', 'gif')
+
+def count_words_in_markdown(content: str) -> int:
+    """Count words in a markdown file, excluding code blocks and front matter."""
+    # Remove YAML front matter
+    content = FRONT_MATTER_PATTERN.sub('', content)
 
-        # Remove YAML front matter
-        content = re.sub(r'^---\s*\n.*?\n---\s*\n', '', content, flags=re.DOTALL)
+    # Remove code blocks
+    content = CODE_BLOCK_PATTERN.sub('', content)
+    content = INLINE_CODE_PATTERN.sub('', content)
 
-        # Remove code blocks
-        content = re.sub(r'```.*?```', '', content, flags=re.DOTALL)
-        content = re.sub(r'`[^`]+`', '', content)
+    # Remove HTML comments
+    content = HTML_COMMENT_PATTERN.sub('', content)
 
-        # Remove HTML comments
-        content = re.sub(r'<!--.*?-->', '', content, flags=re.DOTALL)
+    # Remove markdown links but keep text
+    content = LINK_PATTERN.sub(r'\1', content)
 
-        # Remove markdown links but keep text
-        content = re.sub(r'\[([^\]]+)\]\([^\)]+\)', r'\1', content)
+    # Remove images
+    content = IMAGE_PATTERN.sub('', content)
 
-        # Remove images
-        content = re.sub(r'!\[([^\]]*)\]\([^\)]+\)', '', content)
+    # Count words
+    words = content.split()
+    return len(words)
 
-        # Count words
-        words = content.split()
-        return len(words)
-    except Exception as e:
-        print(f"Error reading {file_path}: {e}", file=sys.stderr)
-        return 0
-
-def count_list_items(file_path: str) -> int:
+def count_list_items(content: str) -> int:
     """Count markdown list items in a file."""
-    try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            content = f.read()
+    lines = '\n' + content
+    # Count unordered lists (-, *, +)
+    unordered = len(UNORDERED_ITEM_PATTERN.findall(lines))
+    # Count ordered lists (1., 2., etc.)
+    ordered = len(ORDERED_ITEM_PATTERN.findall(lines))
 
-        # Count unordered lists (-, *, +)
-        unordered = len(re.findall(r'^\s*[-*+]\s+', content, flags=re.MULTILINE))
-        # Count ordered lists (1., 2., etc.)
-        ordered = len(re.findall(r'^\s*\d+\.\s+', content, flags=re.MULTILINE))
-
-        return unordered + ordered
-    except Exception as e:
-        print(f"Error reading {file_path}: {e}", file=sys.stderr)
-        return 0
+    return unordered + ordered
 
-def count_tables(file_path: str) -> int:
+def count_tables(content: str) -> int:
     """Count markdown tables in a file."""
-    try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            content = f.read()
-
-        # Count table header separators (e.g., |---|---|)
-        tables = len(re.findall(r'^\|?\s*[-:]+\s*\|', content, flags=re.MULTILINE))
-        return tables
-    except Exception as e:
-        print(f"Error reading {file_path}: {e}", file=sys.stderr)
-        return 0
+    # Count table header separators (e.g., |---|---|)
+    tables = len(TABLE_SEPARATOR_PATTERN.findall('\n' + content))
+    return tables
 
-def count_code_blocks(file_path: str) -> int:
+def count_code_blocks(content: str) -> int:
     """Count code blocks in a markdown file."""
-    try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            content = f.read()
+    # Count fenced code blocks
+    code_blocks = content.count('```') // 2
+    return code_blocks
 
-        # Count fenced code blocks
-        code_blocks = len(re.findall(r'```', content)) // 2
-        return code_blocks
-    except Exception as e:
-        print(f"Error reading {file_path}: {e}", file=sys.stderr)
-        return 0
-
-def count_equations(file_path: str) -> int:
+def count_equations(content: str) -> int:
     """Count LaTeX equations in a markdown file."""
-    try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            content = f.read()
+    # Count display equations ($$...$$)
+    display = len(DISPLAY_EQUATION_PATTERN.findall(content))
+    # Count inline equations ($...$)
+    inline = len(INLINE_EQUATION_PATTERN.findall(content))
+
+    return display + inline
+
+def count_markdown(content: str) -> Dict[str, int]:
+    """Compute every per-file content counter from one read of a markdown file."""
+    return {
+        'total_words': count_words_in_markdown(content),
+        'list_items': count_list_items(content),
+        'tables': count_tables(content),
+        'code_blocks': count_code_blocks(content),
+        'equations': count_equations(content)
+    }
 
-        # Count display equations ($$...$$)
-        display = len(re.findall(r'\$\$.*?\$\$', content, flags=re.DOTALL))
-        # Count inline equations ($...$)
-        inline = len(re.findall(r'(?<!\$)\$(?!\$)[^$]+\$(?!\$)', content))
+def walk_docs(docs_path: Path) -> Tuple[List[Path], Dict[str, int]]:
+    """Walk the docs tree once, classifying every file by extension.
 
-        return display + inline
-    except Exception as e:
-        print(f"Error reading {file_path}: {e}", file=sys.stderr)
-        return 0
+    Returns:
+        Tuple of (markdown file paths, image file count per extension)
+    """
+    markdown_files = []
+    image_counts = dict.fromkeys(IMAGE_EXTENSIONS, 0)
 
-def count_quiz_questions(file_path: str) -> int:
-    """Count quiz questions in a quiz markdown file."""
-    try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            content = f.read()
+    for dirpath, _, filenames in os.walk(docs_path):
+        for name in filenames:
+            _, dot, ext = name.rpartition('.')
+            if not dot:
+                continue
+            if ext == 'md':
+                markdown_files.append(Path(dirpath, name))
+            elif ext in image_counts:
+                image_counts[ext] += 1
 
-        # Count question numbers (assumes format like "1.", "2.", etc. at start of line)
-        questions = len(re.findall(r'^\d+\.\s+', content, flags=re.MULTILINE))
+    return markdown_files, image_counts
 
-        # Alternative: count headers that start with numbers
-        if questions == 0:
-            questions = len(re.findall(r'^#+\s+\d+[\.)]?\s+', content, flags=re.MULTILINE))
+def count_quiz_questions(content: str) -> int:
+    """Count quiz questions in a quiz markdown file."""
+    # Count question numbers (assumes format like "1.", "2.", etc. at start of line)
+    questions = len(re.findall(r'^\d+\.\s+', content, flags=re.MULTILINE))
 
-        return questions
-    except Exception as e:
-        print(f"Error reading {file_path}: {e}", file=sys.stderr)
-        return 0
+    # Alternative: count headers that start with numbers
+    if questions == 0:
+        questions = len(re.findall(r'^#+\s+\d+[\.)]?\s+', content, flags=re.MULTILINE))
 
-def count_glossary_terms(file_path: str) -> int:
-    """Count glossary terms (assumes level 4 headers)."""
-    try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            content = f.read()
+    return questions
 
-        # Count level 4 headers (####)
-        terms = len(re.findall(r'^####\s+', content, flags=re.MULTILINE))
-        return terms
-    except Exception as e:
-        print(f"Error reading {file_path}: {e}", file=sys.stderr)
-        return 0
+def count_glossary_terms(content: str) -> int:
+    """Count glossary terms (assumes level 4 headers)."""
+    # Count level 4 headers (####)
+    terms = len(re.findall(r'^####\s+', content, flags=re.MULTILINE))
+    return terms
 
-def count_faq_questions(file_path: str) -> int:
+def count_faq_questions(content: str) -> int:
     """Count FAQ questions."""
-    try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            content = f.read()
-
-        # Count headers that end with question marks
-        questions = len(re.findall(r'^#+\s+.*\?', content, flags=re.MULTILINE))
+    # Count headers that end with question marks
+    questions = len(re.findall(r'^#+\s+.*\?', content, flags=re.MULTILINE))
 
-        # Alternative: count specific FAQ patterns
-        if questions == 0:
-            questions = len(re.findall(r'^#+\s+', content, flags=re.MULTILINE))
+    # Alternative: count specific FAQ patterns
+    if questions == 0:
+        questions = len(re.findall(r'^#+\s+', content, flags=re.MULTILINE))
 
-        return questions
-    except Exception as e:
-        print(f"Error reading {file_path}: {e}", file=sys.stderr)
-        return 0
+    return questions
 
-def count_references(file_path: str) -> int:
+def count_references(content: str) -> int:
     """Count references in references file."""
-    try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            content = f.read()
+    # Count numbered references or list items
+    refs = len(re.findall(r'^\d+\.\s+', content, flags=re.MULTILINE))
 
-        # Count numbered references or list items
-        refs = len(re.findall(r'^\d+\.\s+', content, flags=re.MULTILINE))
+    if refs == 0:
+        # Count list items
+        refs = len(re.findall(r'^\s*[-*+]\s+', content, flags=re.MULTILINE))
 
-        if refs == 0:
-            # Count list items
-            refs = len(re.findall(r'^\s*[-*+]\s+', content, flags=re.MULTILINE))
-
-        return refs
-    except Exception as e:
-        print(f"Error reading {file_path}: {e}", file=sys.stderr)
-        return 0
+    return refs
 
 def get_learning_graph_metrics(repo_path: Path) -> Dict:
     """Extract learning graph metrics from learning-graph directory."""
@@ -261,14 +278,37 @@ def collect_metrics(repo_path: str = '.') -> Dict:
         print(f"Warning: docs directory not found at {docs_path}", file=sys.stderr)
         return metrics
 
+    # One walk of the docs tree finds every markdown and image file
+    with phase('walk'):
+        markdown_files, image_counts = walk_docs(docs_path)
+
+    # Markdown files are read once, shared by every counter below
+    corpus = open_corpus(docs_path) if open_corpus is not None else None
+
+    # Top-level resource files and the counter applied to each
+    resource_counters = {
+        'glossary.md': ('glossary_terms', count_glossary_terms),
+        'faq.md': ('faq_questions', count_faq_questions),
+        'references.md': ('references', count_references)
+    }
+
     # Count markdown files and aggregate statistics
-    for md_file in docs_path.rglob('*.md'):
-        metrics['content']['markdown_files'] += 1
-        metrics['content']['total_words'] += count_words_in_markdown(str(md_file))
-        metrics['content']['list_items'] += count_list_items(str(md_file))
-        metrics['content']['tables'] += count_tables(str(md_file))
-        metrics['content']['code_blocks'] += count_code_blocks(str(md_file))
-        metrics['content']['equations'] += count_equations(str(md_file))
+    for md_file in markdown_files:
+        content = read_markdown(str(md_file), corpus)
+        with phase('aggregate', md_file):
+            metrics['content']['markdown_files'] += 1
+            for key, count in count_markdown(content).items():
+                metrics['content'][key] += count
+
+            # Count quizzes and questions
+            if md_file.name == 'quiz.md':
+                metrics['interactive']['quizzes'] += 1
+                metrics['interactive']['quiz_questions'] += count_quiz_questions(content)
+
+            # Count glossary terms, FAQ questions and references
+            if md_file.name in resource_counters and md_file.parent == docs_path:
+                key, counter = resource_counters[md_file.name]
+                metrics['resources'][key] = counter(content)
 
     # Count chapters
     chapters_path = docs_path / 'chapters'
@@ -281,30 +321,8 @@ def collect_metrics(repo_path: str = '.') -> Dict:
         metrics['interactive']['microsims'] = len([d for d in sims_path.iterdir()
                                                     if d.is_dir() and (d / 'index.md').exists()])
 
-    # Count quizzes and questions
-    for quiz_file in docs_path.rglob('quiz.md'):
-        metrics['interactive']['quizzes'] += 1
-        metrics['interactive']['quiz_questions'] += count_quiz_questions(str(quiz_file))
-
-    # Count glossary terms
-    glossary_file = docs_path / 'glossary.md'
-    if glossary_file.exists():
-        metrics['resources']['glossary_terms'] = count_glossary_terms(str(glossary_file))
-
-    # Count FAQ questions
-    faq_file = docs_path / 'faq.md'
-    if faq_file.exists():
-        metrics['resources']['faq_questions'] = count_faq_questions(str(faq_file))
-
-    # Count references
-    ref_file = docs_path / 'references.md'
-    if ref_file.exists():
-        metrics['resources']['references'] = count_references(str(ref_file))
-
     # Count images
-    for ext in ['png', 'jpg', 'jpeg', 'svg', 'gif']:
-        image_files = list(docs_path.rglob(f'*.{ext}'))
-        count = len(image_files)
+    for ext, count in image_counts.items():
         metrics['media']['images'] += count
         if ext in ['jpg', 'jpeg']:
             metrics['media']['jpg'] += count
@@ -356,17 +374,19 @@ def format_metrics_table(metrics: Dict) -> str:
 
 def main():
     """Main entry point."""
+    start_profile('collect-site-metrics')
     repo_path = sys.argv[1] if len(sys.argv) > 1 else '.'
 
     print(f"Collecting metrics from: {repo_path}", file=sys.stderr)
     metrics = collect_metrics(repo_path)
 
     # Output JSON
-    print(json.dumps(metrics, indent=2))
+    with phase('render'):
+        print(json.dumps(metrics, indent=2))
 
-    # Also print formatted table to stderr for reference
-    print("\n--- Formatted Table ---", file=sys.stderr)
-    print(format_metrics_table(metrics), file=sys.stderr)
+        # Also print formatted table to stderr for reference
+        print("\n--- Formatted Table ---", file=sys.stderr)
+        print(format_metrics_table(metrics), file=sys.stderr)
 
 if __name__ == '__main__':
     main()
@@ -10,7 +10,7 @@ Validates README.md files for:
 - Common issues
 
 Usage:
-    python validate-readme.py [path/to/README.md]
+    python validate-readme.py [path/to/README.md] [--profile]
 
 Output:
     Validation report with score and recommendations
@@ -22,6 +22,10 @@ from pathlib import Path
 from typing import List, Tuple, Dict
 from urllib.parse import urlparse
 
+# Profiling hooks shared by this skill's scripts (profile_hooks.py, next to this script)
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+from profile_hooks import phase, start_profile
+
 def check_required_sections(content: str) -> Tuple[List[str], List[str]]:
     """Check for required README sections."""
     required = [
@@ -153,7 +157,7 @@ def validate_readme(file_path: str) -> Dict:
         }
 
     try:
-        with open(path, 'r', encoding='utf-8') as f:
+        with phase('read', path), open(path, 'r', encoding='utf-8') as f:
             content = f.read()
     except Exception as e:
         return {
@@ -348,14 +352,17 @@ def format_report(report: Dict) -> str:
 
 def main():
     """Main entry point."""
+    start_profile('validate-readme')
     if len(sys.argv) < 2:
         print("Usage: python validate-readme.py <path/to/README.md>", file=sys.stderr)
         sys.exit(1)
 
     readme_path = sys.argv[1]
 
-    report = validate_readme(readme_path)
-    print(format_report(report))
+    with phase('parse', readme_path):
+        report = validate_readme(readme_path)
+    with phase('render'):
+        print(format_report(report))
 
     # Exit with error code if score is below 60
     if report['score'] < 60:
@@ -0,0 +1,363 @@
+#!/usr/bin/env python3
+"""
+Book Tools Benchmark Harness
+
+Times the analysis scripts on a synthetic textbook (see synthetic_book.py) or
+on an existing book, and reports wall time, throughput (MB/s, files/s) and
+peak RSS for each of:
+
+- book-metrics:      BookMetricsGenerator.generate_metrics (src/book-metrics)
+- equation-list:     EquationListGenerator.generate_report (src/book-metrics)
+- diagram-analysis:  DiagramAnalyzer.analyze_all_chapters (src/diagram-reports)
+- learning-graph:    analyze-graph.generate_report (skills/learning-graph-generator)
+- site-metrics:      collect_metrics (skills/readme-generator)
+- quality-score:     calculate_quality_score for every MicroSim (skills/microsim-utils)
+
+Every measured run happens in a fresh Python process, so runs do not share
+in-memory state and peak RSS is per benchmark. By default the on-disk caches
+are removed before each run (cold); --warm measures runs that start from
+populated caches instead. Results are written as JSON so that runs from
+different commits can be compared with --compare.
+
+Usage:
+    python run-benchmarks.py [--book DIR] [--chapters N] [--words N] ...
+                             [--repeat N] [--warm] [--only NAME ...]
+                             [--output results.json] [--compare baseline.json]
+"""
+
+import os
+import io
+import sys
+import json
+import time
+import platform
+import argparse
+import tempfile
+import contextlib
+import subprocess
+import statistics
+import importlib.util
+from dataclasses import asdict
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, List
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+SCRIPT_DIR = Path(__file__).resolve().parent
+REPO_ROOT = SCRIPT_DIR.parent.parent
+sys.path.insert(0, str(SCRIPT_DIR))
+from synthetic_book import BookSpec, generate_book
+
+# Version of the benchmark result format
+VERSION = "1.0"
+
+# Corpus cache inside the book, removed before every cold run
+CORPUS_CACHE = Path('docs') / '.book-corpus-cache.json'
+
+# Image files collect-site-metrics.py counts (its IMAGE_EXTENSIONS)
+SITE_IMAGE_EXTENSIONS = ('png', 'jpg', 'jpeg', 'svg', 'gif')
+
+
+def load_script(name: str, path: Path):
+    """Import one of the hyphenated tool scripts as a module.
+
+    Args:
+        name: Module name to register the script under
+        path: Path to the script
+
+    Returns:
+        The loaded module
+    """
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+def markdown_inputs(book: Path) -> List[Path]:
+    return sorted((book / 'docs').rglob('*.md'))
+
+
+def chapter_inputs(book: Path) -> List[Path]:
+    return sorted((book / 'docs' / 'chapters').glob('*/index.md'))
+
+
+def graph_inputs(book: Path) -> List[Path]:
+    return [book / 'docs' / 'learning-graph' / 'learning-graph.csv']
+
+
+def site_images(book: Path) -> List[Path]:
+    return sorted(p for p in (book / 'docs').rglob('*')
+                  if p.is_file() and p.suffix[1:] in SITE_IMAGE_EXTENSIONS)
+
+
+def microsim_inputs(book: Path) -> List[Path]:
+    return sorted(p for p in (book / 'docs' / 'sims').glob('*/*') if p.is_file())
+
+
+def run_book_metrics(module, book: Path, output_dir: Path, warm: bool):
+    module.BookMetricsGenerator(str(book / 'docs'), use_cache=warm).generate_metrics(output_dir)
+
+
+def run_equation_list(module, book: Path, output_dir: Path, warm: bool):
+    module.EquationListGenerator(str(book / 'docs'), use_cache=warm).generate_report(output_dir / 'list-equations.md')
+
+
+def run_diagram_analysis(module, book: Path, output_dir: Path, warm: bool):
+    cache = None
+    if warm:
+        cache = module.ElementCache(output_dir / module.CACHE_FILENAME)
+        cache.load()
+    corpus = module.open_corpus(book / 'docs', use_cache=warm)
+    analyzer = module.DiagramAnalyzer(str(book / 'docs' / 'chapters'), cache=cache, corpus=corpus)
+    analyzer.analyze_all_chapters(workers=1)
+    corpus.save()
+    if cache is not None:
+        cache.save()
+
+
+def run_learning_graph(module, book: Path, output_dir: Path, warm: bool):
+    module.generate_report(str(graph_inputs(book)[0]), str(output_dir / 'quality-metrics.md'))
+
+
+def run_site_metrics(module, book: Path, output_dir: Path, warm: bool):
+    module.collect_metrics(str(book))
+
+
+def run_quality_score(module, book: Path, output_dir: Path, warm: bool):
+    for sim_dir in sorted((book / 'docs' / 'sims').iterdir()):
+        if sim_dir.is_dir():
+            module.calculate_quality_score(sim_dir)
+
+
+# Benchmark name -> (script under the repository root, runner, function listing the files it reads)
+BENCHMARKS: Dict[str, tuple] = {
+    'book-metrics': ('src/book-metrics/book-metrics.py', run_book_metrics, markdown_inputs),
+    'equation-list': ('src/book-metrics/generate-equation-list.py', run_equation_list, markdown_inputs),
+    'diagram-analysis': ('src/diagram-reports/diagram-report.py', run_diagram_analysis, chapter_inputs),
+    'learning-graph': ('skills/learning-graph-generator/analyze-graph.py', run_learning_graph, graph_inputs),
+    'site-metrics': ('skills/readme-generator/scripts/collect-site-metrics.py', run_site_metrics, markdown_inputs),
+    'quality-score': ('skills/microsim-utils/scripts/calculate-quality-score.py', run_quality_score, microsim_inputs),
+}
+
+# Benchmark name -> files it only counts without reading, reported next to its inputs
+COUNTED_FILES: Dict[str, Dict[str, Callable[[Path], List[Path]]]] = {
+    'site-metrics': {'images': site_images},
+}
+
+
+def peak_rss_mb() -> float:
+    """Return this process's peak resident set size in MB (0 if unknown)."""
+    if resource is None:
+        return 0.0
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and in kilobytes elsewhere
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+
+def run_one(name: str, book: Path, output_dir: Path, warm: bool) -> Dict[str, float]:
+    """Run a single benchmark in this process and measure it.
+
+    The tool's script is imported before the clock starts, and its output
+    is discarded so that printing does not count towards the timing.
+
+    Returns:
+        Dict with the elapsed seconds and peak RSS of this process
+    """
+    script, runner, _ = BENCHMARKS[name]
+    module = load_script(Path(script).stem.replace('-', '_'), REPO_ROOT / script)
+
+    sink = io.StringIO()
+    with contextlib.redirect_stdout(sink), contextlib.redirect_stderr(sink):
+        start = time.perf_counter()
+        runner(module, book, output_dir, warm)
+        elapsed = time.perf_counter() - start
+
+    return {'seconds': elapsed, 'peak_rss_mb': peak_rss_mb()}
+
+
+def measure(name: str, book: Path, output_dir: Path, repeat: int, warm: bool) -> Dict[str, object]:
+    """Run a benchmark `repeat` times, each in a fresh process.
+
+    Reports and the diagram element cache are written to `output_dir`, so
+    the book itself only gains the corpus cache.
+
+    Returns:
+        Dict with input size, per-run times, throughput and peak RSS
+    """
+    _, _, list_inputs = BENCHMARKS[name]
+    inputs = list_inputs(book)
+    input_bytes = sum(p.stat().st_size for p in inputs)
+    counted = {key: len(list_counted(book)) for key, list_counted in COUNTED_FILES.get(name, {}).items()}
+
+    def child() -> Dict[str, float]:
+        cmd = [sys.executable, str(Path(__file__).resolve()), '--run-one', name,
+               '--book', str(book), '--work-dir', str(output_dir)]
+        if warm:
+            cmd.append('--warm')
+        result = subprocess.run(cmd, capture_output=True, text=True)
+        if result.returncode != 0:
+            raise RuntimeError(f"{name} failed:\n{result.stderr}")
+        return json.loads(result.stdout.strip().splitlines()[-1])
+
+    if warm:
+        # Populate the caches once; this run is not measured
+        child()
+
+    runs = []
+    for _ in range(repeat):
+        if not warm:
+            for cache_file in (book / CORPUS_CACHE, output_dir / '.diagram-report-cache.json'):
+                with contextlib.suppress(FileNotFoundError):
+                    cache_file.unlink()
+        runs.append(child())
+
+    times = [run['seconds'] for run in runs]
+    best = min(times)
+    return {
+        'files': len(inputs),
+        'bytes': input_bytes,
+        **counted,
+        'seconds': [round(t, 6) for t in times],
+        'best_seconds': round(best, 6),
+        'median_seconds': round(statistics.median(times), 6),
+        'mb_per_second': round(input_bytes / (1024 * 1024) / best, 3) if best > 0 else None,
+        'files_per_second': round(len(inputs) / best, 1) if best > 0 else None,
+        'peak_rss_mb': round(max(run['peak_rss_mb'] for run in runs), 1),
+    }
+
+
+def git_commit() -> str:
+    """Return the repository's current commit, or None outside a git checkout."""
+    try:
+        result = subprocess.run(['git', 'rev-parse', 'HEAD'], cwd=REPO_ROOT,
+                                capture_output=True, text=True, check=True)
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return result.stdout.strip()
+
+
+def compare(results: Dict, baseline: Dict, threshold: float) -> bool:
+    """Print best-time ratios against a baseline result file.
+
+    Timings are only comparable for the same book and cache mode, so a
+    baseline with a different `source` or `cache` is refused; a different
+    `repeat` only draws a warning.
+
+    Returns:
+        True if no benchmark is slower than the baseline by more than `threshold`
+    """
+    for key in ('source', 'cache'):
+        if baseline.get(key) != results[key]:
+            print(f"\n❌ Error: baseline {key} {json.dumps(baseline.get(key))} differs from this run's "
+                  f"{json.dumps(results[key])}; not comparing", file=sys.stderr)
+            return False
+    if baseline.get('repeat') != results['repeat']:
+        print(f"\n⚠️  Warning: baseline used --repeat {baseline.get('repeat')}, this run "
+              f"{results['repeat']}; best times may not be comparable", file=sys.stderr)
+
+    ok = True
+    print(f"\nCompared with {baseline.get('git_commit') or 'baseline'}:", file=sys.stderr)
+    for name, current in results['benchmarks'].items():
+        previous = baseline.get('benchmarks', {}).get(name)
+        if not previous:
+            print(f"  {name:18} (not in baseline)", file=sys.stderr)
+            continue
+        ratio = current['best_seconds'] / previous['best_seconds'] if previous['best_seconds'] else float('inf')
+        flag = ''
+        if ratio > threshold:
+            flag = '  ❌ slower'
+            ok = False
+        print(f"  {name:18} {previous['best_seconds']:8.3f}s -> {current['best_seconds']:8.3f}s  "
+              f"x{ratio:.2f}{flag}", file=sys.stderr)
+    return ok
+
+
+def main():
+    """Main entry point."""
+    defaults = BookSpec()
+    parser = argparse.ArgumentParser(description="Benchmark the textbook analysis scripts")
+    parser.add_argument('--book', default=None,
+                        help='Existing book directory (containing docs/) to benchmark instead of a synthetic one')
+    parser.add_argument('--keep', default=None, help='Generate the synthetic book in this directory and keep it')
+    parser.add_argument('--chapters', type=int, default=defaults.chapters, help=f'Number of chapters (default: {defaults.chapters})')
+    parser.add_argument('--words', type=int, default=defaults.words_per_chapter, help=f'Words per chapter (default: {defaults.words_per_chapter})')
+    parser.add_argument('--equations', type=int, default=defaults.equations_per_chapter, help=f'Equations per chapter (default: {defaults.equations_per_chapter})')
+    parser.add_argument('--diagrams', type=int, default=defaults.diagrams_per_chapter, help=f'Diagram specifications per chapter (default: {defaults.diagrams_per_chapter})')
+    parser.add_argument('--microsims', type=int, default=defaults.microsims, help=f'MicroSim directories (default: {defaults.microsims})')
+    parser.add_argument('--concepts', type=int, default=defaults.concepts, help=f'Learning-graph concepts (default: {defaults.concepts})')
+    parser.add_argument('--seed', type=int, default=defaults.seed, help=f'Random seed (default: {defaults.seed})')
+    parser.add_argument('--repeat', type=int, default=3, help='Measured runs per benchmark (default: 3)')
+    parser.add_argument('--warm', action='store_true', help='Measure runs that start from populated on-disk caches')
+    parser.add_argument('--only', nargs='+', choices=sorted(BENCHMARKS), help='Run only these benchmarks')
+    parser.add_argument('--output', default=None, help='Write the JSON results to this file (default: stdout)')
+    parser.add_argument('--compare', default=None, help='Baseline JSON results to compare against')
+    parser.add_argument('--threshold', type=float, default=1.10,
+                        help='Slowdown ratio against --compare that fails the run (default: 1.10)')
+    parser.add_argument('--run-one', default=None, help=argparse.SUPPRESS)
+    parser.add_argument('--work-dir', default=None, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.repeat < 1:
+        parser.error('--repeat must be at least 1')
+
+    if args.run_one:
+        print(json.dumps(run_one(args.run_one, Path(args.book), Path(args.work_dir), args.warm)))
+        return
+
+    spec = BookSpec(chapters=args.chapters, words_per_chapter=args.words, equations_per_chapter=args.equations,
+                    diagrams_per_chapter=args.diagrams, microsims=args.microsims, concepts=args.concepts,
+                    seed=args.seed)
+
+    with tempfile.TemporaryDirectory(prefix='book-bench-') as tmp:
+        if args.book:
+            book = Path(args.book).resolve()
+            if not (book / 'docs').is_dir():
+                print(f"❌ Error: '{book}' has no docs directory")
+                sys.exit(1)
+            source = {'book': str(book)}
+        else:
+            book = Path(args.keep).resolve() if args.keep else Path(tmp) / 'book'
+            print(f"Generating synthetic book in {book}", file=sys.stderr)
+            source = {'spec': asdict(spec), **generate_book(book, spec)}
+
+        results = {
+            'version': VERSION,
+            'timestamp': datetime.now().isoformat(timespec='seconds'),
+            'git_commit': git_commit(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'cpu_count': os.cpu_count(),
+            'cache': 'warm' if args.warm else 'cold',
+            'repeat': args.repeat,
+            'source': source,
+            'benchmarks': {},
+        }
+
+        for name in args.only or BENCHMARKS:
+            print(f"Running {name} ...", file=sys.stderr)
+            output_dir = Path(tmp) / 'output' / name
+            output_dir.mkdir(parents=True)
+            results['benchmarks'][name] = measure(name, book, output_dir, args.repeat, args.warm)
+
+    output = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(output + '\n')
+        print(f"✅ Results written to {args.output}", file=sys.stderr)
+    else:
+        print(output)
+
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+        if not compare(results, baseline, args.threshold):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,258 @@
+#!/usr/bin/env python3
+"""
+Synthetic Intelligent Textbook Generator
+
+Writes a deterministic textbook tree with the layout the book tools expect,
+so their speed can be measured on books of any size:
+
+    <root>/
+    ├── mkdocs.yml
+    └── docs/
+        ├── index.md, glossary.md, faq.md, references.md
+        ├── chapters/NN-chapter-N/index.md and quiz.md
+        ├── sims/<name>/index.md, main.html, metadata.json, <name>.png
+        └── learning-graph/learning-graph.csv
+
+Chapters contain prose, section headings, links, code blocks, display and
+inline equations and `#### Diagram:` headers with `<details>` specifications.
+The same spec and seed always produce byte-identical trees.
+
+Usage:
+    python synthetic_book.py OUTPUT_DIR [--chapters N] [--words N] [--equations N]
+                             [--diagrams N] [--microsims N] [--concepts N] [--seed N]
+"""
+
+import json
+import random
+import argparse
+from dataclasses import dataclass, asdict
+from pathlib import Path
+from typing import Dict
+
+# Vocabulary for generated prose
+WORDS = (
+    "signal system model graph concept network learning energy circuit student "
+    "measure function vector matrix process feedback control sensor design data "
+    "structure balance theory practice example pattern method analysis result "
+    "variable output input layer node edge value state change rate force field "
+    "the a of and to in is that for with as on by an this from are be it which"
+).split()
+
+# Taxonomy categories assigned to learning-graph concepts
+TAXONOMY_IDS = ['FOUND', 'BASIC', 'CORE', 'APPLY', 'ADVAN', 'INTEG', 'PRACT', 'MISC']
+
+# Bloom's levels and UI controls mixed into diagram specifications
+BLOOM_LEVELS = ['Remember', 'Understand', 'Apply', 'Analyze', 'Evaluate', 'Create']
+UI_CONTROLS = ['slider', 'button', 'dropdown', 'checkbox', 'toggle', 'panel']
+
+# 1x1 transparent PNG used as a MicroSim screenshot
+PNG_BYTES = bytes.fromhex(
+    '89504e470d0a1a0a0000000d4948445200000001000000010806000000'
+    '1f15c4890000000d49444154789c6360000002000001e221bc330000000049454e44ae426082')
+
+
+@dataclass
+class BookSpec:
+    """Size parameters of a synthetic textbook."""
+    chapters: int = 12
+    words_per_chapter: int = 4000
+    equations_per_chapter: int = 20
+    diagrams_per_chapter: int = 4
+    microsims: int = 20
+    concepts: int = 200
+    seed: int = 1
+
+
+def _sentence(rng: random.Random, length: int) -> str:
+    words = [rng.choice(WORDS) for _ in range(length)]
+    return ' '.join(words).capitalize() + '.'
+
+
+def _paragraph(rng: random.Random, words: int) -> str:
+    sentences = []
+    while words > 0:
+        length = min(words, rng.randint(8, 20))
+        sentences.append(_sentence(rng, length))
+        words -= length
+    return ' '.join(sentences)
+
+
+def _equation(rng: random.Random) -> str:
+    a, b = rng.sample('xyzabcmnk', 2)
+    return rng.choice([
+        f"{a}^2 + {b}^2 = r^2",
+        f"\\frac{{d{a}}}{{dt}} = k {a}",
+        f"\\sum_{{i=1}}^{{n}} {a}_i {b}_i",
+        f"F = m \\cdot {a}",
+        f"\\int_0^1 {a}({b})\\, d{b}",
+    ])
+
+
+def _diagram(rng: random.Random, chapter: int, number: int) -> str:
+    title = f"Chapter {chapter} Diagram {number}"
+    kind = rng.choice(['diagram', 'microsim'])
+    blooms = ', '.join(rng.sample(BLOOM_LEVELS, 2))
+    controls = ', '.join(f"{rng.choice(UI_CONTROLS)} for {rng.choice(WORDS)}" for _ in range(rng.randint(1, 4)))
+    return (
+        f"#### Diagram: {title}\n\n"
+        f"<iframe src=\"../../sims/sim-{number}/main.html\" width=\"100%\" height=\"500px\" scrolling=\"no\"></iframe>\n\n"
+        f"<details markdown=\"1\">\n"
+        f"<summary>{title}</summary>\n"
+        f"**Type:** {kind}\n\n"
+        f"**Status:** {rng.choice(['Specified', 'Implemented'])}\n\n"
+        f"Bloom's Taxonomy: {blooms}\n\n"
+        f"**Learning Objective:** {_sentence(rng, 12)}\n\n"
+        f"Components to show: {controls}. {_paragraph(rng, 40)}\n\n"
+        f"**MicroSim Generator Recommendations:**\n\n"
+        f"1. p5-js-microsim-generator ({rng.randint(60, 95)}/100)\n"
+        f"2. chartjs-generator ({rng.randint(30, 70)}/100)\n"
+        f"</details>\n"
+    )
+
+
+def _chapter(rng: random.Random, spec: BookSpec, chapter: int) -> str:
+    sections = max(1, spec.words_per_chapter // 400)
+    words_per_section = spec.words_per_chapter // sections
+    lines = [f"# Chapter {chapter}: {_sentence(rng, 3)[:-1]}", '', _paragraph(rng, 60), '']
+
+    for section in range(1, sections + 1):
+        lines += [f"## Section {chapter}.{section}", '']
+        paragraphs = max(1, words_per_section // 80)
+        for _ in range(paragraphs):
+            lines += [_paragraph(rng, words_per_section // paragraphs), '']
+        lines += [f"See [the glossary](../../glossary.md) and [the reference](https://example.com/{chapter}/{section}).", '']
+        if section % 3 == 0:
+            lines += ['```python', f"value = compute({chapter}, {section})", '```', '']
+
+    # Equations and diagrams follow the prose sections
+    for number in range(1, spec.equations_per_chapter + 1):
+        if number % 2:
+            lines += [f"$${_equation(rng)}$$", '']
+        else:
+            lines += [f"The relation ${_equation(rng)}$ holds. {_sentence(rng, 8)}", '']
+    for number in range(1, spec.diagrams_per_chapter + 1):
+        lines += [_diagram(rng, chapter, number)]
+
+    return '\n'.join(lines) + '\n'
+
+
+def _quiz(rng: random.Random, chapter: int) -> str:
+    lines = [f"# Chapter {chapter} Quiz", '']
+    for number in range(1, 11):
+        lines += [f"#### {number}. {_sentence(rng, 8)[:-1]}?", '']
+        lines += [f"{letter}. {_sentence(rng, 4)}" for letter in 'ABCD']
+        lines += ['', '??? question "Show Answer"', f"    The correct answer is **B**. {_sentence(rng, 10)}", '']
+    return '\n'.join(lines) + '\n'
+
+
+def _microsim(rng: random.Random, name: str) -> Dict[str, str]:
+    index = (
+        f"---\ntitle: {name}\ndescription: {_sentence(rng, 10)}\nimage: /sims/{name}/{name}.png\n---\n\n"
+        f"# {name.replace('-', ' ').title()}\n\n"
+        f"<iframe src=\"main.html\" width=\"100%\" height=\"450px\" scrolling=\"no\"></iframe>\n\n"
+        f"[Run Fullscreen](main.html){{ .md-button .md-button--primary }}\n\n"
+        f"```html\n<iframe src=\"https://example.com/sims/{name}/main.html\" width=\"100%\"></iframe>\n```\n\n"
+        f"## Description\n\n{_paragraph(rng, 120)}\n\n"
+        f"## Lesson Plan\n\n{_paragraph(rng, 80)}\n\n"
+        f"## References\n\n1. [Reference](https://example.com/{name})\n"
+    )
+    main_html = (
+        "<!DOCTYPE html>\n<html>\n<head>\n"
+        "<script src=\"https://cdn.jsdelivr.net/npm/p5@1.11.1/lib/p5.js\"></script>\n"
+        "</head>\n<body>\n<script>\nfunction setup() { createCanvas(400, 400); }\n"
+        "function draw() { background(240); }\n</script>\n</body>\n</html>\n"
+    )
+    metadata = {
+        'title': name, 'description': _sentence(rng, 10), 'creator': 'Synthetic Author',
+        'date': '2025-01-01', 'subject': 'Benchmarks', 'type': 'Interactive Simulation',
+        'format': 'text/html', 'language': 'en-US', 'rights': 'CC BY-NC-SA 4.0',
+    }
+    return {'index.md': index, 'main.html': main_html, 'metadata.json': json.dumps(metadata, indent=2) + '\n'}
+
+
+def _learning_graph(rng: random.Random, concepts: int) -> str:
+    lines = ['ConceptID,ConceptLabel,Dependencies,TaxonomyID']
+    for concept_id in range(1, concepts + 1):
+        # Prerequisites always have lower IDs, so the graph is a DAG
+        prereqs = sorted(rng.sample(range(1, concept_id), min(concept_id - 1, rng.randint(1, 3)))) if concept_id > 1 else []
+        label = f"{rng.choice(WORDS).title()} {rng.choice(WORDS).title()} {concept_id}"
+        taxonomy = TAXONOMY_IDS[min(len(TAXONOMY_IDS) - 1, (concept_id - 1) * len(TAXONOMY_IDS) // concepts)]
+        lines.append(f"{concept_id},{label},{'|'.join(map(str, prereqs))},{taxonomy}")
+    return '\n'.join(lines) + '\n'
+
+
+def generate_book(root: Path, spec: BookSpec) -> Dict[str, int]:
+    """Write a synthetic textbook tree.
+
+    Args:
+        root: Directory to create the book in (mkdocs.yml and docs/ go here)
+        spec: Size parameters of the book
+
+    Returns:
+        Dict with the number of files and bytes written
+    """
+    rng = random.Random(spec.seed)
+    root = Path(root)
+    docs = root / 'docs'
+    files: Dict[Path, object] = {}
+
+    files[root / 'mkdocs.yml'] = "site_name: Synthetic Textbook\nnav:\n  - Home: index.md\n"
+    files[docs / 'index.md'] = f"# Synthetic Textbook\n\n{_paragraph(rng, 200)}\n"
+
+    for chapter in range(1, spec.chapters + 1):
+        chapter_dir = docs / 'chapters' / f"{chapter:02d}-chapter-{chapter}"
+        files[chapter_dir / 'index.md'] = _chapter(rng, spec, chapter)
+        files[chapter_dir / 'quiz.md'] = _quiz(rng, chapter)
+
+    glossary = ['# Glossary', '']
+    faq = ['# Frequently Asked Questions', '']
+    for term in range(1, spec.concepts + 1):
+        glossary += [f"#### Term {term}", '', _sentence(rng, 15), '']
+        if term % 4 == 0:
+            faq += [f"### What is term {term}?", '', _paragraph(rng, 40), '']
+    files[docs / 'glossary.md'] = '\n'.join(glossary) + '\n'
+    files[docs / 'faq.md'] = '\n'.join(faq) + '\n'
+    files[docs / 'references.md'] = '# References\n\n' + ''.join(
+        f"{n}. [Reference {n}](https://example.com/ref/{n})\n" for n in range(1, 31))
+
+    for number in range(1, spec.microsims + 1):
+        name = f"sim-{number}"
+        for filename, content in _microsim(rng, name).items():
+            files[docs / 'sims' / name / filename] = content
+        files[docs / 'sims' / name / f"{name}.png"] = PNG_BYTES
+
+    files[docs / 'learning-graph' / 'learning-graph.csv'] = _learning_graph(rng, spec.concepts)
+
+    total_bytes = 0
+    for path, content in files.items():
+        path.parent.mkdir(parents=True, exist_ok=True)
+        data = content if isinstance(content, bytes) else content.encode('utf-8')
+        path.write_bytes(data)
+        total_bytes += len(data)
+
+    return {'files': len(files), 'bytes': total_bytes}
+
+
+def main():
+    """Main entry point."""
+    defaults = BookSpec()
+    parser = argparse.ArgumentParser(description="Generate a synthetic intelligent textbook for benchmarking")
+    parser.add_argument('output_dir', help='Directory to create the book in')
+    parser.add_argument('--chapters', type=int, default=defaults.chapters, help=f'Number of chapters (default: {defaults.chapters})')
+    parser.add_argument('--words', type=int, default=defaults.words_per_chapter, help=f'Words per chapter (default: {defaults.words_per_chapter})')
+    parser.add_argument('--equations', type=int, default=defaults.equations_per_chapter, help=f'Equations per chapter (default: {defaults.equations_per_chapter})')
+    parser.add_argument('--diagrams', type=int, default=defaults.diagrams_per_chapter, help=f'Diagram specifications per chapter (default: {defaults.diagrams_per_chapter})')
+    parser.add_argument('--microsims', type=int, default=defaults.microsims, help=f'MicroSim directories (default: {defaults.microsims})')
+    parser.add_argument('--concepts', type=int, default=defaults.concepts, help=f'Learning-graph concepts (default: {defaults.concepts})')
+    parser.add_argument('--seed', type=int, default=defaults.seed, help=f'Random seed (default: {defaults.seed})')
+    args = parser.parse_args()
+
+    spec = BookSpec(chapters=args.chapters, words_per_chapter=args.words, equations_per_chapter=args.equations,
+                    diagrams_per_chapter=args.diagrams, microsims=args.microsims, concepts=args.concepts,
+                    seed=args.seed)
+    written = generate_book(Path(args.output_dir), spec)
+    print(json.dumps({'spec': asdict(spec), **written}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
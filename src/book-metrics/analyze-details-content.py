@@ -7,18 +7,30 @@ and prioritize skill development based on impact and effort.
 Supports both old format (<details>) and new format (<details markdown="1">).
 """
 import re
+import sys
 from pathlib import Path
 from collections import defaultdict
 from typing import Dict, List, Tuple
 
+# Shared parsed-document model lives next to this script
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+from book_corpus import MarkdownCorpus, open_corpus
+from tool_profile import phase, start_profile
 
-def extract_details_content(docs_dir: Path) -> List[Dict]:
+
+def extract_details_content(docs_dir: Path, corpus: MarkdownCorpus = None) -> List[Dict]:
     """Extract all <details> tag content from chapter markdown files.
 
     Supports both formats:
     - Old: <details>
     - New: <details markdown="1">
+
+    The blocks come from the shared corpus record of each chapter's index.md,
+    so chapters already parsed by another book tool are not re-read.
     """
+    if corpus is None:
+        corpus = open_corpus(docs_dir)
+
     chapters_dir = docs_dir / 'chapters'
     if not chapters_dir.exists():
         return []
@@ -33,46 +45,38 @@ def extract_details_content(docs_dir: Path) -> List[Dict]:
         if not index_file.exists():
             continue
 
-        with open(index_file, 'r', encoding='utf-8') as f:
-            content = f.read()
-
-            # Extract chapter title
-            title_match = re.search(r'^#\s+(.+)$', content, re.MULTILINE)
-            chapter_title = title_match.group(1) if title_match else chapter_dir.name
-
-            # Find all <details> blocks (supports both old and new format)
-            # Old format: <details>
-            # New format: <details markdown="1">
-            details_pattern = r'<details(?:\s+markdown="1")?>(.*?)</details>'
-            matches = re.finditer(details_pattern, content, re.DOTALL | re.IGNORECASE)
+        doc = corpus.document(index_file)
 
-            for match in matches:
-                details_content = match.group(1)
+        # Extract chapter title
+        chapter_title = doc.title or chapter_dir.name
 
-                # Extract summary
-                summary_match = re.search(r'<summary>(.*?)</summary>', details_content, re.IGNORECASE)
-                summary = summary_match.group(1).strip() if summary_match else "No summary"
+        # <details> blocks in both old and new format
+        for details_content, _ in doc.details:
+            # Extract summary
+            summary_match = re.search(r'<summary>(.*?)</summary>', details_content, re.IGNORECASE)
+            summary = summary_match.group(1).strip() if summary_match else "No summary"
 
-                # Extract type
-                type_match = re.search(r'Type:\s*(.+)$', details_content, re.MULTILINE | re.IGNORECASE)
-                viz_type = type_match.group(1).strip() if type_match else "unknown"
+            # Extract type
+            type_match = re.search(r'Type:\s*(.+)$', details_content, re.MULTILINE | re.IGNORECASE)
+            viz_type = type_match.group(1).strip() if type_match else "unknown"
 
-                # Extract purpose
-                purpose_match = re.search(r'Purpose:\s*(.+)$', details_content, re.MULTILINE | re.IGNORECASE)
-                purpose = purpose_match.group(1).strip() if purpose_match else ""
+            # Extract purpose
+            purpose_match = re.search(r'Purpose:\s*(.+)$', details_content, re.MULTILINE | re.IGNORECASE)
+            purpose = purpose_match.group(1).strip() if purpose_match else ""
 
-                # Extract learning objective (if present)
-                learning_match = re.search(r'Learning objective:\s*(.+)$', details_content, re.MULTILINE | re.IGNORECASE)
-                learning_obj = learning_match.group(1).strip() if learning_match else ""
+            # Extract learning objective (if present)
+            learning_match = re.search(r'Learning objective:\s*(.+)$', details_content, re.MULTILINE | re.IGNORECASE)
+            learning_obj = learning_match.group(1).strip() if learning_match else ""
 
-                details_list.append({
-                    'chapter': chapter_title,
-                    'summary': summary,
-                    'type': viz_type,
-                    'purpose': purpose,
-                    'learning_objective': learning_obj
-                })
+            details_list.append({
+                'chapter': chapter_title,
+                'summary': summary,
+                'type': viz_type,
+                'purpose': purpose,
+                'learning_objective': learning_obj
+            })
 
+    corpus.save()
     return details_list
 
 
@@ -272,6 +276,7 @@ def generate_markdown_report(details_list: List[Dict],
 
 def main():
     """Main function to analyze details content."""
+    start_profile('analyze-details-content')
     repo_root = Path(__file__).parent.parent.parent
     docs_dir = repo_root / 'docs'
 
@@ -282,25 +287,30 @@ def main():
     print("Analyzing <details> tag content...")
 
     # Extract all details content
-    details_list = extract_details_content(docs_dir)
+    with phase('parse'):
+        details_list = extract_details_content(docs_dir)
 
     if not details_list:
         print("No <details> tags found in chapters")
         return 1
 
     # Categorize by type
-    categories = categorize_visualization_types(details_list)
+    with phase('aggregate'):
+        categories = categorize_visualization_types(details_list)
 
     # List existing MicroSims
-    sims_dir = docs_dir / 'sims'
-    existing_sims = [d.name for d in sims_dir.iterdir() if d.is_dir()] if sims_dir.exists() else []
+    with phase('walk'):
+        sims_dir = docs_dir / 'sims'
+        existing_sims = [d.name for d in sims_dir.iterdir() if d.is_dir()] if sims_dir.exists() else []
 
     # Assess priorities
-    priorities = assess_skill_priority(categories, existing_sims)
+    with phase('aggregate'):
+        priorities = assess_skill_priority(categories, existing_sims)
 
     # Generate report
     output_file = docs_dir / 'details-analysis.md'
-    generate_markdown_report(details_list, categories, priorities, output_file)
+    with phase('render'):
+        generate_markdown_report(details_list, categories, priorities, output_file)
 
     print(f"\n✓ Details analysis report generated: {output_file}")
     print(f"\nFound {len(details_list)} <details> tags across {len(categories)} visualization types")
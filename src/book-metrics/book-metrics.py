@@ -7,17 +7,28 @@ Generates comprehensive metrics for intelligent textbooks, including:
 - Chapter-level metrics (per-chapter statistics)
 
 Usage:
-    python book-metrics.py [docs_directory]
+    python book-metrics.py [docs_directory] [--no-cache] [--cache-file PATH] [--profile]
+
+Markdown files are parsed through the shared book corpus (book_corpus.py),
+whose records are cached in docs/.book-corpus-cache.json so that repeat runs
+only re-read markdown files that changed since the previous run.
 """
 
 import re
 import csv
+import sys
+import argparse
 from pathlib import Path
-from typing import Dict, List, Tuple, Any
+from typing import Dict, List, Optional, Tuple, Any
 from datetime import datetime
 
+# Shared parsed-document model lives next to this script
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+from book_corpus import CACHE_FILENAME, ParsedDocument, open_corpus
+from tool_profile import add_profile_argument, count_write, phase, start_profile
+
 # Version of the Book Metrics Generator
-VERSION = "0.05"
+VERSION = "0.08"
 
 
 class BookMetricsGenerator:
@@ -26,11 +37,20 @@ class BookMetricsGenerator:
     # Directories to exclude from student-facing content metrics
     EXCLUDED_DIRS = {'prompts', 'learning-graph'}
 
-    def __init__(self, docs_dir: str = "docs"):
+    # Metrics computed for every markdown file by the single-pass scanner
+    FILE_METRIC_KEYS = ('words', 'links', 'diagrams', 'equations', 'sections', 'quiz_items')
+
+    # Numbered quiz question heading title (e.g. "#### 1.")
+    NUMBERED_TITLE_PATTERN = re.compile(r'\d+\.')
+
+    def __init__(self, docs_dir: str = "docs", use_cache: bool = True,
+                 cache_file: Optional[str] = None):
         """Initialize the metrics generator.
 
         Args:
             docs_dir: Path to the docs directory (default: "docs")
+            use_cache: Reuse parsed documents from the on-disk corpus cache (default: True)
+            cache_file: Cache location (default: docs/.book-corpus-cache.json)
         """
         self.docs_dir = Path(docs_dir)
         self.chapters_dir = self.docs_dir / "chapters"
@@ -39,6 +59,12 @@ class BookMetricsGenerator:
         self.glossary_file = self.docs_dir / "glossary.md"
         self.faq_file = self.docs_dir / "faq.md"
 
+        # Per-file metrics records, filled once by scan_corpus()
+        self._file_metrics = None
+        self._chapter_files = {}
+
+        self.corpus = open_corpus(self.docs_dir, use_cache=use_cache, cache_file=cache_file)
+
     def _is_excluded_path(self, path: Path) -> bool:
         """Check if a path is in an excluded directory.
 
@@ -97,16 +123,7 @@ class BookMetricsGenerator:
         Returns:
             The title string, or the filename if no title found
         """
-        try:
-            with open(markdown_file, 'r', encoding='utf-8') as f:
-                for line in f:
-                    match = re.match(r'^#\s+(.+)$', line.strip())
-                    if match:
-                        return match.group(1)
-        except Exception as e:
-            print(f"Warning: Could not read {markdown_file}: {e}")
-
-        return markdown_file.parent.name
+        return self.corpus.document(markdown_file).title or markdown_file.parent.name
 
     def count_concepts(self) -> int:
         """Count concepts from learning-graph.csv.
@@ -136,15 +153,8 @@ class BookMetricsGenerator:
         if not self.glossary_file.exists():
             return 0
 
-        try:
-            with open(self.glossary_file, 'r', encoding='utf-8') as f:
-                content = f.read()
-                # Count H4 headers as glossary terms
-                h4_count = len(re.findall(r'^####\s+', content, re.MULTILINE))
-                return h4_count
-        except Exception as e:
-            print(f"Warning: Could not read glossary: {e}")
-            return 0
+        # Count H4 headers as glossary terms
+        return self.corpus.document(self.glossary_file).count_headings(4)
 
     def count_faqs(self) -> int:
         """Count FAQ items from faq.md.
@@ -155,15 +165,8 @@ class BookMetricsGenerator:
         if not self.faq_file.exists():
             return 0
 
-        try:
-            with open(self.faq_file, 'r', encoding='utf-8') as f:
-                content = f.read()
-                # Count H3 headers as FAQ questions (exactly 3 #, not 4+)
-                # Use negative lookahead to exclude #### headers
-                return len(re.findall(r'^###(?!#)\s+', content, re.MULTILINE))
-        except Exception as e:
-            print(f"Warning: Could not read FAQ: {e}")
-            return 0
+        # Count H3 headers as FAQ questions (exactly 3 #, not 4+)
+        return self.corpus.document(self.faq_file).count_headings(3)
 
     def count_quiz_questions(self) -> int:
         """Count quiz questions across all chapters.
@@ -194,17 +197,165 @@ class BookMetricsGenerator:
         Returns:
             Number of questions in the file
         """
+        return self._file_record(quiz_file)['quiz_items']
+
+    def _measure_document(self, doc: ParsedDocument) -> Dict[str, int]:
+        """Compute every per-file metric from a parsed markdown file.
+
+        Args:
+            doc: Parsed document record from the shared corpus
+
+        Returns:
+            Dict with words, links, diagrams, equations, sections and quiz_items
+        """
+        # One pass over the headings covers sections, diagrams and quiz items
+        h2 = h3 = diagrams = numbered_h4 = 0
+        for level, title, _ in doc.headings:
+            if level == 2:
+                h2 += 1
+            elif level == 3:
+                h3 += 1
+            elif level == 4:
+                if title.startswith('Diagram:'):
+                    diagrams += 1
+                elif self.NUMBERED_TITLE_PATTERN.match(title):
+                    numbered_h4 += 1
+
+        return {
+            # Words exclude code blocks, inline code and URLs
+            'words': doc.words,
+            'links': len(doc.links),
+            'diagrams': diagrams,
+            # Display math plus inline math outside it (dollar amounts like $500 excluded)
+            'equations': len(doc.math),
+            'sections': h2 + h3,
+            # Numbered H4 questions (e.g., "#### 1.") plus legacy H2 questions
+            'quiz_items': numbered_h4 + h2,
+        }
+
+    def scan_file(self, markdown_file: Path) -> Dict[str, int]:
+        """Compute all metrics of a markdown file from its parsed record.
+
+        Args:
+            markdown_file: Path to markdown file
+
+        Returns:
+            Dict of per-file metrics (all zero if the file cannot be read)
+        """
+        return self._measure_document(self.corpus.document(markdown_file))
+
+    def scan_corpus(self) -> Dict[Path, Dict[str, int]]:
+        """Compute metrics for every markdown file under the docs directory once.
+
+        The per-file records are kept on the generator and shared by the
+        book-level and chapter-level aggregations. Documents come from the
+        shared corpus, so unchanged files are not re-read when its cache is
+        enabled.
+
+        Returns:
+            Dict mapping each markdown file path to its metrics record
+        """
+        if self._file_metrics is None:
+            self._file_metrics = {}
+            self._chapter_files = {}
+
+            for md_file, doc in self.corpus.documents().items():
+                with phase('aggregate'):
+                    self._file_metrics[md_file] = self._measure_document(doc)
+                    chapter_dir = self._chapter_dir_for(md_file)
+                    if chapter_dir is not None:
+                        self._chapter_files.setdefault(chapter_dir, []).append(md_file)
+
+            self.corpus.save()
+
+        return self._file_metrics
+
+    def refresh(self, changed_files: List[Path]):
+        """Recompute metrics for files that were edited, created or deleted.
+
+        Only those files are re-read; every other record is kept, so the
+        next report is an aggregation over in-memory records. Call this
+        after the files have been invalidated in the shared corpus.
+
+        Args:
+            changed_files: Paths of changed markdown files under the docs directory
+        """
+        if self._file_metrics is None:
+            return
+
+        for md_file in changed_files:
+            if md_file.is_file():
+                self._file_metrics[md_file] = self.scan_file(md_file)
+            else:
+                self._file_metrics.pop(md_file, None)
+
+        self._chapter_files = {}
+        for md_file in sorted(self._file_metrics):
+            chapter_dir = self._chapter_dir_for(md_file)
+            if chapter_dir is not None:
+                self._chapter_files.setdefault(chapter_dir, []).append(md_file)
+
+    def _chapter_dir_for(self, md_file: Path) -> Optional[Path]:
+        """Return the chapter directory containing a file, or None.
+
+        Args:
+            md_file: Path to a markdown file under the docs directory
+
+        Returns:
+            Path of the top-level chapter directory, or None if outside chapters/
+        """
         try:
-            with open(quiz_file, 'r', encoding='utf-8') as f:
-                content = f.read()
-                # Count H4 headers with numbered questions (e.g., "#### 1.")
-                h4_pattern = len(re.findall(r'^####\s+\d+\.', content, re.MULTILINE))
-                # Also count H2 headers as questions (legacy format)
-                h2_pattern = len(re.findall(r'^##\s+', content, re.MULTILINE))
-                return h4_pattern + h2_pattern
-        except Exception as e:
-            print(f"Warning: Could not read {quiz_file}: {e}")
-            return 0
+            parts = md_file.relative_to(self.chapters_dir).parts
+        except ValueError:
+            return None
+        return self.chapters_dir / parts[0] if len(parts) > 1 else None
+
+    def _file_record(self, markdown_file: Path) -> Dict[str, int]:
+        """Return the metrics record for a file, scanning it if needed.
+
+        Args:
+            markdown_file: Path to markdown file
+
+        Returns:
+            Dict of per-file metrics
+        """
+        record = self.scan_corpus().get(markdown_file)
+        if record is None:
+            record = self.scan_file(markdown_file)
+        return record
+
+    def _sum_records(self, files: List[Path]) -> Dict[str, int]:
+        """Sum metrics records for a list of scanned files.
+
+        Args:
+            files: Paths of files present in the scanned corpus
+
+        Returns:
+            Dict with the total of each per-file metric
+        """
+        records = self.scan_corpus()
+        totals = dict.fromkeys(self.FILE_METRIC_KEYS, 0)
+        for md_file in files:
+            record = records[md_file]
+            for key in self.FILE_METRIC_KEYS:
+                totals[key] += record[key]
+        return totals
+
+    def _corpus_total(self, key: str, exclude_non_content: bool) -> int:
+        """Total one metric across all scanned markdown files.
+
+        Args:
+            key: Metric name (e.g. 'words', 'links')
+            exclude_non_content: If True, exclude prompts/ and learning-graph/ directories
+
+        Returns:
+            Sum of the metric over the selected files
+        """
+        return sum(
+            record[key]
+            for md_file, record in self.scan_corpus().items()
+            if not (exclude_non_content and self._is_excluded_path(md_file))
+        )
 
     def count_diagrams_in_file(self, markdown_file: Path) -> int:
         """Count diagrams in a single markdown file.
@@ -215,13 +366,7 @@ class BookMetricsGenerator:
         Returns:
             Number of diagrams (H4 headers starting with "#### Diagram:")
         """
-        try:
-            with open(markdown_file, 'r', encoding='utf-8') as f:
-                content = f.read()
-                return len(re.findall(r'^####\s+Diagram:', content, re.MULTILINE))
-        except Exception as e:
-            print(f"Warning: Could not read {markdown_file}: {e}")
-            return 0
+        return self._file_record(markdown_file)['diagrams']
 
     def count_all_diagrams(self, exclude_non_content: bool = True) -> int:
         """Count all diagrams in all markdown files.
@@ -232,15 +377,7 @@ class BookMetricsGenerator:
         Returns:
             Total number of diagrams
         """
-        total = 0
-
-        # Search all markdown files in docs directory
-        for md_file in self.docs_dir.rglob('*.md'):
-            if exclude_non_content and self._is_excluded_path(md_file):
-                continue
-            total += self.count_diagrams_in_file(md_file)
-
-        return total
+        return self._corpus_total('diagrams', exclude_non_content)
 
     def count_equations_in_file(self, markdown_file: Path) -> int:
         """Count LaTeX equations in a single markdown file.
@@ -255,26 +392,7 @@ class BookMetricsGenerator:
         Returns:
             Number of equations (LaTeX expressions)
         """
-        try:
-            with open(markdown_file, 'r', encoding='utf-8') as f:
-                content = f.read()
-
-                # Count display math: $$...$$ (must come first)
-                display_matches = re.findall(r'\$\$[^$]+?\$\$', content, re.DOTALL)
-                display = len(display_matches)
-
-                # Remove all display math blocks to avoid double-counting
-                content_no_display = re.sub(r'\$\$[^$]+?\$\$', '', content, flags=re.DOTALL)
-
-                # Count inline math: $...$
-                # Negative lookahead (?!\d) ensures we don't match dollar amounts like $500
-                inline_matches = re.findall(r'\$(?!\d)([^\$]+?)\$', content_no_display)
-                inline = len(inline_matches)
-
-                return inline + display
-        except Exception as e:
-            print(f"Warning: Could not read {markdown_file}: {e}")
-            return 0
+        return self._file_record(markdown_file)['equations']
 
     def count_all_equations(self, exclude_non_content: bool = True) -> int:
         """Count all equations in all markdown files.
@@ -285,15 +403,7 @@ class BookMetricsGenerator:
         Returns:
             Total number of equations
         """
-        total = 0
-
-        # Search all markdown files in docs directory
-        for md_file in self.docs_dir.rglob('*.md'):
-            if exclude_non_content and self._is_excluded_path(md_file):
-                continue
-            total += self.count_equations_in_file(md_file)
-
-        return total
+        return self._corpus_total('equations', exclude_non_content)
 
     def count_microsims(self) -> int:
         """Count MicroSim directories in docs/sims.
@@ -320,21 +430,7 @@ class BookMetricsGenerator:
         Returns:
             Number of words
         """
-        try:
-            with open(markdown_file, 'r', encoding='utf-8') as f:
-                content = f.read()
-                # Remove code blocks
-                content = re.sub(r'```.*?```', '', content, flags=re.DOTALL)
-                # Remove inline code
-                content = re.sub(r'`[^`]+`', '', content)
-                # Remove URLs
-                content = re.sub(r'https?://\S+', '', content)
-                # Count words
-                words = re.findall(r'\b\w+\b', content)
-                return len(words)
-        except Exception as e:
-            print(f"Warning: Could not read {markdown_file}: {e}")
-            return 0
+        return self._file_record(markdown_file)['words']
 
     def count_total_words(self, exclude_non_content: bool = True) -> int:
         """Count total words in all markdown files.
@@ -345,15 +441,7 @@ class BookMetricsGenerator:
         Returns:
             Total word count
         """
-        total = 0
-
-        # Search all markdown files in docs directory
-        for md_file in self.docs_dir.rglob('*.md'):
-            if exclude_non_content and self._is_excluded_path(md_file):
-                continue
-            total += self.count_words_in_file(md_file)
-
-        return total
+        return self._corpus_total('words', exclude_non_content)
 
     def count_links_in_file(self, markdown_file: Path) -> int:
         """Count markdown links in a single file.
@@ -364,14 +452,7 @@ class BookMetricsGenerator:
         Returns:
             Number of links
         """
-        try:
-            with open(markdown_file, 'r', encoding='utf-8') as f:
-                content = f.read()
-                # Count markdown links [text](url)
-                return len(re.findall(r'\[([^\]]+)\]\(([^)]+)\)', content))
-        except Exception as e:
-            print(f"Warning: Could not read {markdown_file}: {e}")
-            return 0
+        return self._file_record(markdown_file)['links']
 
     def count_all_links(self, exclude_non_content: bool = True) -> int:
         """Count all links in all markdown files.
@@ -382,15 +463,7 @@ class BookMetricsGenerator:
         Returns:
             Total number of links
         """
-        total = 0
-
-        # Search all markdown files in docs directory
-        for md_file in self.docs_dir.rglob('*.md'):
-            if exclude_non_content and self._is_excluded_path(md_file):
-                continue
-            total += self.count_links_in_file(md_file)
-
-        return total
+        return self._corpus_total('links', exclude_non_content)
 
     def calculate_equivalent_pages(self, total_words: int, diagrams: int, microsims: int) -> int:
         """Calculate equivalent pages based on words, diagrams, and MicroSims.
@@ -424,15 +497,7 @@ class BookMetricsGenerator:
         Returns:
             Number of sections
         """
-        try:
-            with open(markdown_file, 'r', encoding='utf-8') as f:
-                content = f.read()
-                h2_count = len(re.findall(r'^##\s+', content, re.MULTILINE))
-                h3_count = len(re.findall(r'^###\s+', content, re.MULTILINE))
-                return h2_count + h3_count
-        except Exception as e:
-            print(f"Warning: Could not read {markdown_file}: {e}")
-            return 0
+        return self._file_record(markdown_file)['sections']
 
     def get_chapter_metrics(self, chapter: Dict[str, Any]) -> Dict[str, Any]:
         """Get metrics for a single chapter.
@@ -449,25 +514,18 @@ class BookMetricsGenerator:
         # Count sections in index.md
         sections = self.count_sections_in_file(index_file)
 
-        # Count diagrams, equations, words, and links in all markdown files in chapter directory
-        diagrams = 0
-        equations = 0
-        words = 0
-        links = 0
-        for md_file in chapter_dir.rglob('*.md'):
-            diagrams += self.count_diagrams_in_file(md_file)
-            equations += self.count_equations_in_file(md_file)
-            words += self.count_words_in_file(md_file)
-            links += self.count_links_in_file(md_file)
+        # Sum diagrams, equations, words, and links over the chapter's scanned files
+        self.scan_corpus()
+        totals = self._sum_records(self._chapter_files.get(chapter_dir, []))
 
         return {
             'number': chapter['number'],
             'name': chapter['name'],
             'sections': sections,
-            'diagrams': diagrams,
-            'equations': equations,
-            'words': words,
-            'links': links
+            'diagrams': totals['diagrams'],
+            'equations': totals['equations'],
+            'words': totals['words'],
+            'links': totals['links']
         }
 
     def get_aggregated_chapter_metrics(self) -> Dict[str, int]:
@@ -632,17 +690,21 @@ class BookMetricsGenerator:
         output_dir.mkdir(parents=True, exist_ok=True)
 
         # Generate book metrics
-        book_metrics_content = self.generate_book_metrics_md()
+        with phase('render'):
+            book_metrics_content = self.generate_book_metrics_md()
         book_metrics_file = output_dir / "book-metrics.md"
-        with open(book_metrics_file, 'w', encoding='utf-8') as f:
+        with phase('write'), open(book_metrics_file, 'w', encoding='utf-8') as f:
             f.write(book_metrics_content)
+            count_write(f.tell())
         print(f"✅ Generated {book_metrics_file}")
 
         # Generate chapter metrics
-        chapter_metrics_content = self.generate_chapter_metrics_md()
+        with phase('render'):
+            chapter_metrics_content = self.generate_chapter_metrics_md()
         chapter_metrics_file = output_dir / "chapter-metrics.md"
-        with open(chapter_metrics_file, 'w', encoding='utf-8') as f:
+        with phase('write'), open(chapter_metrics_file, 'w', encoding='utf-8') as f:
             f.write(chapter_metrics_content)
+            count_write(f.tell())
         print(f"✅ Generated {chapter_metrics_file}")
 
 
@@ -650,8 +712,14 @@ def main():
     """Main entry point."""
     import sys
 
-    # Get docs directory from command line or use default
-    docs_dir = sys.argv[1] if len(sys.argv) > 1 else "docs"
+    parser = argparse.ArgumentParser(description="Generate book and chapter metrics for an intelligent textbook")
+    parser.add_argument('docs_dir', nargs='?', default='docs', help='Path to the docs directory (default: docs)')
+    parser.add_argument('--no-cache', action='store_true', help='Re-read every markdown file and skip the corpus cache')
+    parser.add_argument('--cache-file', default=None, help=f'Corpus cache location (default: <docs_dir>/{CACHE_FILENAME})')
+    add_profile_argument(parser)
+    args = parser.parse_args()
+    start_profile('book-metrics', args.profile, patterns=[BookMetricsGenerator])
+    docs_dir = args.docs_dir
 
     # Check if docs directory exists
     if not Path(docs_dir).exists():
@@ -659,15 +727,16 @@ def main():
         sys.exit(1)
 
     # Generate metrics
-    generator = BookMetricsGenerator(docs_dir)
+    generator = BookMetricsGenerator(docs_dir, use_cache=not args.no_cache, cache_file=args.cache_file)
     generator.generate_metrics()
 
     print(f"\n✅ Book metrics generation version {VERSION} complete!")
-    print("\nUpdates in v0.05:")
-    print("  - Fixed FAQ counting to correctly match H3 headers only (not H4+)")
-    print("\nPrevious updates (v0.04):")
-    print("  - Added version number and human-readable timestamp to reports")
-    print("  - Clear attribution: 'Generated by Book Metrics Python Program'")
+    print("\nUpdates in v0.08:")
+    print("  - Metrics come from the shared book corpus cache used by the other book tools")
+    print("\nPrevious updates (v0.07):")
+    print("  - Per-file metrics cache: only changed markdown files are re-read")
+    print("\nOlder updates (v0.06):")
+    print("  - Single-pass scanner: each markdown file is read once for all metrics")
     print("\nhttp://localhost:8000/conversational-ai/learning-graph/book-metrics/")
     print("http://localhost:8000/conversational-ai/learning-graph/chapter-metrics/")
 
@@ -0,0 +1,512 @@
+#!/usr/bin/env python3
+"""
+Book Corpus
+
+Shared parsed-document model for the book analysis scripts. Every markdown
+file under a docs directory is read and parsed once into a ParsedDocument
+record holding its frontmatter, headings, code-fence spans, math spans,
+<details> blocks, links, iframes and word counts.
+
+Records are kept in memory for the life of the process and in an on-disk
+cache (docs/.book-corpus-cache.json) validated by mtime, size and content
+hash, so book-metrics.py, generate-equation-list.py,
+analyze-details-content.py, diagram-report.py, book-status.py and
+collect-site-metrics.py share a single read of the corpus.
+
+Usage from a script in another directory:
+    sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'book-metrics'))
+    from book_corpus import open_corpus
+
+    corpus = open_corpus('docs')
+    for md_file, doc in corpus.documents().items():
+        print(md_file, doc.title, doc.words)
+    corpus.save()
+"""
+
+import re
+import os
+import json
+import hashlib
+from bisect import bisect_left, bisect_right
+from dataclasses import dataclass, field, asdict
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from tool_profile import count, count_read, count_write, phase
+
+# Version of the parsed-document record; bump when parsing rules change
+CORPUS_VERSION = 2
+
+# Default cache file name (dot-prefixed so MkDocs does not publish it)
+CACHE_FILENAME = ".book-corpus-cache.json"
+
+# Headings ("#" to "######"); a bare "##" line is still a heading, as in the
+# ^#{n}\s+ patterns the scripts used before
+HEADING_PATTERN = re.compile(r'^(#{1,6})(?:[^\S\n]+(.*)$|\n)', re.MULTILINE)
+# First H1 title, matched line by line after stripping surrounding whitespace
+TITLE_PATTERN = re.compile(r'^[^\S\n]*#[^\S\n]+(\S.*?)[^\S\n]*$', re.MULTILINE)
+FRONTMATTER_KEY_PATTERN = re.compile(r'^([A-Za-z_][\w-]*):[^\S\n]*(.*?)[^\S\n]*$', re.MULTILINE)
+# A key with nothing after the colon takes the next non-blank line, as ^key:\s*(.+)$ did
+FRONTMATTER_NEXT_LINE_PATTERN = re.compile(r'\s*(.+)')
+CODE_BLOCK_PATTERN = re.compile(r'```.*?```', re.DOTALL)
+INLINE_CODE_PATTERN = re.compile(r'`[^`]+`')
+# Display math $$...$$ and inline math $...$ (not followed by a digit, to skip $500)
+DISPLAY_MATH_PATTERN = re.compile(r'\$\$([^$]+?)\$\$', re.DOTALL)
+INLINE_MATH_PATTERN = re.compile(r'\$(?!\d)([^\$]+?)\$')
+DETAILS_PATTERN = re.compile(r'<details(?:\s+markdown="1")?>(.*?)</details>', re.DOTALL | re.IGNORECASE)
+LINK_PATTERN = re.compile(r'\[([^\]]+)\]\(([^)]+)\)')
+IFRAME_PATTERN = re.compile(r'<iframe\b[^>]*?\bsrc\s*=\s*["\']([^"\']*)["\']', re.IGNORECASE)
+URL_PATTERN = re.compile(r'https?://\S+')
+WORD_PATTERN = re.compile(r'\b\w+\b')
+
+
+@dataclass
+class ParsedDocument:
+    """Structured record of one markdown file.
+
+    Line numbers are 1-based. Math spans list every display equation first,
+    then the inline equations found once display math is removed (so text
+    between two display blocks is never mistaken for inline math).
+    """
+    sha256: str = ''
+    title: str = ''                                                    # First "# " heading
+    frontmatter: Dict[str, str] = field(default_factory=dict)          # Top-level "key: value" pairs
+    headings: List[Tuple[int, str, int]] = field(default_factory=list)  # (level, title, line)
+    code_fences: List[Tuple[int, int]] = field(default_factory=list)   # (start line, end line)
+    math: List[Tuple[str, str, int]] = field(default_factory=list)     # ('display'|'inline', LaTeX, line)
+    details: List[Tuple[str, int]] = field(default_factory=list)       # (inner content, line)
+    links: List[Tuple[str, str]] = field(default_factory=list)         # (text, url)
+    iframes: List[str] = field(default_factory=list)                   # src attributes
+    words: int = 0                                                     # Words outside code and URLs
+    body_words: int = 0                                                # All words after the frontmatter
+
+    def count_headings(self, level: int) -> int:
+        """Return the number of headings at one level."""
+        return sum(1 for heading_level, _, _ in self.headings if heading_level == level)
+
+    def to_record(self) -> Dict[str, Any]:
+        """Serialize for the on-disk cache."""
+        return asdict(self)
+
+    @classmethod
+    def from_record(cls, record: Dict[str, Any]) -> 'ParsedDocument':
+        """Rebuild a document from an on-disk cache record."""
+        return cls(
+            sha256=record['sha256'],
+            title=record['title'],
+            frontmatter=record['frontmatter'],
+            headings=[tuple(h) for h in record['headings']],
+            code_fences=[tuple(c) for c in record['code_fences']],
+            math=[tuple(m) for m in record['math']],
+            details=[tuple(d) for d in record['details']],
+            links=[tuple(link) for link in record['links']],
+            iframes=record['iframes'],
+            words=record['words'],
+            body_words=record['body_words']
+        )
+
+
+def decode_markdown(data: bytes) -> str:
+    """Decode file bytes the way text-mode open() would.
+
+    Args:
+        data: Raw file content
+
+    Returns:
+        UTF-8 decoded text with universal newlines
+    """
+    return data.decode('utf-8').replace('\r\n', '\n').replace('\r', '\n')
+
+
+def split_frontmatter(content: str) -> Tuple[Optional[str], str]:
+    """Split YAML frontmatter from the rest of a markdown file.
+
+    Args:
+        content: Full text of the markdown file
+
+    Returns:
+        Tuple of (frontmatter text or None, body text)
+    """
+    if content.startswith('---'):
+        parts = content.split('---', 2)
+        if len(parts) == 3:
+            return parts[1], parts[2]
+    return None, content
+
+
+def _find_math(content: str, line_of) -> List[Tuple[str, str, int]]:
+    """Locate display math, then inline math in the text left after removing it.
+
+    Args:
+        content: Full text of the markdown file
+        line_of: Function mapping a character offset to its line number
+
+    Returns:
+        List of (kind, LaTeX source, line) tuples
+    """
+    math = []
+    pieces = []
+    stripped_starts = []  # Offset in the stripped text where each display block was cut
+    shifts = []           # Characters removed up to and including that block
+    pos = removed = 0
+    for match in DISPLAY_MATH_PATTERN.finditer(content):
+        start, end = match.span()
+        math.append(('display', match.group(1).strip(), line_of(start)))
+        pieces.append(content[pos:start])
+        stripped_starts.append(start - removed)
+        removed += end - start
+        shifts.append(removed)
+        pos = end
+
+    if not pieces:
+        stripped = content
+    else:
+        pieces.append(content[pos:])
+        stripped = ''.join(pieces)
+
+    for match in INLINE_MATH_PATTERN.finditer(stripped):
+        offset = match.start()
+        i = bisect_right(stripped_starts, offset)
+        if i:
+            offset += shifts[i - 1]
+        math.append(('inline', match.group(1).strip(), line_of(offset)))
+
+    return math
+
+
+def parse_markdown(content: str, digest: str = '') -> ParsedDocument:
+    """Parse the text of one markdown file into a ParsedDocument.
+
+    Args:
+        content: Full text of the markdown file
+        digest: SHA-256 hex digest of the file bytes
+
+    Returns:
+        Parsed document record
+    """
+    # Offsets of every newline, so a position's line number is a bisect away
+    newline_offsets = [m.start() for m in re.finditer('\n', content)]
+
+    def line_of(offset: int) -> int:
+        return bisect_left(newline_offsets, offset) + 1
+
+    frontmatter_text, body = split_frontmatter(content)
+    frontmatter = {}
+    if frontmatter_text is not None:
+        for match in FRONTMATTER_KEY_PATTERN.finditer(frontmatter_text):
+            value = match.group(2)
+            if not value:
+                next_line = FRONTMATTER_NEXT_LINE_PATTERN.match(frontmatter_text, match.end())
+                value = next_line.group(1).strip() if next_line else ''
+            frontmatter.setdefault(match.group(1), value)
+
+    title_match = TITLE_PATTERN.search(content)
+
+    # Words exclude code blocks, inline code and URLs
+    code_fences = []
+    prose = []
+    pos = 0
+    for match in CODE_BLOCK_PATTERN.finditer(content):
+        code_fences.append((line_of(match.start()), line_of(match.end() - 1)))
+        prose.append(content[pos:match.start()])
+        pos = match.end()
+    prose.append(content[pos:])
+    text = INLINE_CODE_PATTERN.sub('', ''.join(prose))
+    text = URL_PATTERN.sub('', text)
+
+    return ParsedDocument(
+        sha256=digest,
+        title=title_match.group(1) if title_match else '',
+        frontmatter=frontmatter,
+        headings=[(len(m.group(1)), (m.group(2) or '').strip(), line_of(m.start()))
+                  for m in HEADING_PATTERN.finditer(content)],
+        code_fences=code_fences,
+        math=_find_math(content, line_of),
+        details=[(m.group(1), line_of(m.start())) for m in DETAILS_PATTERN.finditer(content)],
+        links=LINK_PATTERN.findall(content),
+        iframes=IFRAME_PATTERN.findall(content),
+        words=len(WORD_PATTERN.findall(text)),
+        body_words=len(WORD_PATTERN.findall(body))
+    )
+
+
+class DocumentCache:
+    """On-disk cache of parsed-document records.
+
+    Entries are keyed by the file path relative to the docs directory and
+    validated by mtime and size. When those differ, the content hash decides
+    whether the cached record is still valid (e.g. after a git checkout that
+    only touched timestamps). The whole cache is discarded when the record
+    version changes, since parsing rules may have changed.
+    """
+
+    def __init__(self, cache_file: Path, version: int = CORPUS_VERSION):
+        """Initialize the cache.
+
+        Args:
+            cache_file: Path to the JSON cache file
+            version: Record version the cached documents were parsed with
+        """
+        self.cache_file = Path(cache_file)
+        self.version = version
+        self.entries: Dict[str, Dict[str, Any]] = {}
+        self.dirty = False
+
+    def load(self):
+        """Load cache entries from disk, ignoring missing or stale caches."""
+        try:
+            with phase('read'), open(self.cache_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+                count_read(f.tell())
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError) as e:
+            print(f"Warning: Ignoring unreadable corpus cache {self.cache_file}: {e}")
+            return
+
+        if data.get('version') == self.version:
+            self.entries = data.get('files', {})
+        else:
+            # Records from another parser version must be rebuilt
+            self.dirty = True
+
+    def lookup(self, key: str, mtime_ns: int, size: int) -> Optional[Dict[str, Any]]:
+        """Return the cached record if the file's mtime and size are unchanged.
+
+        Args:
+            key: Path relative to the docs directory
+            mtime_ns: Current modification time in nanoseconds
+            size: Current file size in bytes
+
+        Returns:
+            Cached document record, or None on a miss
+        """
+        entry = self.entries.get(key)
+        if entry and entry['mtime_ns'] == mtime_ns and entry['size'] == size:
+            return entry['document']
+        return None
+
+    def lookup_hash(self, key: str, digest: str) -> Optional[Dict[str, Any]]:
+        """Return the cached record if the file's content hash is unchanged.
+
+        Args:
+            key: Path relative to the docs directory
+            digest: SHA-256 hex digest of the current file content
+
+        Returns:
+            Cached document record, or None on a miss
+        """
+        entry = self.entries.get(key)
+        if entry and entry['document']['sha256'] == digest:
+            return entry['document']
+        return None
+
+    def store(self, key: str, mtime_ns: int, size: int, document: Dict[str, Any]):
+        """Record the parsed document for a file.
+
+        Args:
+            key: Path relative to the docs directory
+            mtime_ns: Modification time in nanoseconds
+            size: File size in bytes
+            document: Serialized ParsedDocument
+        """
+        self.entries[key] = {
+            'mtime_ns': mtime_ns,
+            'size': size,
+            'document': document
+        }
+        self.dirty = True
+
+    def prune(self, live_keys):
+        """Drop entries for files that no longer exist.
+
+        Args:
+            live_keys: Keys of the files seen in the current walk
+        """
+        stale = set(self.entries) - set(live_keys)
+        for key in stale:
+            del self.entries[key]
+        if stale:
+            self.dirty = True
+
+    def save(self):
+        """Write the cache to disk if it changed (atomically via a temp file)."""
+        if not self.dirty:
+            return
+
+        tmp_file = self.cache_file.with_name(self.cache_file.name + '.tmp')
+        try:
+            with phase('write'), open(tmp_file, 'w', encoding='utf-8') as f:
+                json.dump({'version': self.version, 'files': self.entries}, f,
+                          separators=(',', ':'), sort_keys=True)
+                count_write(f.tell())
+            os.replace(tmp_file, self.cache_file)
+            self.dirty = False
+        except OSError as e:
+            print(f"Warning: Could not write corpus cache {self.cache_file}: {e}")
+
+
+class MarkdownCorpus:
+    """Parsed markdown files of one docs directory, each read at most once."""
+
+    def __init__(self, docs_dir, use_cache: bool = True, cache_file: Optional[str] = None):
+        """Initialize the corpus.
+
+        Args:
+            docs_dir: Path to the docs directory
+            use_cache: Reuse parsed records from the on-disk cache (default: True)
+            cache_file: Cache location (default: docs/.book-corpus-cache.json)
+        """
+        self.docs_dir = Path(docs_dir)
+        self.cache = None
+        if use_cache:
+            self.cache = DocumentCache(Path(cache_file) if cache_file else self.docs_dir / CACHE_FILENAME)
+            self.cache.load()
+
+        self._files: Optional[List[Path]] = None
+        self._documents: Dict[Path, ParsedDocument] = {}
+        self._texts: Dict[Path, str] = {}
+
+    def markdown_files(self) -> List[Path]:
+        """Return every markdown file under the docs directory, in sorted order."""
+        if self._files is None:
+            with phase('walk'):
+                self._files = sorted(self.docs_dir.rglob('*.md'))
+        return self._files
+
+    def _cache_key(self, path: Path) -> Optional[str]:
+        """Return the cache key for a file, or None if it is outside the docs directory."""
+        if self.cache is None:
+            return None
+        try:
+            return path.relative_to(self.docs_dir).as_posix()
+        except ValueError:
+            return None
+
+    def text(self, path: Path) -> str:
+        """Return the decoded text of a file, reading it on first use.
+
+        Raises:
+            OSError, UnicodeDecodeError: If the file cannot be read
+        """
+        path = Path(path)
+        content = self._texts.get(path)
+        if content is None:
+            with phase('read', path):
+                data = path.read_bytes()
+                count_read(len(data))
+                content = decode_markdown(data)
+            self._texts[path] = content
+        return content
+
+    def document(self, path: Path, stat: os.stat_result = None) -> ParsedDocument:
+        """Return the parsed record for a file.
+
+        Unreadable files print a warning and yield an empty record.
+
+        Args:
+            path: Path to a markdown file
+            stat: The file's stat result, if the caller already has it
+
+        Returns:
+            Parsed document record
+        """
+        path = Path(path)
+        doc = self._documents.get(path)
+        if doc is None:
+            doc = self._load_document(path, stat)
+            self._documents[path] = doc
+        return doc
+
+    def _load_document(self, path: Path, stat: os.stat_result = None) -> ParsedDocument:
+        """Fetch a record from the cache, or read and parse the file."""
+        key = self._cache_key(path)
+        if key is not None:
+            try:
+                if stat is None:
+                    stat = path.stat()
+            except OSError:
+                key = None
+            else:
+                record = self.cache.lookup(key, stat.st_mtime_ns, stat.st_size)
+                if record is not None:
+                    count('corpus_cache_hits')
+                    return ParsedDocument.from_record(record)
+
+        try:
+            with phase('read', path):
+                data = path.read_bytes()
+                count_read(len(data))
+                content = decode_markdown(data)
+        except (OSError, UnicodeDecodeError) as e:
+            print(f"Warning: Could not read {path}: {e}")
+            return ParsedDocument()
+        self._texts[path] = content
+
+        with phase('parse', path):
+            digest = hashlib.sha256(data).hexdigest()
+            record = self.cache.lookup_hash(key, digest) if key is not None else None
+            if record is not None:
+                count('corpus_cache_hits')
+                doc = ParsedDocument.from_record(record)
+            else:
+                count('corpus_files_parsed')
+                doc = parse_markdown(content, digest)
+
+        if key is not None:
+            self.cache.store(key, stat.st_mtime_ns, stat.st_size, doc.to_record())
+        return doc
+
+    def invalidate(self, path: Path):
+        """Forget a file's record and text so the next use re-reads it.
+
+        Args:
+            path: Path of a markdown file that was edited, created or deleted
+        """
+        path = Path(path)
+        self._documents.pop(path, None)
+        self._texts.pop(path, None)
+        if self._files is not None and (path in self._files) != path.is_file():
+            # A file was created or deleted, so the walk must be redone
+            self._files = None
+
+    def documents(self) -> Dict[Path, ParsedDocument]:
+        """Parse every markdown file under the docs directory.
+
+        Cache entries for files that no longer exist are pruned.
+
+        Returns:
+            Dict mapping each markdown file path to its record, in sorted path order
+        """
+        docs = {md_file: self.document(md_file) for md_file in self.markdown_files()}
+        if self.cache is not None:
+            self.cache.prune(md_file.relative_to(self.docs_dir).as_posix() for md_file in docs)
+        return docs
+
+    def save(self):
+        """Write new or changed records to the on-disk cache."""
+        if self.cache is not None:
+            self.cache.save()
+
+
+# Corpora opened in this process, so tools run together share one read
+_corpora: Dict[Tuple[str, bool, Optional[str]], MarkdownCorpus] = {}
+
+
+def open_corpus(docs_dir, use_cache: bool = True, cache_file: Optional[str] = None) -> MarkdownCorpus:
+    """Return the shared corpus for a docs directory, creating it on first use.
+
+    Args:
+        docs_dir: Path to the docs directory
+        use_cache: Reuse parsed records from the on-disk cache (default: True)
+        cache_file: Cache location (default: docs/.book-corpus-cache.json)
+
+    Returns:
+        MarkdownCorpus instance
+    """
+    key = (str(Path(docs_dir).resolve()), use_cache, str(cache_file) if cache_file else None)
+    corpus = _corpora.get(key)
+    if corpus is None:
+        corpus = MarkdownCorpus(docs_dir, use_cache=use_cache, cache_file=cache_file)
+        _corpora[key] = corpus
+    return corpus
@@ -7,7 +7,7 @@ with links to their source locations. This report is useful for verifying that
 all equations render correctly.
 
 Usage:
-    python generate-equation-list.py [docs_directory] [output_file]
+    python generate-equation-list.py [docs_directory] [output_file] [--profile]
 
 Examples:
     python generate-equation-list.py docs docs/learning-graph/list-equations.md
@@ -15,13 +15,19 @@ Examples:
 """
 
 import re
+import sys
 from pathlib import Path
 from typing import Dict, List, Tuple, Any
 from datetime import datetime
 from dataclasses import dataclass
 
+# Shared parsed-document model lives next to this script
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+from book_corpus import open_corpus
+from tool_profile import count_write, phase, start_profile
+
 # Version of the Equation List Generator
-VERSION = "1.0.0"
+VERSION = "1.2.0"
 
 
 @dataclass
@@ -41,15 +47,20 @@ class EquationListGenerator:
     # Directories to exclude from scanning
     EXCLUDED_DIRS = {'prompts', 'learning-graph', '.git', '__pycache__', 'site'}
 
-    def __init__(self, docs_dir: str = "docs"):
+    def __init__(self, docs_dir: str = "docs", use_cache: bool = True):
         """Initialize the equation list generator.
 
         Args:
             docs_dir: Path to the docs directory (default: "docs")
+            use_cache: Reuse parsed documents from the on-disk corpus cache (default: True)
         """
         self.docs_dir = Path(docs_dir)
         self.chapters_dir = self.docs_dir / "chapters"
         self.learning_graph_dir = self.docs_dir / "learning-graph"
+        self.corpus = open_corpus(self.docs_dir, use_cache=use_cache)
+
+        # Chapter directory name -> (chapter_number, chapter_name)
+        self._chapter_info_cache: Dict[str, Tuple[int, str]] = {}
 
     def _is_excluded_path(self, path: Path) -> bool:
         """Check if a path is in an excluded directory.
@@ -78,24 +89,38 @@ class EquationListGenerator:
         try:
             relative_path = file_path.relative_to(self.chapters_dir)
             chapter_dir = relative_path.parts[0]
-
-            # Extract chapter number from directory name (e.g., "01-scientific-foundations")
-            match = re.match(r'^0*(\d+)-(.+)$', chapter_dir)
-            if match:
-                chapter_num = int(match.group(1))
-                # Convert directory name to title case
-                chapter_name = match.group(2).replace('-', ' ').title()
-
-                # Try to get actual title from index.md
-                index_file = self.chapters_dir / chapter_dir / "index.md"
-                if index_file.exists():
-                    actual_title = self._extract_title(index_file)
-                    if actual_title:
-                        chapter_name = actual_title
-
-                return chapter_num, chapter_name
         except (ValueError, IndexError):
-            pass
+            return 0, "Other"
+
+        # Each chapter's index.md title is read only once
+        if chapter_dir not in self._chapter_info_cache:
+            self._chapter_info_cache[chapter_dir] = self._read_chapter_info(chapter_dir)
+        return self._chapter_info_cache[chapter_dir]
+
+    def _read_chapter_info(self, chapter_dir: str) -> Tuple[int, str]:
+        """Derive chapter number and name from a chapter directory.
+
+        Args:
+            chapter_dir: Name of the directory under chapters/
+
+        Returns:
+            Tuple of (chapter_number, chapter_name)
+        """
+        # Extract chapter number from directory name (e.g., "01-scientific-foundations")
+        match = re.match(r'^0*(\d+)-(.+)$', chapter_dir)
+        if match:
+            chapter_num = int(match.group(1))
+            # Convert directory name to title case
+            chapter_name = match.group(2).replace('-', ' ').title()
+
+            # Try to get actual title from index.md
+            index_file = self.chapters_dir / chapter_dir / "index.md"
+            if index_file.exists():
+                actual_title = self._extract_title(index_file)
+                if actual_title:
+                    chapter_name = actual_title
+
+            return chapter_num, chapter_name
 
         return 0, "Other"
 
@@ -108,15 +133,20 @@ class EquationListGenerator:
         Returns:
             The title string, or empty string if no title found
         """
-        try:
-            with open(markdown_file, 'r', encoding='utf-8') as f:
-                for line in f:
-                    match = re.match(r'^#\s+(.+)$', line.strip())
-                    if match:
-                        return match.group(1)
-        except Exception:
-            pass
-        return ""
+        return self.corpus.document(markdown_file).title
+
+    def refresh(self, changed_files: List[Path]):
+        """Drop chapter names that may have changed with the given files.
+
+        Equations themselves are re-extracted from the shared corpus on the
+        next report, so call this after invalidating the files there.
+
+        Args:
+            changed_files: Paths of changed markdown files under the docs directory
+        """
+        # A chapter's index.md supplies the chapter name of all its equations
+        if any(md_file.name == 'index.md' for md_file in changed_files):
+            self._chapter_info_cache.clear()
 
     def _is_valid_equation(self, content: str) -> bool:
         """Check if content looks like a valid LaTeX equation.
@@ -174,6 +204,9 @@ class EquationListGenerator:
     def extract_equations_from_file(self, markdown_file: Path) -> List[Equation]:
         """Extract all LaTeX equations from a single markdown file.
 
+        Display equations come first, then inline equations found outside
+        display math (the math spans of the shared document record).
+
         Args:
             markdown_file: Path to markdown file
 
@@ -182,71 +215,17 @@ class EquationListGenerator:
         """
         equations = []
 
-        try:
-            with open(markdown_file, 'r', encoding='utf-8') as f:
-                content = f.read()
-                lines = content.split('\n')
-        except Exception as e:
-            print(f"Warning: Could not read {markdown_file}: {e}")
-            return equations
-
         # Get chapter info
         chapter_num, chapter_name = self._get_chapter_info(markdown_file)
 
-        # Track positions of display math to avoid double-counting
-        display_positions = set()
-
-        # Find display math: $$...$$
-        for match in re.finditer(r'\$\$([^$]+?)\$\$', content, re.DOTALL):
-            start_pos = match.start()
-            equation_content = match.group(0)
-            inner_content = match.group(1).strip()
-
-            # Calculate line number
-            line_number = content[:start_pos].count('\n') + 1
-
-            # Track this position
-            display_positions.add((start_pos, match.end()))
-
+        for equation_type, inner_content, line_number in self.corpus.document(markdown_file).math:
             # Display math is usually valid, but still check
-            if self._is_valid_equation(inner_content):
-                equations.append(Equation(
-                    content=inner_content,
-                    equation_type='display',
-                    file_path=markdown_file,
-                    line_number=line_number,
-                    chapter_name=chapter_name,
-                    chapter_number=chapter_num
-                ))
-
-        # Find inline math: $...$
-        # Need to exclude display math positions and dollar amounts
-        for match in re.finditer(r'\$(?!\d)([^\$]+?)\$', content):
-            start_pos = match.start()
-            end_pos = match.end()
-
-            # Skip if this is part of a display math block
-            is_in_display = False
-            for disp_start, disp_end in display_positions:
-                if disp_start <= start_pos < disp_end:
-                    is_in_display = True
-                    break
-
-            if is_in_display:
-                continue
-
-            inner_content = match.group(1).strip()
-
-            # Validate that this looks like a real equation
             if not self._is_valid_equation(inner_content):
                 continue
 
-            # Calculate line number
-            line_number = content[:start_pos].count('\n') + 1
-
             equations.append(Equation(
                 content=inner_content,
-                equation_type='inline',
+                equation_type=equation_type,
                 file_path=markdown_file,
                 line_number=line_number,
                 chapter_name=chapter_name,
@@ -264,7 +243,7 @@ class EquationListGenerator:
         all_equations = []
 
         # Search all markdown files in docs directory
-        for md_file in self.docs_dir.rglob('*.md'):
+        for md_file in self.corpus.documents():
             if self._is_excluded_path(md_file):
                 continue
             equations = self.extract_equations_from_file(md_file)
@@ -275,13 +254,17 @@ class EquationListGenerator:
 
         return all_equations
 
-    def generate_equation_list_md(self) -> str:
+    def generate_equation_list_md(self, equations: List[Equation] = None) -> str:
         """Generate the list-equations.md content.
 
+        Args:
+            equations: Previously extracted equations (extracted from docs if None)
+
         Returns:
             Markdown content as string
         """
-        equations = self.extract_all_equations()
+        if equations is None:
+            equations = self.extract_all_equations()
 
         # Get current timestamp
         timestamp = datetime.now().strftime("%B %d, %Y at %I:%M %p")
@@ -394,16 +377,20 @@ class EquationListGenerator:
         output_file.parent.mkdir(parents=True, exist_ok=True)
 
         # Generate content
-        content = self.generate_equation_list_md()
+        with phase('aggregate'):
+            equations = self.extract_all_equations()
+        self.corpus.save()
+        with phase('render'):
+            content = self.generate_equation_list_md(equations)
 
         # Write file
-        with open(output_file, 'w', encoding='utf-8') as f:
+        with phase('write'), open(output_file, 'w', encoding='utf-8') as f:
             f.write(content)
+            count_write(f.tell())
 
         print(f"✅ Generated {output_file}")
 
         # Print summary
-        equations = self.extract_all_equations()
         print(f"\n📊 Found {len(equations)} equations:")
         print(f"   - Display equations: {sum(1 for e in equations if e.equation_type == 'display')}")
         print(f"   - Inline equations: {sum(1 for e in equations if e.equation_type == 'inline')}")
@@ -413,6 +400,8 @@ def main():
     """Main entry point."""
     import sys
 
+    start_profile('generate-equation-list', patterns=[EquationListGenerator])
+
     # Get docs directory from command line or use default
     docs_dir = sys.argv[1] if len(sys.argv) > 1 else "docs"
 
@@ -8,10 +8,15 @@ identifying quality scores and providing improvement recommendations.
 
 import os
 import re
+import sys
 import json
 from pathlib import Path
 from datetime import datetime
 
+# Shared profiling hooks live next to this script
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+from tool_profile import count_write, phase, start_profile
+
 # Base paths
 SCRIPT_DIR = Path(__file__).parent
 REPO_ROOT = SCRIPT_DIR.parent.parent
@@ -223,9 +228,12 @@ def generate_report():
 
     # Collect all MicroSims
     microsims = []
-    for item in sorted(SIMS_DIR.iterdir()):
+    with phase('walk'):
+        sim_dirs = sorted(SIMS_DIR.iterdir())
+    for item in sim_dirs:
         if item.is_dir() and (item / 'main.html').exists():
-            analysis = analyze_microsim(item)
+            with phase('parse', item.name):
+                analysis = analyze_microsim(item)
             microsims.append(analysis)
 
     print(f"Found {len(microsims)} MicroSims")
@@ -366,8 +374,9 @@ def generate_report():
     # Ensure output directory exists
     OUTPUT_FILE.parent.mkdir(parents=True, exist_ok=True)
 
-    with open(OUTPUT_FILE, 'w', encoding='utf-8') as f:
+    with phase('write'), open(OUTPUT_FILE, 'w', encoding='utf-8') as f:
         f.write(report_content)
+        count_write(f.tell())
 
     print(f"✓ Report written to: {OUTPUT_FILE}")
     print(f"  Total MicroSims: {total}")
@@ -377,6 +386,7 @@ def generate_report():
     return OUTPUT_FILE
 
 if __name__ == '__main__':
+    start_profile('microsim-quality-report')
     try:
         output_path = generate_report()
         print(f"\nSuccess! View report at:")
@@ -0,0 +1,372 @@
+#!/usr/bin/env python3
+"""
+Tool Profile
+
+Shared instrumentation for the book tools. A tool calls start_profile() in
+main(); its code and the shared libraries (book_corpus.py) mark work with
+phase() and count_read()/count_write(). When profiling is enabled, one JSON
+timing summary is written to stderr (or appended to $BOOK_TOOLS_PROFILE_FILE)
+when the tool exits:
+
+    {"tool": "book-metrics", "total_seconds": 1.42,
+     "phases": {"walk": 0.01, "read": 0.20, "parse": 0.95, ...},
+     "counters": {"files_read": 324, "bytes_read": 8895507, ...},
+     "slowest": {"parse": [["docs/chapters/07-x/index.md", 0.08], ...]}, ...}
+
+Phases are walk, read, parse, aggregate, render and write. Nested phases
+pause the enclosing one, so phase times add up to at most the total.
+
+Enable profiling with a tool's --profile flag or with the environment
+variable BOOK_TOOLS_PROFILE, whose value selects the extra captures:
+
+    BOOK_TOOLS_PROFILE=1            phase timers and counters
+    BOOK_TOOLS_PROFILE=cprofile     also the top functions by cumulative time
+    BOOK_TOOLS_PROFILE=tracemalloc  also peak traced memory and top allocation sites
+    BOOK_TOOLS_PROFILE=regex        also time spent in each compiled *_PATTERN
+    BOOK_TOOLS_PROFILE=all          everything (modes can also be comma-separated)
+
+When profiling is off, phase() returns a shared no-op context manager and
+the count functions return immediately.
+
+Usage:
+    sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'book-metrics'))
+    from tool_profile import add_profile_argument, phase, start_profile
+
+    add_profile_argument(parser)
+    args = parser.parse_args()
+    start_profile('my-tool', args.profile)
+    with phase('walk'):
+        files = sorted(docs.rglob('*.md'))
+"""
+
+import os
+import re
+import sys
+import json
+import time
+import atexit
+import contextlib
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional
+
+# Environment variables that enable profiling and redirect the summary
+ENV_VAR = 'BOOK_TOOLS_PROFILE'
+FILE_ENV_VAR = 'BOOK_TOOLS_PROFILE_FILE'
+
+# Phases reported in every summary, in pipeline order
+PHASES = ('walk', 'read', 'parse', 'aggregate', 'render', 'write')
+
+# Extra captures selected by the BOOK_TOOLS_PROFILE value
+CAPTURES = ('cprofile', 'tracemalloc', 'regex')
+
+# Entries kept in each top-N list of the summary
+TOP_N = 10
+
+# Shared no-op context manager returned while profiling is off
+_NULL_PHASE = contextlib.nullcontext()
+
+# The running profiler, if any
+_active = None
+
+
+def parse_mode(value: Optional[str]) -> Optional[set]:
+    """Translate a BOOK_TOOLS_PROFILE value into the set of extra captures.
+
+    Returns:
+        Set of capture names (possibly empty), or None if profiling is off
+    """
+    if value is None:
+        return None
+    value = value.strip().lower()
+    if value in ('', '0', 'false', 'no', 'off'):
+        return None
+    captures = set()
+    for part in re.split(r'[,\s]+', value):
+        if part == 'all':
+            captures.update(CAPTURES)
+        elif part in CAPTURES:
+            captures.add(part)
+    return captures
+
+
+class _TimedPattern:
+    """Proxy for a compiled regex that records the time spent in it."""
+
+    def __init__(self, name: str, pattern, profiler: 'Profiler'):
+        self._name = name
+        self._pattern = pattern
+        self._profiler = profiler
+
+    def __getattr__(self, attr):
+        return getattr(self._pattern, attr)
+
+    def _call(self, method, *args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return getattr(self._pattern, method)(*args, **kwargs)
+        finally:
+            self._profiler.add_regex(self._name, time.perf_counter() - start)
+
+    def search(self, *args, **kwargs):
+        return self._call('search', *args, **kwargs)
+
+    def match(self, *args, **kwargs):
+        return self._call('match', *args, **kwargs)
+
+    def fullmatch(self, *args, **kwargs):
+        return self._call('fullmatch', *args, **kwargs)
+
+    def findall(self, *args, **kwargs):
+        return self._call('findall', *args, **kwargs)
+
+    def sub(self, *args, **kwargs):
+        return self._call('sub', *args, **kwargs)
+
+    def subn(self, *args, **kwargs):
+        return self._call('subn', *args, **kwargs)
+
+    def split(self, *args, **kwargs):
+        return self._call('split', *args, **kwargs)
+
+    def finditer(self, *args, **kwargs):
+        iterator = self._pattern.finditer(*args, **kwargs)
+        elapsed = 0.0
+        try:
+            while True:
+                start = time.perf_counter()
+                try:
+                    match = next(iterator)
+                except StopIteration:
+                    break
+                finally:
+                    elapsed += time.perf_counter() - start
+                yield match
+        finally:
+            self._profiler.add_regex(self._name, elapsed)
+
+
+class Profiler:
+    """Phase timers, counters and optional captures for one tool run."""
+
+    def __init__(self, tool: str, captures: Iterable[str] = ()):
+        """Initialize the profiler.
+
+        Args:
+            tool: Tool name reported in the summary
+            captures: Extra captures to enable ('cprofile', 'tracemalloc', 'regex')
+        """
+        self.tool = tool
+        self.captures = set(captures)
+        self.phases: Dict[str, float] = {}
+        self.counters: Dict[str, int] = {}
+        self.slowest: Dict[str, List[Any]] = {}
+        self.regex: Dict[str, List[float]] = {}
+        self._stack: List[List[Any]] = []
+        self._cprofile = None
+        self._started = datetime.now()
+        self._start = time.perf_counter()
+        self._finished = False
+
+        if 'cprofile' in self.captures:
+            import cProfile
+            self._cprofile = cProfile.Profile()
+            self._cprofile.enable()
+        if 'tracemalloc' in self.captures:
+            import tracemalloc
+            tracemalloc.start()
+
+    @contextlib.contextmanager
+    def phase(self, name: str, item: Any = None):
+        """Attribute the time spent in the block to a phase.
+
+        Args:
+            name: Phase name (normally one of PHASES)
+            item: What the block works on (e.g. a file path); the slowest
+                  items of each phase are listed in the summary
+        """
+        now = time.perf_counter()
+        if self._stack:
+            # Pause the enclosing phase
+            outer = self._stack[-1]
+            self.phases[outer[0]] = self.phases.get(outer[0], 0.0) + now - outer[1]
+        entry = [name, now, now]
+        self._stack.append(entry)
+        try:
+            yield
+        finally:
+            end = time.perf_counter()
+            self._stack.pop()
+            self.phases[name] = self.phases.get(name, 0.0) + end - entry[1]
+            if item is not None:
+                self._note_slow(name, item, end - entry[2])
+            if self._stack:
+                self._stack[-1][1] = end
+
+    def _note_slow(self, name: str, item: Any, seconds: float):
+        slowest = self.slowest.setdefault(name, [])
+        if len(slowest) < TOP_N or seconds > slowest[-1][1]:
+            slowest.append([str(item), seconds])
+            slowest.sort(key=lambda entry: entry[1], reverse=True)
+            del slowest[TOP_N:]
+
+    def count(self, name: str, n: int = 1):
+        """Add n to a named counter."""
+        self.counters[name] = self.counters.get(name, 0) + n
+
+    def add_regex(self, name: str, seconds: float):
+        """Record one call of an instrumented regex."""
+        stats = self.regex.get(name)
+        if stats is None:
+            self.regex[name] = [1, seconds]
+        else:
+            stats[0] += 1
+            stats[1] += seconds
+
+    def instrument_patterns(self, owner, prefix: str = None):
+        """Replace an object's compiled *_PATTERN attributes with timing proxies.
+
+        Args:
+            owner: Module or class whose patterns should be timed
+            prefix: Name shown in the summary (default: the owner's __name__)
+        """
+        prefix = prefix or getattr(owner, '__name__', type(owner).__name__)
+        for attr, value in list(vars(owner).items()):
+            if attr.endswith('_PATTERN') and isinstance(value, re.Pattern):
+                setattr(owner, attr, _TimedPattern(f"{prefix}.{attr}", value, self))
+
+    def summary(self) -> Dict[str, Any]:
+        """Return the structured timing summary of the run so far."""
+        total = time.perf_counter() - self._start
+        phases = {name: round(self.phases.get(name, 0.0), 6) for name in PHASES}
+        for name, seconds in self.phases.items():
+            if name not in phases:
+                phases[name] = round(seconds, 6)
+        phases['other'] = round(max(0.0, total - sum(self.phases.values())), 6)
+
+        result = {
+            'tool': self.tool,
+            'started': self._started.isoformat(timespec='seconds'),
+            'argv': sys.argv[1:],
+            'cwd': os.getcwd(),
+            'total_seconds': round(total, 6),
+            'phases': phases,
+            'counters': dict(sorted(self.counters.items())),
+            'slowest': {name: [[item, round(seconds, 6)] for item, seconds in entries]
+                        for name, entries in self.slowest.items()},
+        }
+
+        if self.regex:
+            ranked = sorted(self.regex.items(), key=lambda kv: kv[1][1], reverse=True)
+            result['regex'] = [{'pattern': name, 'calls': calls, 'seconds': round(seconds, 6)}
+                               for name, (calls, seconds) in ranked[:TOP_N * 2]]
+
+        if self._cprofile is not None:
+            import pstats
+            self._cprofile.disable()
+            stats = pstats.Stats(self._cprofile)
+            ranked = sorted(stats.stats.items(), key=lambda kv: kv[1][3], reverse=True)
+            result['cprofile'] = [
+                {'function': f"{os.path.basename(filename)}:{line}({func})",
+                 'calls': calls, 'self_seconds': round(tottime, 6), 'cumulative_seconds': round(cumtime, 6)}
+                for (filename, line, func), (_, calls, tottime, cumtime, _) in ranked[:TOP_N * 2]
+            ]
+
+        if 'tracemalloc' in self.captures:
+            import tracemalloc
+            if tracemalloc.is_tracing():
+                _, peak = tracemalloc.get_traced_memory()
+                top = tracemalloc.take_snapshot().statistics('lineno')[:TOP_N]
+                tracemalloc.stop()
+                result['tracemalloc'] = {
+                    'peak_mb': round(peak / (1024 * 1024), 3),
+                    'top': [{'location': f"{os.path.basename(s.traceback[0].filename)}:{s.traceback[0].lineno}",
+                             'size_mb': round(s.size / (1024 * 1024), 3), 'count': s.count} for s in top],
+                }
+
+        return result
+
+    def finish(self):
+        """Write the summary once (called automatically at exit)."""
+        if self._finished:
+            return
+        self._finished = True
+        line = json.dumps(self.summary())
+        target = os.environ.get(FILE_ENV_VAR)
+        if target:
+            try:
+                with open(target, 'a', encoding='utf-8') as f:
+                    f.write(line + '\n')
+                return
+            except OSError as e:
+                print(f"Warning: Could not write profile to {target}: {e}", file=sys.stderr)
+        print(f"PROFILE {line}", file=sys.stderr)
+
+
+def add_profile_argument(parser):
+    """Add the shared --profile flag to an argparse parser."""
+    parser.add_argument('--profile', action='store_true',
+                        help=f'Print a JSON timing summary on exit (see ${ENV_VAR} for cProfile, '
+                             f'tracemalloc and regex captures)')
+
+
+def start_profile(tool: str, enabled: bool = None, patterns: Iterable[Any] = ()) -> Optional[Profiler]:
+    """Start profiling this run if --profile or BOOK_TOOLS_PROFILE asks for it.
+
+    Args:
+        tool: Tool name reported in the summary
+        enabled: Value of the tool's --profile flag; None means the tool has
+                 no argparse parser, so a '--profile' argument is taken out
+                 of sys.argv here
+        patterns: Modules or classes whose *_PATTERN regexes are timed in
+                  regex mode (the __main__ module and book_corpus always are)
+
+    Returns:
+        The active Profiler, or None if profiling is off
+    """
+    global _active
+    if enabled is None:
+        enabled = '--profile' in sys.argv
+        if enabled:
+            sys.argv.remove('--profile')
+
+    captures = parse_mode(os.environ.get(ENV_VAR))
+    if captures is None and not enabled:
+        return None
+    if _active is not None:
+        return _active
+
+    _active = Profiler(tool, captures or ())
+    if 'regex' in _active.captures:
+        owners = [sys.modules.get('__main__'), sys.modules.get('book_corpus'), *patterns]
+        for owner in owners:
+            if owner is not None:
+                _active.instrument_patterns(owner)
+    atexit.register(_active.finish)
+    return _active
+
+
+def phase(name: str, item: Any = None):
+    """Context manager attributing a block to a phase (no-op when profiling is off)."""
+    if _active is None:
+        return _NULL_PHASE
+    return _active.phase(name, item)
+
+
+def count(name: str, n: int = 1):
+    """Add n to a named counter (no-op when profiling is off)."""
+    if _active is not None:
+        _active.count(name, n)
+
+
+def count_read(nbytes: int):
+    """Record one file read of nbytes bytes."""
+    if _active is not None:
+        _active.count('files_read')
+        _active.count('bytes_read', nbytes)
+
+
+def count_write(nbytes: int):
+    """Record one file written with nbytes bytes."""
+    if _active is not None:
+        _active.count('files_written')
+        _active.count('bytes_written', nbytes)
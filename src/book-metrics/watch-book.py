@@ -0,0 +1,361 @@
+#!/usr/bin/env python3
+"""
+Book Report Watcher
+
+Keeps the book metrics, equation list and diagram reports up to date while
+the textbook is being edited. The parsed book is held in memory; when
+markdown files change, only those files (and the chapters containing them)
+are re-parsed, and only report files whose content changed are rewritten,
+so `mkdocs serve` picks up new metrics pages right after a save.
+
+Reports written:
+- docs/learning-graph/book-metrics.md and chapter-metrics.md (book-metrics.py)
+- docs/learning-graph/list-equations.md (generate-equation-list.py)
+- docs/learning-graph/diagram-table.md and diagram-details.md
+  (../diagram-reports/diagram-report.py)
+
+File events come from watchdog (inotify on Linux) when it is installed and
+from polling the docs tree otherwise. Bursts of events (an editor writing a
+file in several steps, a git checkout) are debounced into one update.
+
+Usage:
+    python watch-book.py [docs_directory] [--interval SECONDS] [--debounce SECONDS]
+                         [--poll] [--no-cache] [--once] [--profile]
+
+With --profile, one timing summary for the whole session is printed on exit.
+"""
+
+import os
+import re
+import sys
+import time
+import argparse
+import threading
+import importlib.util
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Set, Tuple
+
+# Shared parsed-document model lives next to this script
+SCRIPT_DIR = Path(__file__).resolve().parent
+sys.path.insert(0, str(SCRIPT_DIR))
+from book_corpus import open_corpus
+from tool_profile import add_profile_argument, count_write, phase, start_profile
+
+try:
+    from watchdog.events import FileSystemEventHandler
+    from watchdog.observers import Observer
+except ImportError:
+    FileSystemEventHandler = object
+    Observer = None
+
+# Version of the Book Report Watcher
+VERSION = "0.1.0"
+
+# Report timestamp line; a report that differs only here is not rewritten
+TIMESTAMP_PATTERN = re.compile(r'^\*\*Generated on\*\*: .*$', re.MULTILINE)
+
+# Non-markdown inputs of the reports
+WATCHED_FILENAMES = {'learning-graph.csv'}
+
+
+def load_script(name: str, path: Path):
+    """Import one of the hyphenated report scripts as a module.
+
+    Args:
+        name: Module name to register the script under
+        path: Path to the script
+
+    Returns:
+        The loaded module
+    """
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+book_metrics = load_script('book_metrics', SCRIPT_DIR / 'book-metrics.py')
+equation_list = load_script('generate_equation_list', SCRIPT_DIR / 'generate-equation-list.py')
+diagram_report = load_script('diagram_report', SCRIPT_DIR.parent / 'diagram-reports' / 'diagram-report.py')
+
+
+def write_report(path: Path, content: str) -> bool:
+    """Write a report only if it changed apart from its timestamp.
+
+    Args:
+        path: Report file to write
+        content: New report content
+
+    Returns:
+        True if the file was written, False if it was already up to date
+    """
+    try:
+        old_content = path.read_text(encoding='utf-8')
+    except OSError:
+        old_content = None
+    if old_content is not None and \
+            TIMESTAMP_PATTERN.sub('', old_content) == TIMESTAMP_PATTERN.sub('', content):
+        return False
+    with phase('write'), open(path, 'w', encoding='utf-8') as f:
+        f.write(content)
+        count_write(f.tell())
+    return True
+
+
+class ChangeHandler(FileSystemEventHandler):
+    """Wakes the watcher when watchdog reports a change to a watched file."""
+
+    def __init__(self, wake: threading.Event):
+        self.wake = wake
+
+    def on_any_event(self, event):
+        for path in (event.src_path, getattr(event, 'dest_path', '')):
+            if path and (path.endswith('.md') or os.path.basename(path) in WATCHED_FILENAMES):
+                self.wake.set()
+
+
+class BookWatcher:
+    """Keeps the book reports in sync with the markdown files."""
+
+    def __init__(self, docs_dir: str = "docs", use_cache: bool = True):
+        """Initialize the watcher and the shared in-memory book model.
+
+        Args:
+            docs_dir: Path to the docs directory (default: "docs")
+            use_cache: Reuse parsed documents from the on-disk corpus cache (default: True)
+        """
+        self.docs_dir = Path(docs_dir)
+        self.chapters_dir = self.docs_dir / "chapters"
+        self.output_dir = self.docs_dir / "learning-graph"
+
+        # All report generators share one corpus, so each file is parsed once
+        self.corpus = open_corpus(self.docs_dir, use_cache=use_cache)
+        self.metrics = book_metrics.BookMetricsGenerator(str(self.docs_dir), use_cache=use_cache)
+        self.equations = equation_list.EquationListGenerator(str(self.docs_dir), use_cache=use_cache)
+        # Parsed diagram elements per chapter; kept in memory even without the on-disk cache
+        self.use_cache = use_cache
+        self.element_cache = diagram_report.ElementCache(self.output_dir / diagram_report.CACHE_FILENAME)
+        if use_cache:
+            self.element_cache.load()
+
+        self.snapshot: Dict[Path, Tuple[int, int]] = {}
+
+    def scan(self) -> Dict[Path, Tuple[int, int]]:
+        """Stat every watched file under the docs directory.
+
+        Returns:
+            Dict mapping each watched file to its (mtime_ns, size)
+        """
+        snapshot = {}
+        with phase('walk'):
+            for dirpath, dirnames, filenames in os.walk(self.docs_dir):
+                for name in filenames:
+                    if name.endswith('.md') or name in WATCHED_FILENAMES:
+                        path = Path(dirpath, name)
+                        try:
+                            st = os.stat(path)
+                        except OSError:
+                            continue
+                        snapshot[path] = (st.st_mtime_ns, st.st_size)
+        return snapshot
+
+    def changed_files(self, snapshot: Dict[Path, Tuple[int, int]]) -> Set[Path]:
+        """Compare a snapshot with the last one the reports were built from.
+
+        Args:
+            snapshot: Result of scan()
+
+        Returns:
+            Paths that were created, deleted or modified
+        """
+        changed = {path for path, stat in snapshot.items() if self.snapshot.get(path) != stat}
+        changed.update(path for path in self.snapshot if path not in snapshot)
+        return changed
+
+    def update(self, changed: Set[Path] = None, snapshot: Dict[Path, Tuple[int, int]] = None) -> List[Path]:
+        """Bring the in-memory model and the report files up to date.
+
+        Args:
+            changed: Files that changed since the last update (None builds everything)
+            snapshot: scan() result the changes were found in (default: scan now)
+
+        Returns:
+            Report files that were rewritten
+        """
+        if snapshot is None:
+            snapshot = self.scan()
+        if changed:
+            markdown_files = sorted(path for path in changed if path.suffix == '.md')
+            for md_file in markdown_files:
+                self.corpus.invalidate(md_file)
+            self.metrics.refresh(markdown_files)
+            self.equations.refresh(markdown_files)
+
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        reports = {}
+
+        with phase('render'):
+            reports['book-metrics.md'] = self.metrics.generate_book_metrics_md()
+            reports['chapter-metrics.md'] = self.metrics.generate_chapter_metrics_md()
+        with phase('aggregate'):
+            equations = self.equations.extract_all_equations()
+        with phase('render'):
+            reports['list-equations.md'] = self.equations.generate_equation_list_md(equations)
+
+        if self.chapters_dir.is_dir():
+            # Unchanged chapters come from the element cache; edited ones are re-parsed
+            analyzer = diagram_report.DiagramAnalyzer(str(self.chapters_dir), cache=self.element_cache,
+                                                      corpus=self.corpus)
+            analyzer.analyze_all_chapters(workers=1)
+            generator = diagram_report.ReportGenerator(analyzer.elements)
+            with phase('render'):
+                reports['diagram-table.md'] = generator.generate_markdown_table()
+                reports['diagram-details.md'] = generator.generate_markdown_details()
+
+        written = []
+        for name, content in reports.items():
+            path = self.output_dir / name
+            if write_report(path, content):
+                written.append(path)
+
+        # Our own writes must not look like edits on the next scan
+        for path in written:
+            self.corpus.invalidate(path)
+            st = os.stat(path)
+            snapshot[path] = (st.st_mtime_ns, st.st_size)
+        self.metrics.refresh(written)
+
+        # Edits made while updating differ from this snapshot and trigger another update
+        self.snapshot = snapshot
+        return written
+
+    def save_caches(self):
+        """Write the corpus and element caches so the next start is warm.
+
+        Saving is left out of update() because serializing the whole book
+        costs more than updating the reports after an edit.
+        """
+        if self.use_cache:
+            self.corpus.save()
+            self.element_cache.save()
+
+    def report(self, changed: Set[Path], written: List[Path], elapsed: float):
+        """Print a one-line summary of an update."""
+        stamp = datetime.now().strftime('%H:%M:%S')
+        if changed:
+            names = ', '.join(sorted(str(p.relative_to(self.docs_dir)) for p in changed)[:3])
+            if len(changed) > 3:
+                names += f", ... ({len(changed)} files)"
+            source = f"{names} changed"
+        else:
+            source = "initial build"
+        updated = ', '.join(p.name for p in written) if written else "no reports changed"
+        print(f"[{stamp}] {source}: {updated} ({elapsed * 1000:.0f} ms)")
+
+    def wait_for_changes(self, wake: threading.Event, interval: float,
+                         debounce: float) -> Tuple[Set[Path], Dict[Path, Tuple[int, int]]]:
+        """Block until watched files change and then stay quiet for `debounce` seconds.
+
+        Args:
+            wake: Event set by watchdog, or None to poll the tree
+            interval: Seconds between polls of the tree
+            debounce: Quiet period that ends a burst of changes
+
+        Returns:
+            Files changed since the last update and the scan() result they were found in
+        """
+        while True:
+            if wake is not None:
+                wake.wait()
+                while True:
+                    wake.clear()
+                    time.sleep(debounce)
+                    if not wake.is_set():
+                        break
+                snapshot = self.scan()
+            else:
+                time.sleep(interval)
+                snapshot = self.scan()
+                if snapshot == self.snapshot:
+                    continue
+                while True:
+                    time.sleep(debounce)
+                    latest = self.scan()
+                    if latest == snapshot:
+                        break
+                    snapshot = latest
+
+            changed = self.changed_files(snapshot)
+            if changed:
+                return changed, snapshot
+
+    def watch(self, interval: float = 0.5, debounce: float = 0.2, poll: bool = False):
+        """Build the reports, then update them on every change until interrupted.
+
+        Args:
+            interval: Seconds between polls when polling the tree
+            debounce: Quiet period that ends a burst of changes
+            poll: Poll the tree even if watchdog is available
+        """
+        observer = None
+        wake = None
+        if Observer is not None and not poll:
+            wake = threading.Event()
+            observer = Observer()
+            observer.schedule(ChangeHandler(wake), str(self.docs_dir), recursive=True)
+            observer.start()
+            print(f"Watching {self.docs_dir} for changes (watchdog)")
+        else:
+            print(f"Watching {self.docs_dir} for changes (polling every {interval}s)")
+
+        try:
+            while True:
+                changed, snapshot = self.wait_for_changes(wake, interval, debounce)
+                start = time.perf_counter()
+                written = self.update(changed, snapshot)
+                self.report(changed, written, time.perf_counter() - start)
+        except KeyboardInterrupt:
+            print("\nStopped watching")
+        finally:
+            if observer is not None:
+                observer.stop()
+                observer.join()
+            self.save_caches()
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(description="Keep the book metrics, equation list and diagram reports "
+                                                 "up to date while the textbook is edited")
+    parser.add_argument('docs_dir', nargs='?', default='docs', help='Path to the docs directory (default: docs)')
+    parser.add_argument('--interval', type=float, default=0.5,
+                        help='Seconds between polls of the docs tree when polling (default: 0.5)')
+    parser.add_argument('--debounce', type=float, default=0.2,
+                        help='Quiet period in seconds that ends a burst of file changes (default: 0.2)')
+    parser.add_argument('--poll', action='store_true', help='Poll the docs tree even if watchdog is installed')
+    parser.add_argument('--no-cache', action='store_true', help='Start without the corpus and element caches')
+    parser.add_argument('--once', action='store_true', help='Update the reports once and exit')
+    add_profile_argument(parser)
+    args = parser.parse_args()
+    start_profile('watch-book', args.profile)
+
+    # Check if docs directory exists
+    if not Path(args.docs_dir).is_dir():
+        print(f"❌ Error: Directory '{args.docs_dir}' does not exist")
+        sys.exit(1)
+
+    watcher = BookWatcher(args.docs_dir, use_cache=not args.no_cache)
+    start = time.perf_counter()
+    written = watcher.update()
+    watcher.report(set(), written, time.perf_counter() - start)
+
+    if args.once:
+        watcher.save_caches()
+    else:
+        watcher.watch(interval=args.interval, debounce=args.debounce, poll=args.poll)
+
+
+if __name__ == "__main__":
+    main()
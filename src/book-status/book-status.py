@@ -7,9 +7,13 @@ for required files, directories, and content. It provides a visual checklist
 with green checkmarks for completed items and red X marks for missing items.
 
 Usage:
-    python book-status.py [path_to_book]
+    python book-status.py [path_to_book] [--profile]
 
 If no path is provided, uses current working directory.
+
+Markdown files are read through the shared book corpus
+(../book-metrics/book_corpus.py), so files already parsed by the other book
+tools are answered from docs/.book-corpus-cache.json without re-reading them.
 """
 
 import os
@@ -18,6 +22,11 @@ import re
 import glob
 from pathlib import Path
 
+# Shared parsed-document model lives in ../book-metrics
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'book-metrics'))
+from book_corpus import MarkdownCorpus, open_corpus
+from tool_profile import phase, start_profile
+
 # ANSI color codes for terminal output
 GREEN = '\033[92m'
 RED = '\033[91m'
@@ -43,87 +52,105 @@ def print_header(title: str):
     print(f"\n{BOLD}{BLUE}{title}{RESET}")
     print("─" * 50)
 
-def check_yaml_frontmatter(file_path: Path, key: str) -> tuple[bool, any]:
+class TreeSnapshot:
+    """Cached view of the book's directory tree shared by every status check.
+
+    Each directory is listed with a single os.scandir call the first time a
+    check looks into it; existence, type and stat answers come from those
+    entries, so no path is stat'ed twice. File contents are read lazily, at
+    most once, through the shared book corpus.
+    """
+
+    def __init__(self, root: Path, corpus: MarkdownCorpus = None):
+        self.root = root
+        self.corpus = corpus
+        self._listings = {}
+
+    def entries(self, directory: Path) -> dict:
+        """Return the directory's entries by name (empty if it cannot be listed)."""
+        listing = self._listings.get(directory)
+        if listing is None:
+            try:
+                with phase('walk'), os.scandir(directory) as it:
+                    listing = {entry.name: entry for entry in it}
+            except OSError:
+                listing = {}
+            self._listings[directory] = listing
+        return listing
+
+    def _entry(self, path: Path):
+        return self.entries(path.parent).get(path.name)
+
+    def exists(self, path: Path) -> bool:
+        """Check if a path exists (broken symlinks do not)."""
+        entry = self._entry(path)
+        return entry is not None and (entry.is_file() or entry.is_dir())
+
+    def is_dir(self, path: Path) -> bool:
+        """Check if a path is a directory."""
+        entry = self._entry(path)
+        return entry is not None and entry.is_dir()
+
+    def subdirs(self, directory: Path) -> list[Path]:
+        """Return the subdirectories of a directory, in listing order."""
+        return [directory / name for name, entry in self.entries(directory).items() if entry.is_dir()]
+
+    def document(self, path: Path):
+        """Return the parsed markdown record for a file, reusing the listing's stat."""
+        entry = self._entry(path)
+        try:
+            stat = entry.stat() if entry is not None else None
+        except OSError:
+            stat = None
+        return self.corpus.document(path, stat)
+
+    def text(self, path: Path) -> str:
+        """Return a file's text, reading it on first use."""
+        return self.corpus.text(path)
+
+def check_yaml_frontmatter(snapshot: TreeSnapshot, file_path: Path, key: str) -> tuple[bool, any]:
     """Check if a markdown file has a specific key in YAML frontmatter."""
-    try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            content = f.read()
-
-        # Check for YAML frontmatter
-        if not content.startswith('---'):
-            return False, None
-
-        # Extract frontmatter
-        parts = content.split('---', 2)
-        if len(parts) < 3:
-            return False, None
-
-        frontmatter = parts[1]
-
-        # Simple YAML parsing for the key
-        pattern = rf'^{key}:\s*(.+)$'
-        match = re.search(pattern, frontmatter, re.MULTILINE)
-        if match:
-            return True, match.group(1).strip()
-        return False, None
-    except Exception:
-        return False, None
+    value = snapshot.document(file_path).frontmatter.get(key)
+    if value:
+        return True, value
+    return False, None
 
-def count_words_in_file(file_path: Path) -> int:
+def count_words_in_file(snapshot: TreeSnapshot, file_path: Path) -> int:
     """Count words in a markdown file (excluding frontmatter)."""
-    try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            content = f.read()
-
-        # Remove YAML frontmatter
-        if content.startswith('---'):
-            parts = content.split('---', 2)
-            if len(parts) >= 3:
-                content = parts[2]
-
-        # Count words
-        words = re.findall(r'\b\w+\b', content)
-        return len(words)
-    except Exception:
-        return 0
+    return snapshot.document(file_path).body_words
 
-def check_file_has_content(file_path: Path, min_words: int = 100) -> bool:
+def check_file_has_content(snapshot: TreeSnapshot, file_path: Path, min_words: int = 100) -> bool:
     """Check if a file has meaningful content (more than min_words)."""
-    return count_words_in_file(file_path) >= min_words
+    return count_words_in_file(snapshot, file_path) >= min_words
 
-def find_chapters(docs_path: Path) -> list[Path]:
+def find_chapters(snapshot: TreeSnapshot, docs_path: Path) -> list[Path]:
     """Find all chapter directories."""
     chapters_dir = docs_path / 'chapters'
-    if not chapters_dir.exists():
+    if not snapshot.exists(chapters_dir):
         return []
 
     chapters = []
-    for item in sorted(chapters_dir.iterdir()):
-        if item.is_dir() and not item.name.startswith('.'):
+    for item in sorted(snapshot.subdirs(chapters_dir)):
+        if not item.name.startswith('.'):
             chapters.append(item)
     return chapters
 
-def check_microsims(docs_path: Path) -> tuple[bool, int]:
-    """Check for MicroSims in docs/sims directory."""
+def find_microsims(snapshot: TreeSnapshot, docs_path: Path) -> list[str]:
+    """List MicroSim directories (those with a main.html) in docs/sims."""
     sims_dir = docs_path / 'sims'
-    if not sims_dir.exists():
-        return False, 0
+    return [item.name for item in snapshot.subdirs(sims_dir)
+            if snapshot.exists(item / 'main.html')]
 
+def check_microsims(snapshot: TreeSnapshot, docs_path: Path) -> tuple[bool, int]:
+    """Check for MicroSims in docs/sims directory."""
     # Count directories with main.html files
-    microsim_count = 0
-    for item in sims_dir.iterdir():
-        if item.is_dir():
-            main_html = item / 'main.html'
-            if main_html.exists():
-                microsim_count += 1
-
+    microsim_count = len(find_microsims(snapshot, docs_path))
     return microsim_count > 0, microsim_count
 
-def check_references_in_file(file_path: Path) -> bool:
+def check_references_in_file(snapshot: TreeSnapshot, file_path: Path) -> bool:
     """Check if a file contains references (numbered list with links)."""
     try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            content = f.read()
+        content = snapshot.text(file_path)
 
         # Look for numbered references with URLs
         pattern = r'\d+\.\s+\[.+\]\(https?://.+\)'
@@ -133,6 +160,8 @@ def check_references_in_file(file_path: Path) -> bool:
         return False
 
 def main():
+    start_profile('book-status')
+
     # Determine book path
     if len(sys.argv) > 1:
         book_path = Path(sys.argv[1]).resolve()
@@ -169,8 +198,12 @@ def main():
     docs_path = book_path / 'docs'
     mkdocs_yml = book_path / 'mkdocs.yml'
 
-    docs_exists = docs_path.exists() and docs_path.is_dir()
-    mkdocs_exists = mkdocs_yml.exists()
+    # Every check below queries one cached listing per directory and reads
+    # each file at most once, sharing parsed markdown with the other book tools
+    snapshot = TreeSnapshot(book_path, open_corpus(docs_path))
+
+    docs_exists = snapshot.is_dir(docs_path)
+    mkdocs_exists = snapshot.exists(mkdocs_yml)
 
     print_status(docs_exists, "docs/ directory exists")
     print_status(mkdocs_exists, "mkdocs.yml configuration file exists")
@@ -189,17 +222,17 @@ def main():
     print_header("2. Course Description")
 
     course_desc = docs_path / 'course-description.md'
-    course_desc_exists = course_desc.exists()
+    course_desc_exists = snapshot.exists(course_desc)
     print_status(course_desc_exists, "docs/course-description.md exists")
     status['course_description'] = course_desc_exists
 
     if course_desc_exists:
-        has_quality, quality_value = check_yaml_frontmatter(course_desc, 'quality_score')
+        has_quality, quality_value = check_yaml_frontmatter(snapshot, course_desc, 'quality_score')
         print_status(has_quality, "Course description has quality_score in metadata",
                     f"Score: {quality_value}" if has_quality else "Missing quality_score field")
         status['course_description_quality'] = has_quality
 
-        has_content = check_file_has_content(course_desc, 200)
+        has_content = check_file_has_content(snapshot, course_desc, 200)
         print_status(has_content, "Course description has substantial content")
 
     # ─────────────────────────────────────────────────────────────
@@ -208,31 +241,31 @@ def main():
     print_header("3. Learning Graph")
 
     lg_dir = docs_path / 'learning-graph'
-    lg_dir_exists = lg_dir.exists() and lg_dir.is_dir()
+    lg_dir_exists = snapshot.is_dir(lg_dir)
     print_status(lg_dir_exists, "docs/learning-graph/ directory exists")
     status['learning_graph_dir'] = lg_dir_exists
 
     if lg_dir_exists:
         lg_csv = lg_dir / 'learning-graph.csv'
-        lg_csv_exists = lg_csv.exists()
+        lg_csv_exists = snapshot.exists(lg_csv)
         print_status(lg_csv_exists, "learning-graph.csv exists")
         status['learning_graph_csv'] = lg_csv_exists
 
         lg_json = lg_dir / 'learning-graph.json'
-        print_status(lg_json.exists(), "learning-graph.json exists (for visualization)")
+        print_status(snapshot.exists(lg_json), "learning-graph.json exists (for visualization)")
 
         quality_metrics = lg_dir / 'quality-metrics.md'
-        print_status(quality_metrics.exists(), "quality-metrics.md exists")
+        print_status(snapshot.exists(quality_metrics), "quality-metrics.md exists")
 
         concept_list = lg_dir / 'concept-list.md'
-        print_status(concept_list.exists(), "concept-list.md exists")
+        print_status(snapshot.exists(concept_list), "concept-list.md exists")
 
         # Count concepts in CSV
         if lg_csv_exists:
             try:
-                with open(lg_csv, 'r') as f:
-                    lines = f.readlines()
-                concept_count = len(lines) - 1  # Subtract header
+                content = snapshot.text(lg_csv)
+                lines = content.count('\n') + (not content.endswith('\n') and content != '')
+                concept_count = lines - 1  # Subtract header
                 print(f"      {YELLOW}Concepts in graph: {concept_count}{RESET}")
             except Exception:
                 pass
@@ -243,12 +276,12 @@ def main():
     print_header("4. Chapter Content")
 
     chapters_dir = docs_path / 'chapters'
-    chapters_dir_exists = chapters_dir.exists() and chapters_dir.is_dir()
+    chapters_dir_exists = snapshot.is_dir(chapters_dir)
     print_status(chapters_dir_exists, "docs/chapters/ directory exists")
     status['chapters_dir'] = chapters_dir_exists
 
     if chapters_dir_exists:
-        chapters = find_chapters(docs_path)
+        chapters = find_chapters(snapshot, docs_path)
         status['total_chapters'] = len(chapters)
         print(f"      {YELLOW}Found {len(chapters)} chapter directories{RESET}")
 
@@ -257,11 +290,11 @@ def main():
 
         for chapter in chapters:
             index_file = chapter / 'index.md'
-            if index_file.exists() and check_file_has_content(index_file, 500):
+            if snapshot.exists(index_file) and check_file_has_content(snapshot, index_file, 500):
                 chapters_with_content += 1
 
             quiz_file = chapter / 'quiz.md'
-            if quiz_file.exists():
+            if snapshot.exists(quiz_file):
                 chapters_with_quiz += 1
 
         status['chapters_with_content'] = chapters_with_content
@@ -283,22 +316,17 @@ def main():
     print_header("5. Glossary")
 
     glossary = docs_path / 'glossary.md'
-    glossary_exists = glossary.exists()
+    glossary_exists = snapshot.exists(glossary)
     print_status(glossary_exists, "docs/glossary.md exists")
     status['glossary'] = glossary_exists
 
     if glossary_exists:
-        has_content = check_file_has_content(glossary, 1000)
+        has_content = check_file_has_content(snapshot, glossary, 1000)
         print_status(has_content, "Glossary has substantial content (1000+ words)")
 
         # Count glossary terms (#### headers)
-        try:
-            with open(glossary, 'r') as f:
-                content = f.read()
-            terms = len(re.findall(r'^####\s+', content, re.MULTILINE))
-            print(f"      {YELLOW}Glossary terms: {terms}{RESET}")
-        except Exception:
-            pass
+        terms = snapshot.document(glossary).count_headings(4)
+        print(f"      {YELLOW}Glossary terms: {terms}{RESET}")
 
     # ─────────────────────────────────────────────────────────────
     # CHECK 6: FAQ
@@ -306,22 +334,17 @@ def main():
     print_header("6. FAQ")
 
     faq = docs_path / 'faq.md'
-    faq_exists = faq.exists()
+    faq_exists = snapshot.exists(faq)
     print_status(faq_exists, "docs/faq.md exists")
     status['faq'] = faq_exists
 
     if faq_exists:
-        has_content = check_file_has_content(faq, 500)
+        has_content = check_file_has_content(snapshot, faq, 500)
         print_status(has_content, "FAQ has substantial content")
 
         # Count FAQ entries (### headers)
-        try:
-            with open(faq, 'r') as f:
-                content = f.read()
-            questions = len(re.findall(r'^###\s+', content, re.MULTILINE))
-            print(f"      {YELLOW}FAQ questions: {questions}{RESET}")
-        except Exception:
-            pass
+        questions = snapshot.document(faq).count_headings(3)
+        print(f"      {YELLOW}FAQ questions: {questions}{RESET}")
 
     # ─────────────────────────────────────────────────────────────
     # CHECK 7: References
@@ -329,18 +352,17 @@ def main():
     print_header("7. References")
 
     references = docs_path / 'references.md'
-    references_exists = references.exists()
+    references_exists = snapshot.exists(references)
     print_status(references_exists, "docs/references.md exists")
 
     if references_exists:
-        has_refs = check_references_in_file(references)
+        has_refs = check_references_in_file(snapshot, references)
         print_status(has_refs, "References file has citations with links")
         status['references'] = has_refs
 
         # Count references
         try:
-            with open(references, 'r') as f:
-                content = f.read()
+            content = snapshot.text(references)
             ref_count = len(re.findall(r'^\d+\.\s+\[', content, re.MULTILINE))
             print(f"      {YELLOW}Reference count: {ref_count}{RESET}")
         except Exception:
@@ -351,14 +373,13 @@ def main():
     # ─────────────────────────────────────────────────────────────
     print_header("8. MicroSims (Interactive Simulations)")
 
-    has_microsims, microsim_count = check_microsims(docs_path)
+    has_microsims, microsim_count = check_microsims(snapshot, docs_path)
     print_status(has_microsims, f"MicroSims found: {microsim_count}")
     status['microsims'] = microsim_count
 
     if has_microsims:
-        sims_dir = docs_path / 'sims'
         # List first few MicroSims
-        sims = [d.name for d in sims_dir.iterdir() if d.is_dir() and (d / 'main.html').exists()][:5]
+        sims = find_microsims(snapshot, docs_path)[:5]
         if sims:
             print(f"      {YELLOW}Examples: {', '.join(sims)}{RESET}")
 
@@ -369,17 +390,17 @@ def main():
 
     if lg_dir_exists:
         diagram_table = lg_dir / 'diagram-table.md'
-        diagram_table_exists = diagram_table.exists()
+        diagram_table_exists = snapshot.exists(diagram_table)
         print_status(diagram_table_exists, "learning-graph/diagram-table.md exists")
         status['diagram_table'] = diagram_table_exists
 
         diagram_details = lg_dir / 'diagram-details.md'
-        diagram_details_exists = diagram_details.exists()
+        diagram_details_exists = snapshot.exists(diagram_details)
         print_status(diagram_details_exists, "learning-graph/diagram-details.md exists")
         status['diagram_details'] = diagram_details_exists
 
         microsim_report = lg_dir / 'microsim-quality-report.md'
-        print_status(microsim_report.exists(), "learning-graph/microsim-quality-report.md exists")
+        print_status(snapshot.exists(microsim_report), "learning-graph/microsim-quality-report.md exists")
     else:
         print_status(False, "learning-graph/ directory required for reports")
 
@@ -459,6 +480,8 @@ def main():
         print(f"    Consider running: mkdocs serve  (to preview)")
         print(f"                      mkdocs gh-deploy  (to publish)")
 
+    snapshot.corpus.save()
+
     print()
     return 0 if percentage == 100 else 1
 
@@ -4,11 +4,19 @@ Add '#### Diagram: NAME' headers before <details> blocks in chapter files.
 
 This script processes all chapter index.md files and adds a level 4 header
 before each <details> block, extracting the name from the <summary> element.
+
+Usage:
+    python add-diagram-headers.py [--profile]
 """
 
 import re
+import sys
 from pathlib import Path
 
+# Shared profiling hooks live in src/book-metrics
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'book-metrics'))
+from tool_profile import count_read, count_write, phase, start_profile
+
 def extract_summary_name(summary_text):
     """Extract the name from summary text, removing 'MicroSim:' or 'Diagram:' prefix"""
     # Remove common prefixes
@@ -20,8 +28,9 @@ def process_chapter_file(file_path):
     """Process a single chapter file to add diagram headers"""
     print(f"\nProcessing: {file_path.parent.name}/index.md")
 
-    with open(file_path, 'r', encoding='utf-8') as f:
+    with phase('read', file_path), open(file_path, 'r', encoding='utf-8') as f:
         content = f.read()
+        count_read(f.tell())
 
     # Split into lines for easier processing
     lines = content.split('\n')
@@ -74,8 +83,9 @@ def process_chapter_file(file_path):
     if changes_made > 0:
         # Write back to file
         new_content = '\n'.join(new_lines)
-        with open(file_path, 'w', encoding='utf-8') as f:
+        with phase('write'), open(file_path, 'w', encoding='utf-8') as f:
             f.write(new_content)
+            count_write(f.tell())
         print(f"  ✓ Updated {changes_made} details block(s)")
     else:
         print(f"  ✓ No changes needed (all headers already present)")
@@ -84,6 +94,7 @@ def process_chapter_file(file_path):
 
 def main():
     """Process all chapter files"""
+    start_profile('add-diagram-headers')
     chapters_dir = Path('docs/chapters')
 
     if not chapters_dir.exists():
@@ -91,8 +102,9 @@ def main():
         return 1
 
     # Get all numbered chapter directories
-    chapter_dirs = sorted([d for d in chapters_dir.iterdir()
-                          if d.is_dir() and re.match(r'^\d{2}-', d.name)])
+    with phase('walk'):
+        chapter_dirs = sorted([d for d in chapters_dir.iterdir()
+                              if d.is_dir() and re.match(r'^\d{2}-', d.name)])
 
     print(f"Found {len(chapter_dirs)} chapter directories")
 
@@ -100,7 +112,8 @@ def main():
     for chapter_dir in chapter_dirs:
         index_file = chapter_dir / 'index.md'
         if index_file.exists():
-            changes = process_chapter_file(index_file)
+            with phase('parse', index_file):
+                changes = process_chapter_file(index_file)
             total_changes += changes
 
     print(f"\n{'='*60}")
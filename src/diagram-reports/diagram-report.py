@@ -27,16 +27,47 @@ Usage:
 
     # Enable verbose output for debugging
     python diagram-report.py -v
+
+    # Parse chapter files in 4 worker processes (default: all cores)
+    python diagram-report.py -j 4
+
+    # Ignore the element cache and re-parse every chapter
+    python diagram-report.py --no-cache
+
+    # Print a JSON timing summary on exit
+    python diagram-report.py --profile
+
+Parsed elements are cached per chapter in <output-dir>/.diagram-report-cache.json,
+keyed by a hash of the chapter's index.md, so only edited chapters are re-parsed.
+Chapter files are read through the shared book corpus (../book-metrics/book_corpus.py),
+whose cache supplies that hash without re-reading unchanged files.
+Report files are only rewritten when their content changes.
 """
 
 import os
 import re
 import csv
+import io
+import sys
+import json
+import contextlib
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from dataclasses import dataclass, field
-from typing import List, Dict, Tuple
+from dataclasses import dataclass, field, asdict
+from typing import Any, List, Dict, Optional, Tuple
 import argparse
 
+# Shared parsed-document model lives in ../book-metrics
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'book-metrics'))
+from book_corpus import MarkdownCorpus, open_corpus
+from tool_profile import add_profile_argument, count_write, phase, start_profile
+
+# Default element cache file name (stored in the output directory)
+CACHE_FILENAME = '.diagram-report-cache.json'
+
+# Bump when parsing rules change so cached elements are recomputed
+CACHE_VERSION = 1
+
 
 @dataclass
 class VisualElement:
@@ -70,6 +101,134 @@ class VisualElement:
             'MicroSim Recommendations': '; '.join([f"{name} ({score})" for name, score in self.microsim_recommendations])
         }
 
+    def to_record(self) -> Dict[str, Any]:
+        """Convert to a JSON-serializable record for the element cache"""
+        return asdict(self)
+
+    @classmethod
+    def from_record(cls, record: Dict[str, Any]) -> 'VisualElement':
+        """Rebuild an element from a cache record"""
+        record = dict(record)
+        record['microsim_recommendations'] = [tuple(r) for r in record['microsim_recommendations']]
+        return cls(**record)
+
+
+class ElementCache:
+    """On-disk cache of parsed VisualElement records per chapter.
+
+    Entries are keyed by chapter directory name and validated by the SHA-256
+    of the chapter's index.md, so an edited chapter is re-parsed and an
+    untouched one (even with a new mtime) is not. The whole cache is
+    discarded when CACHE_VERSION changes.
+    """
+
+    def __init__(self, cache_file: Path, version: int = CACHE_VERSION):
+        """Initialize the cache.
+
+        Args:
+            cache_file: Path to the JSON cache file
+            version: Parser version the cached records were computed with
+        """
+        self.cache_file = Path(cache_file)
+        self.version = version
+        self.entries: Dict[str, Dict[str, Any]] = {}
+        self.dirty = False
+
+    def load(self):
+        """Load cache entries from disk, ignoring missing or stale caches."""
+        try:
+            with open(self.cache_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError) as e:
+            print(f"Warning: Ignoring unreadable element cache {self.cache_file}: {e}")
+            return
+
+        if data.get('version') == self.version:
+            self.entries = data.get('chapters', {})
+        else:
+            # Elements from another parser version must be recomputed
+            self.dirty = True
+
+    def lookup(self, key: str, digest: str) -> Optional[List[VisualElement]]:
+        """Return cached elements if the chapter's content hash is unchanged.
+
+        Args:
+            key: Chapter directory name
+            digest: SHA-256 hex digest of the chapter's index.md
+
+        Returns:
+            Cached elements, or None on a miss
+        """
+        entry = self.entries.get(key)
+        if entry and entry['sha256'] == digest:
+            return [VisualElement.from_record(r) for r in entry['elements']]
+        return None
+
+    def store(self, key: str, digest: str, elements: List[VisualElement]):
+        """Record the parsed elements for a chapter.
+
+        Args:
+            key: Chapter directory name
+            digest: SHA-256 hex digest of the chapter's index.md
+            elements: Elements parsed from that content
+        """
+        self.entries[key] = {
+            'sha256': digest,
+            'elements': [e.to_record() for e in elements]
+        }
+        self.dirty = True
+
+    def prune(self, live_keys):
+        """Drop entries for chapters that no longer exist.
+
+        Args:
+            live_keys: Keys of the chapters seen in the current scan
+        """
+        stale = set(self.entries) - set(live_keys)
+        for key in stale:
+            del self.entries[key]
+        if stale:
+            self.dirty = True
+
+    def save(self):
+        """Write the cache to disk if it changed (atomically via a temp file)."""
+        if not self.dirty:
+            return
+
+        tmp_file = self.cache_file.with_name(self.cache_file.name + '.tmp')
+        try:
+            with open(tmp_file, 'w', encoding='utf-8') as f:
+                json.dump({'version': self.version, 'chapters': self.entries}, f,
+                          separators=(',', ':'), sort_keys=True)
+            os.replace(tmp_file, self.cache_file)
+            self.dirty = False
+        except OSError as e:
+            print(f"Warning: Could not write element cache {self.cache_file}: {e}")
+
+
+def write_if_changed(path: Path, content: str) -> bool:
+    """Write content to path only if the file's bytes would change.
+
+    Leaving unchanged files untouched keeps their mtime, so tools that watch
+    the docs tree (e.g. mkdocs serve) are not triggered by a no-op report.
+
+    Returns:
+        True if the file was written, False if it was already up to date
+    """
+    data = content.encode('utf-8')
+    with phase('write'):
+        try:
+            if Path(path).read_bytes() == data:
+                return False
+        except OSError:
+            pass
+        with open(path, 'wb') as f:
+            f.write(data)
+        count_write(len(data))
+    return True
+
 
 class DiagramAnalyzer:
     """Analyzes markdown files to extract diagram and MicroSim information"""
@@ -85,20 +244,77 @@ class DiagramAnalyzer:
     STATUS_PATTERN = re.compile(r'\*\*Status:\*\*\s*(.*?)(?:\n\n|\r\n\r\n|\n\*\*|\r\*\*|\n|\r)', re.IGNORECASE)
     MICROSIM_RECOMMENDATIONS_PATTERN = re.compile(r'\*\*MicroSim Generator Recommendations:\*\*\s*(.*?)(?=</details>|$)', re.DOTALL | re.IGNORECASE)
     RECOMMENDATION_LINE_PATTERN = re.compile(r'\d+\.\s+([a-z0-9-]+)\s+\((\d+)/100\)', re.IGNORECASE)
+    CHAPTER_DIR_PATTERN = re.compile(r'^(\d{2})-(.*)')
+    CANVAS_PATTERN = re.compile(r'canvas.*?(\d{3,4})\s*[x×]\s*(\d{3,4})')
+
+    # Single-pass field tokenizer: one scan of a <details> block finds where
+    # every labeled field starts; each field pattern above is then matched
+    # only at that position instead of searching the whole block.
+    FIELD_PATTERN = re.compile(
+        r'\*\*(?:(?P<type>Type)'
+        r'|(?P<status>Status)'
+        r'|(?P<learning_objective>Learning Objective)'
+        r'|(?P<recommendations>MicroSim Generator Recommendations)):\*\*'
+        r'|(?P<bloom>Bloom\'?s Taxonomy)',
+        re.IGNORECASE)
+    FIELD_VALUE_PATTERNS = {
+        'type': TYPE_PATTERN,
+        'status': STATUS_PATTERN,
+        'learning_objective': LEARNING_OBJ_PATTERN,
+        'recommendations': MICROSIM_RECOMMENDATIONS_PATTERN,
+        'bloom': BLOOM_PATTERN,
+    }
+
+    # Bloom's levels in report order, keyed by the first five letters of
+    # the word matched by BLOOM_LEVEL_PATTERN (one alternation for all six)
+    BLOOM_LEVELS = [
+        ('remem', 'Remembering'),
+        ('under', 'Understanding'),
+        ('apply', 'Applying'),
+        ('analy', 'Analyzing'),
+        ('evalu', 'Evaluating'),
+        ('creat', 'Creating'),
+    ]
+    BLOOM_LEVEL_PATTERN = re.compile(
+        r'\b(remember(?:ing)?|understand(?:ing)?|apply(?:ing)?'
+        r'|analyz(?:e|ing)|evaluat(?:e|ing)|creat(?:e|ing))\b',
+        re.IGNORECASE)
 
     # UI element keywords to count
     UI_KEYWORDS = [
         'slider', 'button', 'dropdown', 'checkbox', 'input', 'toggle',
         'menu', 'control', 'panel', 'display', 'text box', 'selector'
     ]
+    # All keywords (and plurals) counted in one scan of the lowercased block
+    UI_KEYWORD_PATTERN = re.compile(
+        r'\b(?:' + '|'.join(re.escape(k) for k in UI_KEYWORDS) + r')s?\b')
+
+    # Features that make an element harder to implement
+    COMPLEX_FEATURES = [
+        'animation', 'rotate', 'transform', '3d', 'isometric',
+        'graph', 'plot', 'calculation', 'real-time', 'dynamic',
+        'comparison', 'overlay', 'multiple panels', 'side-by-side'
+    ]
 
-    def __init__(self, chapters_dir: str, verbose: bool = False):
+    def __init__(self, chapters_dir: str, verbose: bool = False, cache: ElementCache = None,
+                 corpus: MarkdownCorpus = None):
         self.chapters_dir = Path(chapters_dir)
         self.elements: List[VisualElement] = []
         self.verbose = verbose
+        self.cache = cache
+        # Without a shared corpus, read chapters through a private uncached one
+        self.corpus = corpus if corpus is not None else open_corpus(self.chapters_dir.parent, use_cache=False)
+
+    def analyze_all_chapters(self, workers: int = 1):
+        """Analyze all chapter directories
 
-    def analyze_all_chapters(self):
-        """Analyze all chapter directories"""
+        Chapters whose index.md hash matches the element cache are not
+        re-parsed; the rest are parsed in this process or a process pool.
+
+        Args:
+            workers: Number of processes used to parse chapter files
+                     (1 parses them in this process)
+        """
         # Get all numbered chapter directories (01-*, 02-*, etc.)
         chapter_dirs = sorted([d for d in self.chapters_dir.iterdir()
                               if d.is_dir() and re.match(r'^\d{2}-', d.name)])
@@ -108,56 +324,141 @@ class DiagramAnalyzer:
             for d in chapter_dirs:
                 print(f"  - {d.name}")
 
+        # Hash every chapter via the corpus; only element cache misses are read and parsed
+        results: Dict[str, Tuple[List[VisualElement], str]] = {}
+        pending = []
         for chapter_dir in chapter_dirs:
             index_file = chapter_dir / 'index.md'
-            if index_file.exists():
-                self.analyze_chapter_file(index_file)
+            if not index_file.exists():
+                continue
+            # The content hash only matters for the element cache
+            digest = self.corpus.document(index_file).sha256 if self.cache is not None else ''
+            cached = self.cache.lookup(chapter_dir.name, digest) if self.cache and digest else None
+            if cached is not None:
+                output = (f"\n  Using cached {chapter_dir.name}/index.md: {len(cached)} elements\n"
+                          if self.verbose else '')
+                results[chapter_dir.name] = (cached, output)
+                continue
+            try:
+                content = self.corpus.text(index_file)
+            except Exception as e:
+                results[chapter_dir.name] = ([], f"Error analyzing {index_file}: {e}\n")
+                continue
+            pending.append((digest, (str(index_file), content, self.verbose)))
+
+        jobs = [job for _, job in pending]
+        if workers > 1 and len(jobs) > 1:
+            with phase('parse'), ProcessPoolExecutor(max_workers=workers) as executor:
+                parsed = list(executor.map(_parse_chapter_worker, jobs))
+        else:
+            parsed = []
+            for job in jobs:
+                with phase('parse', job[0]):
+                    parsed.append(_parse_chapter_worker(job))
+
+        for (digest, (file_path, _, _)), (elements, output, ok) in zip(pending, parsed):
+            key = Path(file_path).parent.name
+            results[key] = (elements, output)
+            if ok and self.cache is not None:
+                self.cache.store(key, digest, elements)
+
+        # Merge in chapter order so output and element order match a serial run
+        for chapter_dir in chapter_dirs:
+            if chapter_dir.name in results:
+                elements, output = results[chapter_dir.name]
+                print(output, end='')
+                self.elements.extend(elements)
             elif self.verbose:
                 print(f"  Warning: No index.md in {chapter_dir.name}")
 
+        if self.cache is not None:
+            self.cache.prune(d.name for d in chapter_dirs if d.name in results)
+
     def analyze_chapter_file(self, file_path: Path):
         """Analyze a single chapter markdown file"""
+        self.elements.extend(self.parse_chapter_file(file_path))
+
+    def parse_chapter_file(self, file_path: Path) -> List[VisualElement]:
+        """Parse a single chapter markdown file and return its elements"""
         try:
             with open(file_path, 'r', encoding='utf-8') as f:
                 content = f.read()
-
-            # Extract chapter number and name from directory
-            chapter_dir_name = file_path.parent.name
-            match = re.match(r'^(\d{2})-(.*)', chapter_dir_name)
-            if match:
-                chapter_num = match.group(1)
-                chapter_name = match.group(2).replace('-', ' ').title()
-            else:
-                chapter_num = "??"
-                chapter_name = chapter_dir_name
-
-            # Find all header + <details> blocks first (preferred method)
-            header_details_blocks = list(self.HEADER_DETAILS_PATTERN.finditer(content))
-
-            if self.verbose:
-                print(f"\n  Analyzing {file_path.parent.name}/index.md:")
-                print(f"    Found {len(header_details_blocks)} header+details blocks")
-
-            elements_found = 0
-            for match in header_details_blocks:
-                header_title = match.group(1).strip()
-                # group(2) is now the content between header and details (iframe, etc.)
-                details_content = match.group(3)  # The actual details content
-                element = self.parse_details_block(details_content, chapter_num, chapter_name, chapter_dir_name, header_title)
-                if element:
-                    self.elements.append(element)
-                    elements_found += 1
-                elif self.verbose:
-                    print(f"      Skipped: {header_title[:50]}")
-
-            if self.verbose:
-                print(f"    Added {elements_found} elements")
-
+            return self.parse_chapter_content(content, Path(file_path))
         except Exception as e:
             print(f"Error analyzing {file_path}: {e}")
             if self.verbose:
                 import traceback
                 traceback.print_exc()
+            return []
+
+    def parse_chapter_content(self, content: str, file_path: Path) -> List[VisualElement]:
+        """Extract the visual elements from a chapter's markdown content
+
+        Args:
+            content: Text of the chapter's index.md
+            file_path: Path of that file (its directory names the chapter)
+        """
+        elements = []
+
+        # Extract chapter number and name from directory
+        chapter_dir_name = file_path.parent.name
+        match = self.CHAPTER_DIR_PATTERN.match(chapter_dir_name)
+        if match:
+            chapter_num = match.group(1)
+            chapter_name = match.group(2).replace('-', ' ').title()
+        else:
+            chapter_num = "??"
+            chapter_name = chapter_dir_name
+
+        # Find all header + <details> blocks first (preferred method)
+        header_details_blocks = list(self.HEADER_DETAILS_PATTERN.finditer(content))
+
+        if self.verbose:
+            print(f"\n  Analyzing {file_path.parent.name}/index.md:")
+            print(f"    Found {len(header_details_blocks)} header+details blocks")
+
+        for match in header_details_blocks:
+            header_title = match.group(1).strip()
+            # group(2) is now the content between header and details (iframe, etc.)
+            details_content = match.group(3)  # The actual details content
+            element = self.parse_details_block(details_content, chapter_num, chapter_name, chapter_dir_name, header_title)
+            if element:
+                elements.append(element)
+            elif self.verbose:
+                print(f"      Skipped: {header_title[:50]}")
+
+        if self.verbose:
+            print(f"    Added {len(elements)} elements")
+
+        return elements
+
+    def tokenize_details_block(self, content: str) -> Dict[str, str]:
+        """Split a <details> block into labeled fields in a single scan
+
+        Returns:
+            Dictionary mapping 'type', 'status', 'learning_objective',
+            'recommendations' and 'bloom' to the captured field text, or
+            None when the field is absent. Values are identical to searching
+            the block with the corresponding *_PATTERN.
+        """
+        starts = {}
+        for match in self.FIELD_PATTERN.finditer(content):
+            starts.setdefault(match.lastgroup, match.start())
+            if len(starts) == len(self.FIELD_VALUE_PATTERNS):
+                break
+
+        fields = {}
+        for name, pattern in self.FIELD_VALUE_PATTERNS.items():
+            value = None
+            if name in starts:
+                match = pattern.match(content, starts[name])
+                if match is None:
+                    # First occurrence is malformed; fall back to a full search
+                    match = pattern.search(content, starts[name] + 1)
+                if match:
+                    value = match.group(1)
+            fields[name] = value
+        return fields
 
     def parse_details_block(self, content: str, chapter_num: str, chapter_name: str, chapter_dir: str, header_title: str = None) -> VisualElement:
         """Parse a single <details> block to extract element information"""
@@ -170,13 +471,14 @@ class DiagramAnalyzer:
                 return None
             title = summary_match.group(1).strip()
 
+        fields = self.tokenize_details_block(content)
+        content_lower = content.lower()
+
         # Extract type - be more lenient
-        type_match = self.TYPE_PATTERN.search(content)
-        if type_match:
-            element_type = type_match.group(1).strip().lower()
+        if fields['type'] is not None:
+            element_type = fields['type'].strip().lower()
         else:
             # Try to infer from content
-            content_lower = content.lower()
             if 'microsim' in content_lower or 'p5.js' in content_lower or 'p5' in content_lower:
                 element_type = 'microsim'
             elif 'diagram' in content_lower:
@@ -193,22 +495,23 @@ class DiagramAnalyzer:
             element_type = 'unknown'
 
         # Extract Bloom's taxonomy levels
-        bloom_levels = self.extract_bloom_levels(content)
+        bloom_levels = self.parse_bloom_levels(fields['bloom'])
 
         # Extract learning objective
-        learning_obj = self.extract_learning_objective(content)
+        learning_obj = fields['learning_objective']
+        learning_obj = learning_obj.strip().replace('\n', ' ') if learning_obj is not None else ""
 
         # Extract status
-        status = self.extract_status(content)
+        status = fields['status'].strip() if fields['status'] is not None else ""
 
         # Extract MicroSim recommendations
-        microsim_recommendations, microsim_text = self.extract_microsim_recommendations(content)
+        microsim_recommendations, microsim_text = self.parse_microsim_recommendations(fields['recommendations'])
 
         # Count UI elements
-        ui_count = self.count_ui_elements(content)
+        ui_count = len(self.UI_KEYWORD_PATTERN.findall(content_lower))
 
         # Estimate difficulty
-        difficulty = self.estimate_difficulty(content, ui_count, element_type)
+        difficulty = self.estimate_difficulty(content, ui_count, element_type, content_lower)
 
         return VisualElement(
             chapter_num=chapter_num,
@@ -228,42 +531,26 @@ class DiagramAnalyzer:
 
     def extract_bloom_levels(self, content: str) -> List[str]:
         """Extract Bloom's taxonomy levels from content"""
-        bloom_match = self.BLOOM_PATTERN.search(content)
-        if not bloom_match:
-            return ['Not specified']
+        return self.parse_bloom_levels(self.tokenize_details_block(content)['bloom'])
 
-        bloom_text = bloom_match.group(1)
-
-        # Common Bloom's levels
-        levels = []
-        if re.search(r'\bremember(?:ing)?\b', bloom_text, re.IGNORECASE):
-            levels.append('Remembering')
-        if re.search(r'\bunderstand(?:ing)?\b', bloom_text, re.IGNORECASE):
-            levels.append('Understanding')
-        if re.search(r'\bapply(?:ing)?\b', bloom_text, re.IGNORECASE):
-            levels.append('Applying')
-        if re.search(r'\banalyz(?:e|ing)\b', bloom_text, re.IGNORECASE):
-            levels.append('Analyzing')
-        if re.search(r'\bevaluat(?:e|ing)\b', bloom_text, re.IGNORECASE):
-            levels.append('Evaluating')
-        if re.search(r'\bcreat(?:e|ing)\b', bloom_text, re.IGNORECASE):
-            levels.append('Creating')
+    def parse_bloom_levels(self, bloom_text: str) -> List[str]:
+        """Map the text after "Bloom's Taxonomy" to canonical level names"""
+        if bloom_text is None:
+            return ['Not specified']
 
+        found = {m.group(1).lower()[:5] for m in self.BLOOM_LEVEL_PATTERN.finditer(bloom_text)}
+        levels = [name for stem, name in self.BLOOM_LEVELS if stem in found]
         return levels if levels else ['Not specified']
 
     def extract_learning_objective(self, content: str) -> str:
         """Extract learning objective from content"""
-        obj_match = self.LEARNING_OBJ_PATTERN.search(content)
-        if obj_match:
-            return obj_match.group(1).strip().replace('\n', ' ')
-        return ""
+        obj = self.tokenize_details_block(content)['learning_objective']
+        return obj.strip().replace('\n', ' ') if obj is not None else ""
 
     def extract_status(self, content: str) -> str:
         """Extract status from content"""
-        status_match = self.STATUS_PATTERN.search(content)
-        if status_match:
-            return status_match.group(1).strip()
-        return ""
+        status = self.tokenize_details_block(content)['status']
+        return status.strip() if status is not None else ""
 
     def extract_microsim_recommendations(self, content: str) -> Tuple[List[Tuple[str, int]], str]:
         """Extract MicroSim recommendations from content
@@ -271,11 +558,14 @@ class DiagramAnalyzer:
         Returns:
             Tuple of (list of (generator_name, score) tuples, full recommendation text)
         """
-        recommendations_match = self.MICROSIM_RECOMMENDATIONS_PATTERN.search(content)
-        if not recommendations_match:
+        return self.parse_microsim_recommendations(self.tokenize_details_block(content)['recommendations'])
+
+    def parse_microsim_recommendations(self, recommendations_text: str) -> Tuple[List[Tuple[str, int]], str]:
+        """Parse the text of a MicroSim Generator Recommendations field"""
+        if recommendations_text is None:
             return ([], "")
 
-        recommendations_text = recommendations_match.group(1).strip()
+        recommendations_text = recommendations_text.strip()
         full_text = f"**MicroSim Generator Recommendations:**\n{recommendations_text}"
 
         # Parse individual recommendation lines
@@ -289,18 +579,13 @@ class DiagramAnalyzer:
 
     def count_ui_elements(self, content: str) -> int:
         """Count the number of UI elements mentioned in specifications"""
-        content_lower = content.lower()
-        count = 0
+        return len(self.UI_KEYWORD_PATTERN.findall(content.lower()))
 
-        for keyword in self.UI_KEYWORDS:
-            # Count occurrences of each keyword
-            count += len(re.findall(rf'\b{keyword}s?\b', content_lower))
-
-        return count
-
-    def estimate_difficulty(self, content: str, ui_count: int, element_type: str) -> str:
+    def estimate_difficulty(self, content: str, ui_count: int, element_type: str,
+                            content_lower: str = None) -> str:
         """Estimate implementation difficulty based on various factors"""
-        content_lower = content.lower()
+        if content_lower is None:
+            content_lower = content.lower()
 
         # Factors that increase difficulty
         difficulty_score = 0
@@ -320,18 +605,12 @@ class DiagramAnalyzer:
             difficulty_score += 4  # High interactivity
 
         # Check for complex features
-        complex_features = [
-            'animation', 'rotate', 'transform', '3d', 'isometric',
-            'graph', 'plot', 'calculation', 'real-time', 'dynamic',
-            'comparison', 'overlay', 'multiple panels', 'side-by-side'
-        ]
-
-        for feature in complex_features:
+        for feature in self.COMPLEX_FEATURES:
             if feature in content_lower:
                 difficulty_score += 1
 
         # Check for canvas size (larger = more complex)
-        canvas_match = re.search(r'canvas.*?(\d{3,4})\s*[x×]\s*(\d{3,4})', content_lower)
+        canvas_match = self.CANVAS_PATTERN.search(content_lower)
         if canvas_match:
             width = int(canvas_match.group(1))
             height = int(canvas_match.group(2))
@@ -349,6 +628,31 @@ class DiagramAnalyzer:
             return 'Very Hard'
 
 
+def _parse_chapter_worker(job: Tuple[str, str, bool]) -> Tuple[List[VisualElement], str, bool]:
+    """Parse one chapter's content, capturing its output.
+
+    Runs in a worker process (or inline when not parallel).
+
+    Returns (elements, captured_output, ok) so the parent can print the
+    output in chapter order and cache only successfully parsed chapters.
+    """
+    file_path, content, verbose = job
+    file_path = Path(file_path)
+    analyzer = DiagramAnalyzer(str(file_path.parent.parent), verbose=verbose)
+    buffer = io.StringIO()
+    with contextlib.redirect_stdout(buffer), contextlib.redirect_stderr(buffer):
+        try:
+            elements = analyzer.parse_chapter_content(content, file_path)
+            ok = True
+        except Exception as e:
+            print(f"Error analyzing {file_path}: {e}")
+            if verbose:
+                import traceback
+                traceback.print_exc()
+            elements, ok = [], False
+    return elements, buffer.getvalue(), ok
+
+
 class ReportGenerator:
     """Generates reports in various formats"""
 
@@ -474,17 +778,28 @@ class ReportGenerator:
 
         return '\n'.join(lines)
 
-    def generate_csv(self, output_file: str):
-        """Generate CSV format report"""
-        with open(output_file, 'w', newline='', encoding='utf-8') as csvfile:
-            fieldnames = ['Chapter', 'Chapter Name', 'Element Title', 'Status', 'Type',
-                         'Bloom Levels', 'UI Elements', 'Difficulty', 'Learning Objective',
-                         'MicroSim Recommendations']
-            writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
+    def render_csv(self) -> str:
+        """Render the CSV format report as a string"""
+        csvfile = io.StringIO(newline='')
+        fieldnames = ['Chapter', 'Chapter Name', 'Element Title', 'Status', 'Type',
+                     'Bloom Levels', 'UI Elements', 'Difficulty', 'Learning Objective',
+                     'MicroSim Recommendations']
+        writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
 
-            writer.writeheader()
-            for element in sorted(self.elements, key=lambda e: (e.chapter_num, e.element_title)):
-                writer.writerow(element.to_dict())
+        writer.writeheader()
+        for element in sorted(self.elements, key=lambda e: (e.chapter_num, e.element_title)):
+            writer.writerow(element.to_dict())
+        return csvfile.getvalue()
+
+    def generate_csv(self, output_file: str) -> bool:
+        """Generate CSV format report
+
+        Returns:
+            True if the file was written, False if it was already up to date
+        """
+        with phase('render'):
+            content = self.render_csv()
+        return write_if_changed(Path(output_file), content)
 
     def generate_html(self) -> str:
         """Generate HTML format report"""
@@ -694,8 +1009,26 @@ def main():
         action='store_true',
         help='Enable verbose output for debugging'
     )
+    parser.add_argument(
+        '-j', '--workers',
+        type=int,
+        default=0,
+        help='Processes used to parse chapter files (0 = all cores, 1 = no pool; default: 0)'
+    )
+    parser.add_argument(
+        '--no-cache',
+        action='store_true',
+        help='Re-parse every chapter and skip the element and corpus caches'
+    )
+    parser.add_argument(
+        '--cache-file',
+        default=None,
+        help=f'Element cache location (default: <output-dir>/{CACHE_FILENAME})'
+    )
 
+    add_profile_argument(parser)
     args = parser.parse_args()
+    start_profile('diagram-report', args.profile, patterns=[DiagramAnalyzer])
 
     # Use current working directory as the base
     cwd = Path.cwd()
@@ -742,9 +1075,21 @@ def main():
 
     print(f"Analyzing chapters in: {chapters_dir}")
 
-    # Analyze chapters
-    analyzer = DiagramAnalyzer(str(chapters_dir), verbose=args.verbose)
-    analyzer.analyze_all_chapters()
+    # Load the per-chapter element cache
+    cache = None
+    if not args.no_cache:
+        cache = ElementCache(Path(args.cache_file) if args.cache_file else output_dir / CACHE_FILENAME)
+        cache.load()
+
+    # Analyze chapters, sharing parsed documents with the other book tools
+    corpus = open_corpus(chapters_dir.parent, use_cache=not args.no_cache)
+    analyzer = DiagramAnalyzer(str(chapters_dir), verbose=args.verbose, cache=cache, corpus=corpus)
+    workers = args.workers if args.workers > 0 else (os.cpu_count() or 1)
+    analyzer.analyze_all_chapters(workers=workers)
+
+    corpus.save()
+    if cache is not None:
+        cache.save()
 
     print(f"Found {len(analyzer.elements)} visual elements")
 
@@ -753,30 +1098,38 @@ def main():
 
     if args.format == 'markdown':
         # Generate table report
-        table_content = generator.generate_markdown_table()
+        with phase('render'):
+            table_content = generator.generate_markdown_table()
         table_output = output_dir / 'diagram-table.md'
-        with open(table_output, 'w', encoding='utf-8') as f:
-            f.write(table_content)
-        print(f"Table report saved to: {table_output}")
+        if write_if_changed(table_output, table_content):
+            print(f"Table report saved to: {table_output}")
+        else:
+            print(f"Table report unchanged: {table_output}")
 
         # Generate details report
-        details_content = generator.generate_markdown_details()
+        with phase('render'):
+            details_content = generator.generate_markdown_details()
         details_output = output_dir / 'diagram-details.md'
-        with open(details_output, 'w', encoding='utf-8') as f:
-            f.write(details_content)
-        print(f"Details report saved to: {details_output}")
+        if write_if_changed(details_output, details_content):
+            print(f"Details report saved to: {details_output}")
+        else:
+            print(f"Details report unchanged: {details_output}")
 
     elif args.format == 'csv':
         csv_output = output_dir / 'diagrams.csv'
-        generator.generate_csv(str(csv_output))
-        print(f"CSV report saved to: {csv_output}")
+        if generator.generate_csv(str(csv_output)):
+            print(f"CSV report saved to: {csv_output}")
+        else:
+            print(f"CSV report unchanged: {csv_output}")
 
     elif args.format == 'html':
         html_output = output_dir / 'diagrams.html'
-        content = generator.generate_html()
-        with open(html_output, 'w', encoding='utf-8') as f:
-            f.write(content)
-        print(f"HTML report saved to: {html_output}")
+        with phase('render'):
+            content = generator.generate_html()
+        if write_if_changed(html_output, content):
+            print(f"HTML report saved to: {html_output}")
+        else:
+            print(f"HTML report unchanged: {html_output}")
 
     # Print summary to console
     print("\n=== SUMMARY ===")
@@ -15,14 +15,22 @@ Usage:
 
     # Specify custom CSV path
     python generate-easy-diagrams.py --csv path/to/diagrams.csv
+
+    # Print a JSON timing summary to stderr on exit
+    python generate-easy-diagrams.py --profile
 """
 
 import csv
 import re
+import sys
 import argparse
 from pathlib import Path
 from dataclasses import dataclass
-from typing import List, Tuple, Optional
+from typing import Dict, List, Tuple, Optional
+
+# Shared profiling hooks live in src/book-metrics
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'book-metrics'))
+from tool_profile import add_profile_argument, count_read, count_write, phase, start_profile
 
 
 @dataclass
@@ -39,7 +47,11 @@ class DiagramCandidate:
 
 
 class DiagramSpecExtractor:
-    """Extracts diagram specifications from chapter markdown files"""
+    """Extracts diagram specifications from chapter markdown files
+
+    Each chapter's index.md is read and scanned once; the diagram sections it
+    contains are indexed by title, so looking up a specification is a dict hit.
+    """
 
     # Pattern to find the diagram section with details block
     DIAGRAM_SECTION_PATTERN = re.compile(
@@ -47,42 +59,72 @@ class DiagramSpecExtractor:
         re.DOTALL
     )
 
+    # MicroSim recommendations appended to the end of a specification
+    RECOMMENDATIONS_PATTERN = re.compile(
+        r'---\s*\*\*MicroSim Generator Recommendations:\*\*.*',
+        re.DOTALL
+    )
+
     def __init__(self, chapters_dir: Path):
         self.chapters_dir = chapters_dir
+        # Chapter number -> chapter directory name, built on first lookup
+        self._chapter_dirs: Optional[Dict[str, str]] = None
+        # Chapter directory -> {diagram title: details content}, or None if unreadable
+        self._chapter_specs: Dict[str, Optional[Dict[str, str]]] = {}
+
+    def find_chapter_dir(self, chapter_num: str) -> Optional[str]:
+        """Return the directory name for a chapter number (e.g. '03' -> '03-forces')"""
+        if self._chapter_dirs is None:
+            self._chapter_dirs = {}
+            with phase('walk'):
+                names = sorted(entry.name for entry in self.chapters_dir.iterdir())
+            for name in names:
+                number, dash, _ = name.partition('-')
+                if dash:
+                    self._chapter_dirs.setdefault(number, name)
+        return self._chapter_dirs.get(chapter_num)
+
+    def chapter_specs(self, chapter_dir: str) -> Optional[Dict[str, str]]:
+        """Index the diagram sections of a chapter by title, parsing the file once"""
+        if chapter_dir in self._chapter_specs:
+            return self._chapter_specs[chapter_dir]
 
-    def extract_specification(self, chapter_dir: str, element_title: str) -> Optional[str]:
-        """Extract the full specification for a diagram from the chapter file"""
         chapter_path = self.chapters_dir / chapter_dir / 'index.md'
-
+        specs = None
         if not chapter_path.exists():
             print(f"  Warning: Chapter file not found: {chapter_path}")
-            return None
+        else:
+            try:
+                with phase('read', chapter_path), open(chapter_path, 'r', encoding='utf-8') as f:
+                    content = f.read()
+                    count_read(f.tell())
+
+                # The first section with a given title wins
+                specs = {}
+                with phase('parse', chapter_path):
+                    for match in self.DIAGRAM_SECTION_PATTERN.finditer(content):
+                        specs.setdefault(match.group(1).strip(), match.group(3))
+            except Exception as e:
+                print(f"  Error reading {chapter_path}: {e}")
+                specs = None
+
+        self._chapter_specs[chapter_dir] = specs
+        return specs
 
-        try:
-            with open(chapter_path, 'r', encoding='utf-8') as f:
-                content = f.read()
-
-            # Find the matching diagram section
-            for match in self.DIAGRAM_SECTION_PATTERN.finditer(content):
-                header_title = match.group(1).strip()
-                if header_title == element_title:
-                    # Extract the details content (group 3)
-                    details_content = match.group(3)
-                    # Remove the MicroSim recommendations section
-                    spec = re.sub(
-                        r'---\s*\*\*MicroSim Generator Recommendations:\*\*.*',
-                        '',
-                        details_content,
-                        flags=re.DOTALL
-                    )
-                    return spec.strip()
+    def extract_specification(self, chapter_dir: str, element_title: str) -> Optional[str]:
+        """Extract the full specification for a diagram from the chapter file"""
+        specs = self.chapter_specs(chapter_dir)
+        if specs is None:
+            return None
 
+        details_content = specs.get(element_title)
+        if details_content is None:
+            chapter_path = self.chapters_dir / chapter_dir / 'index.md'
             print(f"  Warning: Could not find specification for '{element_title}' in {chapter_path}")
             return None
 
-        except Exception as e:
-            print(f"  Error reading {chapter_path}: {e}")
-            return None
+        # Remove the MicroSim recommendations section
+        return self.RECOMMENDATIONS_PATTERN.sub('', details_content).strip()
 
 
 class EasyDiagramGenerator:
@@ -139,14 +181,11 @@ class EasyDiagramGenerator:
 
                 # Get chapter directory name from chapter number
                 chapter_num = row['Chapter']
-                # Find the actual chapter directory
-                chapter_dirs = list(self.chapters_dir.glob(f"{chapter_num}-*"))
-                if not chapter_dirs:
+                chapter_dir = self.spec_extractor.find_chapter_dir(chapter_num)
+                if chapter_dir is None:
                     print(f"  Warning: Could not find chapter directory for chapter {chapter_num}")
                     continue
 
-                chapter_dir = chapter_dirs[0].name
-
                 # Extract specification
                 specification = self.spec_extractor.extract_specification(
                     chapter_dir,
@@ -260,6 +299,7 @@ class EasyDiagramGenerator:
 
             with open(spec_path, 'w', encoding='utf-8') as f:
                 f.write('\n'.join(content))
+                count_write(f.tell())
 
         print(f"Saved {len(self.candidates)} specification files")
 
@@ -339,8 +379,10 @@ def main():
         action='store_true',
         help='Generate report only, do not save specification files'
     )
+    add_profile_argument(parser)
 
     args = parser.parse_args()
+    start_profile('generate-easy-diagrams', args.profile)
 
     # Use current working directory as base
     cwd = Path.cwd()
@@ -373,33 +415,39 @@ def main():
 
     # Process diagrams
     generator = EasyDiagramGenerator(csv_path, chapters_dir, output_dir)
-    generator.load_candidates(min_score=args.min_score)
+    with phase('parse'):
+        generator.load_candidates(min_score=args.min_score)
 
     if len(generator.candidates) == 0:
         print("\nNo candidates found matching the criteria.")
         return 0
 
     # Generate and save report
-    report_content = generator.generate_report()
+    with phase('render'):
+        report_content = generator.generate_report()
     if not args.dry_run:
         output_dir.mkdir(parents=True, exist_ok=True)
         report_path = output_dir / 'generation-report.md'
-        with open(report_path, 'w', encoding='utf-8') as f:
+        with phase('write'), open(report_path, 'w', encoding='utf-8') as f:
             f.write(report_content)
+            count_write(f.tell())
         print(f"\nReport saved to: {report_path}")
     else:
         print("\n" + report_content)
 
     # Generate and save execution script
     if not args.dry_run:
-        execution_script = generator.generate_execution_script()
+        with phase('render'):
+            execution_script = generator.generate_execution_script()
         script_path = output_dir / 'execution-plan.md'
-        with open(script_path, 'w', encoding='utf-8') as f:
+        with phase('write'), open(script_path, 'w', encoding='utf-8') as f:
             f.write(execution_script)
+            count_write(f.tell())
         print(f"Execution plan saved to: {script_path}")
 
         # Save specification files
-        generator.save_specifications()
+        with phase('write'):
+            generator.save_specifications()
 
         print("\n" + "=" * 70)
         print("NEXT STEPS:")
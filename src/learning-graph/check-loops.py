@@ -3,16 +3,27 @@
 Check for loops (cycles) in a vis-network learning graph JSON file.
 
 This script reads a learning graph in vis-network JSON format and detects
-any cycles in the directed graph. If cycles are found, it reports the
-nodes involved in each cycle.
+any cycles in the directed graph. Cycles are grouped by strongly connected
+component (SCC); for each cyclic SCC a bounded number of simple cycles is
+reported with the nodes involved. All traversals are iterative, so very deep
+graphs never raise RecursionError.
 
 Usage:
-    python check-loops.py <path-to-learning-graph.json>
+    python check-loops.py <path-to-learning-graph.json> [--max-cycles-per-scc N] [--profile]
 """
 
+import argparse
 import json
 import sys
 from collections import defaultdict
+from pathlib import Path
+
+# Shared profiling hooks live in src/book-metrics
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'book-metrics'))
+from tool_profile import add_profile_argument, phase, start_profile
+
+# Maximum number of example cycles reported for each strongly connected component
+DEFAULT_MAX_CYCLES_PER_SCC = 10
 
 
 def load_graph(filepath):
@@ -36,56 +47,153 @@ def build_adjacency_list(edges):
     return adj
 
 
-def find_cycles(nodes, adj):
+def find_strongly_connected_components(nodes, adj):
     """
-    Find all cycles in a directed graph using DFS.
+    Find strongly connected components with an iterative Tarjan's algorithm.
 
-    Returns a list of cycles, where each cycle is a list of node IDs.
+    Uses an explicit work stack instead of recursion, so arbitrarily long
+    prerequisite chains never hit Python's recursion limit. Runs in O(V+E).
+    Edges to node IDs missing from the nodes list are ignored.
+
+    Returns a list of components, each a list of node IDs.
+    """
+    index = {}
+    lowlink = {}
+    on_stack = set()
+    scc_stack = []
+    components = []
+    counter = 0
+
+    for root in nodes:
+        if root in index:
+            continue
+
+        index[root] = lowlink[root] = counter
+        counter += 1
+        scc_stack.append(root)
+        on_stack.add(root)
+        work = [(root, iter(adj.get(root, [])))]
+
+        while work:
+            node, neighbors = work[-1]
+            for neighbor in neighbors:
+                if neighbor not in nodes:
+                    # Node exists in edges but not in nodes list
+                    continue
+                if neighbor not in index:
+                    index[neighbor] = lowlink[neighbor] = counter
+                    counter += 1
+                    scc_stack.append(neighbor)
+                    on_stack.add(neighbor)
+                    work.append((neighbor, iter(adj.get(neighbor, []))))
+                    break
+                if neighbor in on_stack:
+                    lowlink[node] = min(lowlink[node], index[neighbor])
+            else:
+                # All neighbors done: pop the node and propagate its lowlink
+                work.pop()
+                if work:
+                    parent = work[-1][0]
+                    lowlink[parent] = min(lowlink[parent], lowlink[node])
+
+                if lowlink[node] == index[node]:
+                    component = []
+                    while True:
+                        member = scc_stack.pop()
+                        on_stack.discard(member)
+                        component.append(member)
+                        if member == node:
+                            break
+                    components.append(component)
+
+    return components
+
+
+def find_cyclic_components(nodes, adj):
     """
-    WHITE = 0  # Not visited
-    GRAY = 1   # Currently in recursion stack
-    BLACK = 2  # Completely processed
+    Return the strongly connected components that contain at least one cycle.
 
-    color = {node_id: WHITE for node_id in nodes}
-    parent = {node_id: None for node_id in nodes}
-    cycles = []
+    A component is cyclic if it has more than one node or a self-loop.
+    """
+    return [
+        component for component in find_strongly_connected_components(nodes, adj)
+        if len(component) > 1 or component[0] in adj.get(component[0], [])
+    ]
 
-    def dfs(node, path):
-        color[node] = GRAY
-        path.append(node)
 
-        for neighbor in adj.get(node, []):
-            if neighbor not in color:
-                # Node exists in edges but not in nodes list
-                continue
+def find_cycles_in_component(component, adj, max_cycles=DEFAULT_MAX_CYCLES_PER_SCC):
+    """
+    Find up to max_cycles simple cycles inside one strongly connected component.
 
-            if color[neighbor] == GRAY:
+    Runs an iterative DFS restricted to the component and turns each back
+    edge into the cycle it closes on the current path.
+
+    Returns a list of cycles, where each cycle is a list of node IDs.
+    """
+    members = set(component)
+    cycles = []
+    visited = set()
+
+    for root in component:
+        if root in visited:
+            continue
+
+        visited.add(root)
+        path = [root]
+        position = {root: 0}  # nodes on the current DFS path -> index in path
+        stack = [iter(adj.get(root, []))]
+
+        while stack:
+            neighbor = next(stack[-1], None)
+            if neighbor is None:
+                stack.pop()
+                del position[path.pop()]
+            elif neighbor not in members:
+                continue
+            elif neighbor in position:
                 # Found a cycle - extract the cycle from path
-                cycle_start_idx = path.index(neighbor)
-                cycle = path[cycle_start_idx:]
-                cycles.append(cycle)
-            elif color[neighbor] == WHITE:
-                dfs(neighbor, path)
+                cycles.append(path[position[neighbor]:])
+                if len(cycles) >= max_cycles:
+                    return cycles
+            elif neighbor not in visited:
+                visited.add(neighbor)
+                position[neighbor] = len(path)
+                path.append(neighbor)
+                stack.append(iter(adj.get(neighbor, [])))
+
+    return cycles
+
 
-        path.pop()
-        color[node] = BLACK
+def find_cycles(nodes, adj, max_cycles_per_scc=DEFAULT_MAX_CYCLES_PER_SCC):
+    """
+    Find cycles in a directed graph, grouped by strongly connected component.
 
-    for node_id in nodes:
-        if color[node_id] == WHITE:
-            dfs(node_id, [])
+    Reports at most max_cycles_per_scc cycles for each cyclic component.
 
+    Returns a list of cycles, where each cycle is a list of node IDs.
+    """
+    cycles = []
+    for component in find_cyclic_components(nodes, adj):
+        cycles.extend(find_cycles_in_component(component, adj, max_cycles_per_scc))
     return cycles
 
 
 def main():
-    if len(sys.argv) < 2:
-        print("Usage: python check-loops.py <path-to-learning-graph.json>")
-        sys.exit(1)
-
-    filepath = sys.argv[1]
+    parser = argparse.ArgumentParser(description="Check a vis-network learning graph JSON file for loops")
+    parser.add_argument('filepath', help='Path to learning-graph.json')
+    parser.add_argument('--max-cycles-per-scc', type=int, default=DEFAULT_MAX_CYCLES_PER_SCC,
+                        help=f'Maximum loops reported per strongly connected component (default: {DEFAULT_MAX_CYCLES_PER_SCC})')
+    add_profile_argument(parser)
+    args = parser.parse_args()
+    if args.max_cycles_per_scc < 1:
+        parser.error('--max-cycles-per-scc must be at least 1')
+    start_profile('check-loops', args.profile)
+
+    filepath = args.filepath
 
     try:
-        nodes, edges = load_graph(filepath)
+        with phase('parse', filepath):
+            nodes, edges = load_graph(filepath)
     except FileNotFoundError:
         print(f"Error: File not found: {filepath}")
         sys.exit(1)
@@ -97,22 +205,28 @@ def main():
         print("Warning: No nodes found in the graph.")
         sys.exit(0)
 
-    adj = build_adjacency_list(edges)
-    cycles = find_cycles(nodes, adj)
+    with phase('aggregate'):
+        adj = build_adjacency_list(edges)
+        components = find_cyclic_components(nodes, adj)
 
-    if not cycles:
+    if not components:
         print(f'No Loops Found in file {filepath}.')
     else:
-        print(f"Found {len(cycles)} loop(s) in the graph:\n")
-        for i, cycle in enumerate(cycles, 1):
-            print(f"Loop {i}:")
-            cycle_labels = [f"  {node_id}: {nodes.get(node_id, 'Unknown')}" for node_id in cycle]
-            print("\n".join(cycle_labels))
-            # Show the cycle path
-            path_labels = [nodes.get(node_id, str(node_id)) for node_id in cycle]
-            path_labels.append(path_labels[0])  # Close the loop for display
-            print(f"  Path: {' -> '.join(path_labels)}")
-            print()
+        print(f"Found {len(components)} strongly connected component(s) containing loops:\n")
+        loop_number = 0
+        for c, component in enumerate(components, 1):
+            cycles = find_cycles_in_component(component, adj, args.max_cycles_per_scc)
+            print(f"Component {c}: {len(component)} node(s), showing {len(cycles)} loop(s)\n")
+            for cycle in cycles:
+                loop_number += 1
+                print(f"Loop {loop_number}:")
+                cycle_labels = [f"  {node_id}: {nodes.get(node_id, 'Unknown')}" for node_id in cycle]
+                print("\n".join(cycle_labels))
+                # Show the cycle path
+                path_labels = [nodes.get(node_id, str(node_id)) for node_id in cycle]
+                path_labels.append(path_labels[0])  # Close the loop for display
+                print(f"  Path: {' -> '.join(path_labels)}")
+                print()
         sys.exit(1)
 
 
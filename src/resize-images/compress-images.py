@@ -4,22 +4,129 @@ Image Compression Script for Web Optimization
 Compresses large images to approximately 300KB while preserving original format.
 JPEGs stay as JPEGs (better for photos), PNGs stay as PNGs (better for graphics).
 Images will not be resized below MIN_WIDTH pixels to ensure they fill the column width.
+
+Images can be compressed in parallel with a process pool (--workers N, 0 = all
+cores). Each worker can be given an address-space limit (--memory-limit MB) so
+one huge screenshot cannot exhaust memory; with a single worker the limit
+applies to the script's own process. Per-image progress is printed in the
+original order regardless of which worker finishes first.
+
+--profile prints a JSON timing summary on exit (src/book-metrics/tool_profile.py):
+decoding is reported as read, resizing and trial encodes as render, and the
+backup and final save as write. With several workers the time spent waiting
+for the pool is reported as render.
 """
 
 import os
 import sys
+import argparse
+import contextlib
+import io
+import math
+from concurrent.futures import ProcessPoolExecutor
 from PIL import Image, ImageOps
 import shutil
 from pathlib import Path
 
+# Shared profiling hooks live in src/book-metrics
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'book-metrics'))
+from tool_profile import add_profile_argument, count_write, phase, start_profile
+
+try:
+    import resource  # Unix only; used for per-worker memory limits
+except ImportError:
+    resource = None
+
 # Minimum width in pixels - images should fill the column width
 MIN_WIDTH = 800
 
+# JPEG quality range searched by the target-size solver
+SOLVER_MIN_QUALITY = 45
+SOLVER_MAX_QUALITY = 85
+
+# Maximum number of rescales the solver tries before giving up on the target
+SOLVER_MAX_SCALE_STEPS = 5
+
 def get_file_size_kb(filepath):
     """Get file size in KB"""
     return os.path.getsize(filepath) / 1024
 
-def compress_image(input_path, target_size_kb=300, min_compression=0, max_compression=9):
+def encode_image(img, is_jpeg, quality=None):
+    """Encode an image into memory and return the encoded bytes."""
+    buffer = io.BytesIO()
+    if is_jpeg:
+        img.save(buffer, "JPEG", quality=quality, optimize=True)
+    else:
+        img.save(buffer, "PNG", compress_level=9, optimize=True)
+    return buffer.getvalue()
+
+def solve_target_size(img, is_jpeg, target_size_kb, min_resize_factor):
+    """
+    Search for a scale and the highest JPEG quality that fit the target size.
+
+    Every probe is encoded into an in-memory buffer. The scale is estimated
+    from the measured size (encoded size grows roughly with pixel area), so
+    only a few rescales are needed, and each downscaled base image is reused
+    for a binary search over JPEG quality.
+
+    Args:
+        img: Source image (already orientation-corrected and mode-converted)
+        is_jpeg: True to encode JPEG, False for PNG
+        target_size_kb: Target size in KB
+        min_resize_factor: Smallest allowed scale (keeps MIN_WIDTH)
+
+    Returns:
+        Tuple of (encoded_bytes, (width, height), quality, number_of_encodes)
+    """
+    target_bytes = target_size_kb * 1024
+    floor_quality = SOLVER_MIN_QUALITY if is_jpeg else None
+    original_width, original_height = img.size
+    encodes = 0
+    scale = 1.0
+
+    # One step beyond the budget, taken only if the probes never reached the smallest scale
+    for step in range(SOLVER_MAX_SCALE_STEPS + 1):
+        if step == SOLVER_MAX_SCALE_STEPS:
+            scale = min_resize_factor
+        if scale < 1.0:
+            base = img.resize((int(original_width * scale), int(original_height * scale)),
+                              Image.Resampling.LANCZOS)
+        else:
+            base = img
+
+        # Smallest encoding at this scale decides whether the target is reachable
+        data = encode_image(base, is_jpeg, floor_quality)
+        encodes += 1
+        print(f"    Probe: scale {scale:.1%}, quality {floor_quality or 'PNG'}: {len(data) / 1024:.1f}KB")
+
+        if len(data) <= target_bytes:
+            if not is_jpeg:
+                return data, base.size, None, encodes
+
+            # Binary search for the highest quality that still fits, reusing this base
+            best_data, best_quality = data, floor_quality
+            low, high = floor_quality + 1, SOLVER_MAX_QUALITY
+            while low <= high:
+                quality = (low + high) // 2
+                candidate = encode_image(base, True, quality)
+                encodes += 1
+                if len(candidate) <= target_bytes:
+                    best_data, best_quality = candidate, quality
+                    low = quality + 1
+                else:
+                    high = quality - 1
+            return best_data, base.size, best_quality, encodes
+
+        if scale <= min_resize_factor:
+            break
+
+        # Size scales with area: shrink by the square root of the overshoot (with headroom)
+        scale = max(min_resize_factor, scale * math.sqrt(target_bytes / len(data)) * 0.95)
+
+    # Target unreachable without going below MIN_WIDTH; this is the encoding at min_resize_factor
+    return data, base.size, floor_quality, encodes
+
+def compress_image(input_path, target_size_kb=300, min_compression=0, max_compression=9, solver=False):
     """
     Compress an image to approximately the target size in KB.
     Keeps JPEGs as JPEGs and PNGs as PNGs for optimal compression.
@@ -29,6 +136,8 @@ def compress_image(input_path, target_size_kb=300, min_compression=0, max_compre
         target_size_kb: Target size in KB (default 300)
         min_compression: Minimum compression level (0=fastest)
         max_compression: Maximum compression level (9=best for PNG, 95 quality for JPEG)
+        solver: Use the search-based target-size solver with in-memory encoding
+                instead of the fixed resize/quality grid
     """
     try:
         # Determine if this is a JPEG or PNG
@@ -37,29 +146,31 @@ def compress_image(input_path, target_size_kb=300, min_compression=0, max_compre
         # Create backup
         backup_path = str(input_path) + ".backup"
         if not os.path.exists(backup_path):
-            shutil.copy2(input_path, backup_path)
+            with phase('write', backup_path):
+                shutil.copy2(input_path, backup_path)
             print(f"  Backup created: {backup_path}")
 
         # Open and optimize image
         with Image.open(input_path) as img:
-            # Apply auto-orientation based on EXIF data
-            img = ImageOps.exif_transpose(img)
-
-            # Handle color modes
-            if is_jpeg:
-                # JPEG doesn't support transparency, convert to RGB
-                if img.mode in ('RGBA', 'LA', 'P'):
-                    img = img.convert('RGB')
-                elif img.mode not in ('RGB',):
-                    img = img.convert('RGB')
-            else:
-                # PNG: preserve transparency
-                if img.mode in ('RGBA', 'LA'):
-                    pass  # Keep as-is
-                elif img.mode == 'P':
-                    img = img.convert('RGBA')
-                elif img.mode not in ('RGB', 'RGBA'):
-                    img = img.convert('RGB')
+            with phase('read', input_path):
+                # Apply auto-orientation based on EXIF data
+                img = ImageOps.exif_transpose(img)
+
+                # Handle color modes
+                if is_jpeg:
+                    # JPEG doesn't support transparency, convert to RGB
+                    if img.mode in ('RGBA', 'LA', 'P'):
+                        img = img.convert('RGB')
+                    elif img.mode not in ('RGB',):
+                        img = img.convert('RGB')
+                else:
+                    # PNG: preserve transparency
+                    if img.mode in ('RGBA', 'LA'):
+                        pass  # Keep as-is
+                    elif img.mode == 'P':
+                        img = img.convert('RGBA')
+                    elif img.mode not in ('RGB', 'RGBA'):
+                        img = img.convert('RGB')
 
             original_size = get_file_size_kb(input_path)
 
@@ -94,6 +205,24 @@ def compress_image(input_path, target_size_kb=300, min_compression=0, max_compre
 
             print(f"  Minimum width: {MIN_WIDTH}px (min resize factor: {min_resize_factor:.2f})")
 
+            if solver:
+                with phase('render', input_path):
+                    data, final_dims, quality, encodes = solve_target_size(img, is_jpeg, target_size_kb, min_resize_factor)
+                if len(data) > target_size_kb * 1024:
+                    print(f"  Warning: Could not reach target size, using smallest allowed size (min width: {MIN_WIDTH}px)")
+                with phase('write', input_path), open(input_path, 'wb') as f:
+                    f.write(data)
+                count_write(len(data))
+
+                final_size = get_file_size_kb(input_path)
+                compression_ratio = (1 - final_size / original_size) * 100
+                final_width, final_height = final_dims
+                quality_note = f", quality={quality}" if quality else ""
+                print(f"  Solver: {encodes} encodes{quality_note}")
+                print(f"  Final result: {original_size:.1f}KB → {final_size:.1f}KB ({compression_ratio:.1f}% reduction)")
+                print(f"  Dimensions: {original_width}x{original_height} → {final_width}x{final_height}")
+                return True
+
             # For JPEG, also try different quality levels
             jpeg_qualities = [85, 75, 65, 55, 45] if is_jpeg else [None]
 
@@ -102,7 +231,8 @@ def compress_image(input_path, target_size_kb=300, min_compression=0, max_compre
                 if resize_factor < 1.0:
                     new_width = int(original_width * resize_factor)
                     new_height = int(original_height * resize_factor)
-                    resized_img = img.resize((new_width, new_height), Image.Resampling.LANCZOS)
+                    with phase('render', input_path):
+                        resized_img = img.resize((new_width, new_height), Image.Resampling.LANCZOS)
                     print(f"  Trying resize: {resize_factor:.1%} ({new_width}x{new_height})")
                 else:
                     resized_img = img
@@ -113,7 +243,8 @@ def compress_image(input_path, target_size_kb=300, min_compression=0, max_compre
                 if is_jpeg:
                     # Try different JPEG quality levels at this size
                     for quality in jpeg_qualities:
-                        resized_img.save(temp_path, "JPEG", quality=quality, optimize=True)
+                        with phase('render', input_path):
+                            resized_img.save(temp_path, "JPEG", quality=quality, optimize=True)
                         temp_size = get_file_size_kb(temp_path)
 
                         if resize_factor == 1.0 or quality == jpeg_qualities[0]:
@@ -131,7 +262,8 @@ def compress_image(input_path, target_size_kb=300, min_compression=0, max_compre
                         break
                 else:
                     # PNG compression
-                    resized_img.save(temp_path, "PNG", compress_level=9, optimize=True)
+                    with phase('render', input_path):
+                        resized_img.save(temp_path, "PNG", compress_level=9, optimize=True)
                     temp_size = get_file_size_kb(temp_path)
                     print(f"    Result: {temp_size:.1f}KB")
 
@@ -150,13 +282,16 @@ def compress_image(input_path, target_size_kb=300, min_compression=0, max_compre
             if best_size == float('inf'):
                 print(f"  Warning: Could not reach target size, using smallest allowed size (min width: {MIN_WIDTH}px)")
                 fallback_factor = max(min_resize_factor, 0.2)
-                best_img = img.resize((int(original_width * fallback_factor), int(original_height * fallback_factor)), Image.Resampling.LANCZOS)
+                with phase('render', input_path):
+                    best_img = img.resize((int(original_width * fallback_factor), int(original_height * fallback_factor)), Image.Resampling.LANCZOS)
 
             # Save with best image found - keep original format
-            if is_jpeg:
-                best_img.save(input_path, "JPEG", quality=45, optimize=True)
-            else:
-                best_img.save(input_path, "PNG", compress_level=9, optimize=True)
+            with phase('write', input_path):
+                if is_jpeg:
+                    best_img.save(input_path, "JPEG", quality=45, optimize=True)
+                else:
+                    best_img.save(input_path, "PNG", compress_level=9, optimize=True)
+            count_write(os.path.getsize(input_path))
 
             final_size = get_file_size_kb(input_path)
             compression_ratio = (1 - final_size / original_size) * 100
@@ -167,10 +302,53 @@ def compress_image(input_path, target_size_kb=300, min_compression=0, max_compre
 
             return True
 
+    except MemoryError:
+        print("  ERROR: memory limit exceeded")
+        return False
     except Exception as e:
         print(f"  ERROR: {e}")
         return False
 
+def limit_memory(memory_limit_mb):
+    """Cap this process's address space (also the process pool initializer)."""
+    if memory_limit_mb and resource is not None:
+        limit = memory_limit_mb * 1024 * 1024
+        resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+
+def _compress_worker(job):
+    """Compress one image in a worker, capturing its progress output.
+
+    Returns (success, captured_output) so the parent can print it in order.
+    """
+    filepath, target_size_kb, solver = job
+    buffer = io.StringIO()
+    with contextlib.redirect_stdout(buffer):
+        success = compress_image(filepath, target_size_kb=target_size_kb, solver=solver)
+    return success, buffer.getvalue()
+
+def compress_images_parallel(images, target_size_kb=300, workers=None, memory_limit_mb=None, solver=False):
+    """Compress images in a process pool.
+
+    Args:
+        images: List of image paths
+        target_size_kb: Target size in KB for each image
+        workers: Number of worker processes (None = all cores)
+        memory_limit_mb: Optional per-worker address-space limit in MB (Unix only)
+        solver: Use the search-based target-size solver
+
+    Yields:
+        (success, captured_output) for each image, in the order given
+    """
+    if memory_limit_mb and resource is None:
+        print("⚠️  Per-worker memory limits are not supported on this platform; ignoring --memory-limit")
+
+    jobs = [(filepath, target_size_kb, solver) for filepath in images]
+    # Worker phases are not reported back; waiting for the pool counts as render
+    with phase('render'), ProcessPoolExecutor(max_workers=workers, initializer=limit_memory,
+                                              initargs=(memory_limit_mb,)) as executor:
+        # map() returns results in submission order, so progress stays ordered
+        yield from executor.map(_compress_worker, jobs)
+
 def find_large_images(root_dir, min_size_kb=500):
     """Find all images larger than min_size_kb"""
     large_images = []
@@ -187,10 +365,24 @@ def find_large_images(root_dir, min_size_kb=500):
     return sorted(large_images, key=lambda x: x[1], reverse=True)
 
 def main():
+    parser = argparse.ArgumentParser(description="Compress large images in a docs tree to ~300KB")
+    parser.add_argument('docs_dir', nargs='?', help="Starting directory (default: ./docs)")
+    parser.add_argument('-j', '--workers', type=int, default=1,
+                        help="Number of worker processes (default: 1; 0 = use all cores)")
+    parser.add_argument('--memory-limit', type=int, default=None, metavar='MB',
+                        help="Memory limit in MB for each worker process, or for this process "
+                             "with a single worker (Unix only)")
+    parser.add_argument('--solver', action='store_true',
+                        help="Binary-search scale and quality toward the target size using in-memory "
+                             "encodes instead of trying the fixed resize/quality grid")
+    add_profile_argument(parser)
+    args = parser.parse_args()
+    start_profile('compress-images', args.profile)
+
     # Determine starting directory
-    if len(sys.argv) > 1:
+    if args.docs_dir:
         # Use command line argument if provided
-        docs_dir = Path(sys.argv[1])
+        docs_dir = Path(args.docs_dir)
         print(f"📂 Using directory from command line: {docs_dir.absolute()}")
     else:
         # Check current working directory for 'docs' subdirectory
@@ -217,7 +409,8 @@ def main():
 
     # Find all large images
     print("🔍 Scanning for large images...")
-    large_images = find_large_images(docs_dir, min_size_kb=500)
+    with phase('walk'):
+        large_images = find_large_images(docs_dir, min_size_kb=500)
     
     if not large_images:
         print("✅ No large images found (>500KB)")
@@ -236,21 +429,48 @@ def main():
     print(f"\n🚀 Starting compression of {len(large_images)} images to ~300KB each...")
     
     # Compress images
+    workers = args.workers if args.workers > 0 else os.cpu_count()
     print(f"\n🔄 Compressing {len(large_images)} images...")
+    if workers > 1:
+        print(f"⚙️  Using {workers} worker processes")
     successful = 0
     failed = 0
     total_final_size = 0
-    
+
+    if workers == 1 and args.memory_limit:
+        if resource is None:
+            print("⚠️  Memory limits are not supported on this platform; ignoring --memory-limit")
+        else:
+            # No worker processes to cap, so limit this one
+            limit_memory(args.memory_limit)
+            print(f"⚙️  Memory limit: {args.memory_limit}MB")
+
+    if workers > 1:
+        results = compress_images_parallel([filepath for filepath, _ in large_images],
+                                           target_size_kb=300, workers=workers,
+                                           memory_limit_mb=args.memory_limit, solver=args.solver)
+    else:
+        results = None
+
     for i, (filepath, original_size) in enumerate(large_images, 1):
         print(f"\n[{i}/{len(large_images)}] Processing: {filepath}")
-        
-        if compress_image(filepath, target_size_kb=300):
+
+        if results is not None:
+            success, output = next(results)
+            print(output, end='')
+        else:
+            success = compress_image(filepath, target_size_kb=300, solver=args.solver)
+
+        if success:
             successful += 1
             total_final_size += get_file_size_kb(filepath)
         else:
             failed += 1
             total_final_size += original_size  # Keep original size if failed
-    
+
+    if results is not None:
+        results.close()  # Shut down the worker pool
+
     # Summary
     print(f"\n✅ Compression Complete!")
     print(f"📊 Results:")
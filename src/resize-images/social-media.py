@@ -7,91 +7,211 @@ Resizes images to 1200x630 pixels for optimal social media preview display
 
 Usage:
     python social-media.py input.jpg output.jpg [--mode MODE] [--background COLOR]
+    python social-media.py docs/sims out/social [--variants og-fit twitter-fill] [-j N]
+    python social-media.py images.txt out/social --manifest [--variants ...]
+    python social-media.py ... --profile
 
 Modes:
     - fit: Resize to fit within 1200x630, add letterboxing if needed (default)
     - fill: Resize to fill 1200x630, crop excess from center
     - stretch: Stretch to exactly 1200x630 (may distort aspect ratio)
+
+Batch mode:
+    When the input is a directory (or a manifest listing one image path per
+    line), every image is rendered into the output directory as
+    <name>_<ext>-<variant>.jpg, where a variant is <size>-<mode> (e.g.
+    logo_png-og-fit.jpg, logo_png-twitter-fill.jpg). Keeping the extension
+    stops logo.jpg and logo.png in one folder from overwriting each other. Images are spread across a process pool, and each image is
+    decoded once at the smallest resolution that still covers every
+    requested variant (JPEG draft decoding, then Image.reduce). This is
+    faster but not pixel-identical to single-file mode, which decodes at full
+    resolution: expect small per-channel differences in the output.
+
+Profiling:
+    --profile prints a JSON timing summary on exit
+    (src/book-metrics/tool_profile.py): decoding is reported as read,
+    resizing as render, and JPEG encoding and saving as write. With several
+    workers the time spent waiting for the pool is reported as render.
 """
 
 import argparse
+import math
+import os
 import sys
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 from PIL import Image, ImageOps
 
+# Shared profiling hooks live in src/book-metrics
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'book-metrics'))
+from tool_profile import add_profile_argument, count_write, phase, start_profile
+
 # Standard social media preview dimensions
 TARGET_WIDTH = 1200
 TARGET_HEIGHT = 630
 
+# Named output sizes for batch variants
+VARIANT_SIZES = {
+    'og': (TARGET_WIDTH, TARGET_HEIGHT),  # Open Graph, LinkedIn, Facebook
+    'twitter': (1200, 600),               # Twitter summary_large_image (2:1)
+}
+
+RESIZE_MODES = ('fit', 'fill', 'stretch')
 
-def resize_fit(img: Image.Image, bg_color: str = 'white') -> Image.Image:
+IMAGE_EXTENSIONS = {'.jpg', '.jpeg', '.png', '.webp', '.gif', '.bmp', '.tif', '.tiff'}
+
+
+def resize_fit(img: Image.Image, bg_color: str = 'white',
+               size: tuple = (TARGET_WIDTH, TARGET_HEIGHT)) -> Image.Image:
     """
-    Resize image to fit within 1200x630, adding letterboxing/pillarboxing if needed.
+    Resize image to fit within size (default 1200x630), adding letterboxing/pillarboxing if needed.
     Maintains aspect ratio without cropping.
     """
+    target_width, target_height = size
+
     # Calculate the aspect ratios
     img_aspect = img.width / img.height
-    target_aspect = TARGET_WIDTH / TARGET_HEIGHT
+    target_aspect = target_width / target_height
 
     # Determine scaling factor
     if img_aspect > target_aspect:
         # Image is wider than target - fit to width
-        new_width = TARGET_WIDTH
-        new_height = int(TARGET_WIDTH / img_aspect)
+        new_width = target_width
+        new_height = int(target_width / img_aspect)
     else:
         # Image is taller than target - fit to height
-        new_height = TARGET_HEIGHT
-        new_width = int(TARGET_HEIGHT * img_aspect)
+        new_height = target_height
+        new_width = int(target_height * img_aspect)
 
     # Resize the image
     resized = img.resize((new_width, new_height), Image.Resampling.LANCZOS)
 
     # Create new image with target dimensions and paste resized image centered
-    result = Image.new('RGB', (TARGET_WIDTH, TARGET_HEIGHT), bg_color)
-    x_offset = (TARGET_WIDTH - new_width) // 2
-    y_offset = (TARGET_HEIGHT - new_height) // 2
+    result = Image.new('RGB', (target_width, target_height), bg_color)
+    x_offset = (target_width - new_width) // 2
+    y_offset = (target_height - new_height) // 2
     result.paste(resized, (x_offset, y_offset))
 
     return result
 
 
-def resize_fill(img: Image.Image) -> Image.Image:
+def resize_fill(img: Image.Image,
+                size: tuple = (TARGET_WIDTH, TARGET_HEIGHT)) -> Image.Image:
     """
-    Resize image to fill 1200x630, cropping excess from center.
+    Resize image to fill size (default 1200x630), cropping excess from center.
     Maintains aspect ratio with center cropping.
     """
+    target_width, target_height = size
+
     # Calculate the aspect ratios
     img_aspect = img.width / img.height
-    target_aspect = TARGET_WIDTH / TARGET_HEIGHT
+    target_aspect = target_width / target_height
 
     # Determine scaling factor
     if img_aspect > target_aspect:
         # Image is wider - scale to height and crop width
-        new_height = TARGET_HEIGHT
-        new_width = int(TARGET_HEIGHT * img_aspect)
+        new_height = target_height
+        new_width = int(target_height * img_aspect)
     else:
         # Image is taller - scale to width and crop height
-        new_width = TARGET_WIDTH
-        new_height = int(TARGET_WIDTH / img_aspect)
+        new_width = target_width
+        new_height = int(target_width / img_aspect)
 
     # Resize the image
     resized = img.resize((new_width, new_height), Image.Resampling.LANCZOS)
 
     # Crop from center
-    left = (new_width - TARGET_WIDTH) // 2
-    top = (new_height - TARGET_HEIGHT) // 2
-    right = left + TARGET_WIDTH
-    bottom = top + TARGET_HEIGHT
+    left = (new_width - target_width) // 2
+    top = (new_height - target_height) // 2
+    right = left + target_width
+    bottom = top + target_height
 
     return resized.crop((left, top, right, bottom))
 
 
-def resize_stretch(img: Image.Image) -> Image.Image:
+def resize_stretch(img: Image.Image,
+                   size: tuple = (TARGET_WIDTH, TARGET_HEIGHT)) -> Image.Image:
     """
-    Stretch image to exactly 1200x630.
+    Stretch image to exactly size (default 1200x630).
     May distort aspect ratio but no cropping or letterboxing.
     """
-    return img.resize((TARGET_WIDTH, TARGET_HEIGHT), Image.Resampling.LANCZOS)
+    return img.resize(size, Image.Resampling.LANCZOS)
+
+
+def parse_variant(spec: str) -> tuple:
+    """
+    Parse a variant spec such as 'og-fit' or 'twitter-fill'.
+
+    Returns:
+        Tuple of (size_name, mode)
+
+    Raises:
+        ValueError: If the size name or mode is unknown
+    """
+    size_name, sep, mode = spec.partition('-')
+    if not sep or size_name not in VARIANT_SIZES or mode not in RESIZE_MODES:
+        raise ValueError(
+            f"invalid variant '{spec}' (expected <size>-<mode> with size in "
+            f"{', '.join(VARIANT_SIZES)} and mode in {', '.join(RESIZE_MODES)})")
+    return size_name, mode
+
+
+def required_source_size(width: int, height: int, variants: list) -> tuple:
+    """
+    Smallest source dimensions that still cover every requested variant.
+
+    Fit scales by the smaller ratio; fill and stretch need both axes covered,
+    so they scale by the larger one. Sources are never upscaled here.
+    """
+    scale = 0.0
+    for mode, (target_w, target_h) in variants:
+        ratios = (target_w / width, target_h / height)
+        scale = max(scale, min(ratios) if mode == 'fit' else max(ratios))
+    scale = min(scale, 1.0)
+    return max(1, math.ceil(width * scale)), max(1, math.ceil(height * scale))
+
+
+def reduce_for_variants(img: Image.Image, variants: list) -> Image.Image:
+    """
+    Decode an opened image at the lowest resolution that covers all variants.
+
+    JPEGs are decoded with draft() so libjpeg scales by 1/2, 1/4 or 1/8 during
+    decoding; any remaining integer factor is removed with Image.reduce()
+    before the final LANCZOS resize. Must be called before the image is loaded.
+
+    Args:
+        img: Freshly opened (not yet loaded) image
+        variants: List of (mode, (width, height)) tuples
+
+    Returns:
+        Loaded image in RGB or L mode
+    """
+    needed = required_source_size(img.width, img.height, variants)
+    if img.format == 'JPEG':
+        img.draft(None, needed)
+
+    factor = min(img.width // needed[0], img.height // needed[1])
+    if factor >= 2:
+        # Palette, bilevel and 16-bit modes cannot be reduced directly
+        if img.mode in ('P', '1') or img.mode.startswith('I;'):
+            img = img.convert('RGB')
+        img = img.reduce(factor)
+
+    # Convert to RGB if necessary (handles RGBA, P, L, etc.)
+    if img.mode not in ('RGB', 'L'):
+        img = img.convert('RGB')
+    img.load()
+    return img
+
+
+def render_variant(img: Image.Image, mode: str, size: tuple,
+                   bg_color: str = 'white') -> Image.Image:
+    """Apply one resize mode at the given output size."""
+    if mode == 'fit':
+        return resize_fit(img, bg_color, size)
+    if mode == 'fill':
+        return resize_fill(img, size)
+    return resize_stretch(img, size)
 
 
 def process_image(input_path: str, output_path: str, mode: str = 'fit',
@@ -110,8 +230,10 @@ def process_image(input_path: str, output_path: str, mode: str = 'fit',
         True if successful, False otherwise
     """
     try:
-        # Open the image
-        img = Image.open(input_path)
+        # Open and decode the image
+        with phase('read', input_path):
+            img = Image.open(input_path)
+            img.load()
 
         if verbose:
             print(f"Input: {input_path}")
@@ -119,6 +241,11 @@ def process_image(input_path: str, output_path: str, mode: str = 'fit',
             print(f"  Format: {img.format}")
             print(f"  Mode: {img.mode}")
 
+        if mode not in RESIZE_MODES:
+            print(f"Error: Unknown mode '{mode}'", file=sys.stderr)
+            return False
+
+        # Full-resolution decode; reduced decoding is only used in batch mode
         # Convert to RGB if necessary (handles RGBA, P, L, etc.)
         if img.mode not in ('RGB', 'L'):
             if verbose:
@@ -126,22 +253,17 @@ def process_image(input_path: str, output_path: str, mode: str = 'fit',
             img = img.convert('RGB')
 
         # Apply resize mode
-        if mode == 'fit':
-            result = resize_fit(img, bg_color)
-        elif mode == 'fill':
-            result = resize_fill(img)
-        elif mode == 'stretch':
-            result = resize_stretch(img)
-        else:
-            print(f"Error: Unknown mode '{mode}'", file=sys.stderr)
-            return False
+        with phase('render', input_path):
+            result = render_variant(img, mode, (TARGET_WIDTH, TARGET_HEIGHT), bg_color)
 
         # Ensure output directory exists
         output_dir = Path(output_path).parent
         output_dir.mkdir(parents=True, exist_ok=True)
 
         # Save the result
-        result.save(output_path, 'JPEG', quality=95, optimize=True)
+        with phase('write', output_path):
+            result.save(output_path, 'JPEG', quality=95, optimize=True)
+        count_write(os.path.getsize(output_path))
 
         if verbose:
             print(f"Output: {output_path}")
@@ -161,6 +283,131 @@ def process_image(input_path: str, output_path: str, mode: str = 'fit',
         return False
 
 
+def collect_batch_inputs(source: str, manifest: bool = False,
+                         exclude: Path = None) -> list:
+    """
+    Gather the images for batch mode.
+
+    Args:
+        source: Directory to search recursively, or a manifest file
+        manifest: Treat source as a manifest with one image path per line
+            (blank lines and lines starting with '#' are ignored; relative
+            paths are resolved against the manifest's directory)
+        exclude: Directory whose contents are skipped (the output directory)
+
+    Returns:
+        List of (image_path, relative_path) tuples; relative_path decides
+        where the outputs are written under the output directory
+    """
+    source = Path(source)
+    items = []
+    if manifest:
+        base = source.parent
+        with open(source, 'r', encoding='utf-8') as f:
+            for line in f:
+                line = line.strip()
+                if not line or line.startswith('#'):
+                    continue
+                path = Path(line)
+                if not path.is_absolute():
+                    items.append((base / path, path))
+                else:
+                    items.append((path, Path(path.name)))
+        return items
+
+    exclude = exclude.resolve() if exclude else None
+    for path in sorted(source.rglob('*')):
+        if path.suffix.lower() not in IMAGE_EXTENSIONS or not path.is_file():
+            continue
+        if exclude and exclude in path.resolve().parents:
+            continue
+        items.append((path, path.relative_to(source)))
+    return items
+
+
+def _render_batch_item(job: tuple) -> tuple:
+    """
+    Worker entry point: decode one image once and save every variant.
+
+    Returns:
+        Tuple of (input_path, saved_paths, error_message)
+    """
+    input_path, outputs, bg_color = job
+    saved = []
+    try:
+        with Image.open(input_path) as img:
+            variants = [(mode, VARIANT_SIZES[size_name])
+                        for (size_name, mode), _ in outputs]
+            with phase('read', input_path):
+                img = reduce_for_variants(img, variants)
+            for ((size_name, mode), output_path) in outputs:
+                with phase('render', input_path):
+                    result = render_variant(img, mode, VARIANT_SIZES[size_name], bg_color)
+                Path(output_path).parent.mkdir(parents=True, exist_ok=True)
+                with phase('write', output_path):
+                    result.save(output_path, 'JPEG', quality=95, optimize=True)
+                count_write(os.path.getsize(output_path))
+                saved.append(output_path)
+    except Exception as e:
+        return input_path, saved, str(e)
+    return input_path, saved, None
+
+
+def plan_batch_outputs(items: list, output_dir: str, variants: list) -> list:
+    """
+    Name the output files of every image in a batch.
+
+    Args:
+        items: List of (image_path, relative_path) from collect_batch_inputs
+        output_dir: Directory that receives <name>_<ext>-<variant>.jpg files
+        variants: List of (size_name, mode) tuples
+
+    Returns:
+        List of (image_path, [((size_name, mode), output_path), ...])
+
+    Raises:
+        ValueError: If two inputs would write the same file, e.g. a manifest
+            that lists one image twice or two absolute paths with the same name
+    """
+    output_dir = Path(output_dir)
+    planned = []
+    writers = {}
+    for input_path, rel in items:
+        name = f"{rel.stem}_{rel.suffix.lstrip('.')}" if rel.suffix else rel.stem
+        outputs = []
+        for size_name, mode in variants:
+            output_path = str(output_dir / rel.parent / f"{name}-{size_name}-{mode}.jpg")
+            other = writers.setdefault(output_path, input_path)
+            if other is not input_path:
+                raise ValueError(f"{input_path} and {other} would both write {output_path}")
+            outputs.append(((size_name, mode), output_path))
+        planned.append((input_path, outputs))
+    return planned
+
+
+def process_batch(planned: list, bg_color: str = 'white', workers: int = None):
+    """
+    Render every variant of every image, spread across a process pool.
+
+    Args:
+        planned: List of (image_path, outputs) from plan_batch_outputs
+        bg_color: Background color for 'fit' variants
+        workers: Number of worker processes (None = all cores, 1 = in-process)
+
+    Yields:
+        Tuple of (input_path, saved_paths, error_message) in input order
+    """
+    jobs = [(str(input_path), outputs, bg_color) for input_path, outputs in planned]
+
+    if workers == 1:
+        yield from map(_render_batch_item, jobs)
+        return
+
+    # Worker phases are not reported back; waiting for the pool counts as render
+    with phase('render'), ProcessPoolExecutor(max_workers=workers) as executor:
+        yield from executor.map(_render_batch_item, jobs, chunksize=4)
+
+
 def main():
     parser = argparse.ArgumentParser(
         description='Resize images to 1200x630 for social media previews',
@@ -178,20 +425,26 @@ Examples:
 
   # Custom background color for letterboxing
   python social-media.py input.jpg output.jpg --background "#1a73e8"
+
+  # Batch: Open Graph and Twitter cards for every image under docs/sims
+  python social-media.py docs/sims social --variants og-fit twitter-fill
+
+  # Batch from a manifest (one image path per line), 4 workers
+  python social-media.py images.txt social --manifest -j 4
         """
     )
 
     parser.add_argument(
         'input',
-        help='Input image path'
+        help='Input image path, or a directory/manifest for batch mode'
     )
     parser.add_argument(
         'output',
-        help='Output image path'
+        help='Output image path, or output directory in batch mode'
     )
     parser.add_argument(
         '-m', '--mode',
-        choices=['fit', 'fill', 'stretch'],
+        choices=list(RESIZE_MODES),
         default='fit',
         help='Resize mode: fit (letterbox), fill (crop), stretch (distort). Default: fit'
     )
@@ -205,20 +458,86 @@ Examples:
         action='store_true',
         help='Print detailed information'
     )
+    parser.add_argument(
+        '--manifest',
+        action='store_true',
+        help='Treat input as a manifest file listing one image path per line (batch mode)'
+    )
+    parser.add_argument(
+        '--variants',
+        nargs='+',
+        metavar='SIZE-MODE',
+        help=f"Batch variants to emit per image, e.g. og-fit twitter-fill. "
+             f"Sizes: {', '.join(f'{k} ({w}x{h})' for k, (w, h) in VARIANT_SIZES.items())}. "
+             f"Default: og-<mode>"
+    )
+    parser.add_argument(
+        '-j', '--workers',
+        type=int,
+        default=0,
+        help='Worker processes for batch mode (0 = all cores). Default: 0'
+    )
 
+    add_profile_argument(parser)
     args = parser.parse_args()
+    start_profile('social-media', args.profile)
 
-    # Process the image
-    success = process_image(
-        args.input,
-        args.output,
-        args.mode,
-        args.background,
-        args.verbose
-    )
+    batch = args.manifest or Path(args.input).is_dir()
+    if not batch:
+        if args.variants:
+            parser.error('--variants requires a directory or --manifest input')
+
+        # Process the image
+        success = process_image(
+            args.input,
+            args.output,
+            args.mode,
+            args.background,
+            args.verbose
+        )
+
+        # Exit with appropriate code
+        sys.exit(0 if success else 1)
+
+    try:
+        variants = [parse_variant(spec) for spec in (args.variants or [f"og-{args.mode}"])]
+    except ValueError as e:
+        parser.error(str(e))
+
+    try:
+        with phase('walk'):
+            items = collect_batch_inputs(args.input, args.manifest, exclude=Path(args.output))
+    except OSError as e:
+        print(f"Error reading batch input: {e}", file=sys.stderr)
+        sys.exit(1)
+    if not items:
+        print(f"No images found in {args.input}")
+        sys.exit(0)
+    try:
+        planned = plan_batch_outputs(items, args.output, variants)
+    except ValueError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+
+    workers = args.workers if args.workers > 0 else os.cpu_count()
+    print(f"Rendering {len(variants)} variant(s) for {len(items)} image(s) "
+          f"with {workers} worker(s)")
+
+    failures = 0
+    for input_path, saved, error in process_batch(planned, args.background, workers):
+        if error:
+            failures += 1
+            print(f"Error processing {input_path}: {error}", file=sys.stderr)
+            continue
+        if args.verbose:
+            print(f"{input_path}")
+            for output_path in saved:
+                print(f"  Saved: {output_path}")
+        else:
+            print(f"Saved: {len(saved)} variant(s) for {input_path}")
 
-    # Exit with appropriate code
-    sys.exit(0 if success else 1)
+    print(f"Done: {len(items) - failures} succeeded, {failures} failed")
+    sys.exit(0 if failures == 0 else 1)
 
 
 if __name__ == '__main__':
@@ -1,19 +1,67 @@
 #!/usr/bin/env python3
-"""Analyze skill usage logs to identify patterns, performance metrics, and token usage."""
+"""Analyze skill usage logs to identify patterns, performance metrics, and token usage.
 
+Logs are streamed line by line rather than loaded into memory. Prompts are
+indexed per session as sorted epoch arrays and skill start events per
+(session, skill), so each skill completion is matched with a bisect. Months of
+activity logs are processed in near-linear time with memory bounded by the
+number of sessions and distinct prompts.
+"""
+
+import heapq
 import json
+import os
+import sqlite3
+from bisect import bisect_right
 from collections import Counter, defaultdict
 from datetime import datetime
 from pathlib import Path
 import sys
 from io import StringIO
 
-def load_jsonl(filepath):
-    """Load JSONL file into list of dicts."""
+# Shared profiling hooks live in src/book-metrics
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'book-metrics'))
+from tool_profile import add_profile_argument, count_write, phase, start_profile
+
+# Prompts are only ever shown truncated, so the index keeps this many characters
+PROMPT_SNIPPET_LENGTH = 100
+
+# Number of rows in the "Recent Skill Usage" and "Session Activity Timeline" tables
+RECENT_SKILL_LIMIT = 20
+RECENT_PROMPT_LIMIT = 15
+
+# Default rollup database name, stored next to the activity logs
+ROLLUP_DB_NAME = "skill-usage-rollup.sqlite"
+
+def iter_jsonl(filepath):
+    """Yield one dict per non-blank line of a JSONL file, without loading the whole file."""
+    filepath = Path(filepath)
     if not filepath.exists():
-        return []
+        return
     with open(filepath) as f:
-        return [json.loads(line) for line in f if line.strip()]
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+def log_files(log_dir):
+    """Return the (prompt files, skill-usage files) both report modes read from log_dir.
+
+    Only the current prompts.jsonl and skill-usage.jsonl are read, so the
+    plain report and the rollup store always cover the same records.
+    """
+    log_dir = Path(log_dir)
+    prompt_files = [f for f in (log_dir / "prompts.jsonl",) if f.exists()]
+    skill_files = [f for f in (log_dir / "skill-usage.jsonl",) if f.exists()]
+    return prompt_files, skill_files
+
+def iter_log_records(files):
+    """Yield the records of several JSONL files in order."""
+    for filepath in files:
+        yield from iter_jsonl(filepath)
+
+def load_jsonl(filepath):
+    """Load JSONL file into list of dicts."""
+    return list(iter_jsonl(filepath))
 
 def format_duration(seconds):
     """Format duration in human-readable format."""
@@ -42,78 +90,115 @@ def format_tokens(count):
         return f"{count/1_000:.1f}K"
     return str(count)
 
-def correlate_prompts_with_skills(prompts, skill_events):
-    """Match user prompts with skill invocations by session ID and timestamp."""
-    # Index prompts by session and epoch for better matching
-    prompts_by_session = defaultdict(list)
-    for prompt in prompts:
-        prompts_by_session[prompt['session']].append({
-            'epoch': int(prompt['epoch']),
-            'prompt': prompt['prompt'],
-            'timestamp': prompt['timestamp']
-        })
-
-    # Sort prompts by epoch within each session
-    for session in prompts_by_session:
-        prompts_by_session[session].sort(key=lambda x: x['epoch'])
+def build_prompt_index(prompts, snippet_length=None):
+    """Index prompts by session as parallel arrays sorted by epoch.
 
-    # Build a map of start events to calculate duration
-    start_events = {}
+    Returns a dict mapping session -> (epochs, prompts, timestamps). If
+    snippet_length is given, prompt text is truncated to save memory.
+    """
+    by_session = defaultdict(list)
+    for prompt in prompts:
+        text = prompt['prompt']
+        if snippet_length is not None:
+            text = text[:snippet_length]
+        by_session[prompt['session']].append((int(prompt['epoch']), text, prompt['timestamp']))
+
+    index = {}
+    for session, entries in by_session.items():
+        # Stable sort keeps log order for prompts with the same epoch
+        entries.sort(key=lambda x: x[0])
+        index[session] = (
+            [e[0] for e in entries],
+            [e[1] for e in entries],
+            [e[2] for e in entries],
+        )
+    return index
+
+def build_start_index(skill_events):
+    """Index skill start epochs by (session, skill), sorted ascending."""
+    starts = defaultdict(set)
     for event in skill_events:
         if event['event'] == 'start':
-            key = f"{event['session']}-{event['skill']}-{event['epoch']}"
-            start_events[key] = int(event['epoch'])
+            starts[(event['session'], event['skill'])].add(int(event['epoch']))
+    return {key: sorted(epochs) for key, epochs in starts.items()}
+
+def correlate_end_event(event, find_prompt, find_start):
+    """Build the correlated record for one skill 'end' event.
+
+    find_prompt(session, epoch) returns (prompt_epoch, prompt) for the most
+    recent prompt at or before epoch, or None. find_start(session, skill,
+    epoch) returns the most recent start epoch at or before epoch, or None.
+    """
+    session = event['session']
+    skill_epoch = int(event['epoch'])
+
+    # Find the most recent prompt before this skill event
+    best_prompt = "Unknown prompt"
+    prompt_epoch = None
+    match = find_prompt(session, skill_epoch)
+    if match is not None:
+        prompt_epoch, best_prompt = match
+
+    # Get duration from the event, or calculate from start event
+    duration = event.get('duration_seconds', 'unknown')
+    if duration == 'unknown' or duration == '0' or duration == 0:
+        start_epoch = find_start(session, event['skill'], skill_epoch)
+        if start_epoch is not None:
+            duration = skill_epoch - start_epoch
+
+    # Calculate time from prompt to skill completion
+    prompt_to_completion = None
+    if prompt_epoch:
+        prompt_to_completion = skill_epoch - prompt_epoch
+
+    return {
+        'skill': event['skill'],
+        'prompt': best_prompt,
+        'duration': duration,
+        'prompt_to_completion': prompt_to_completion,
+        'timestamp': event['timestamp'],
+        'epoch': skill_epoch,
+        'session': session,
+        'input_tokens': event.get('input_tokens'),
+        'output_tokens': event.get('output_tokens'),
+        'total_tokens': event.get('total_tokens'),
+        'cache_read_tokens': event.get('cache_read_tokens'),
+        'cache_creation_tokens': event.get('cache_creation_tokens')
+    }
+
+def iter_correlated(prompt_index, start_index, skill_events):
+    """Yield one correlated record per skill 'end' event.
+
+    Each completion is matched to the most recent prompt at or before it in
+    the same session, and (when the log has no duration) to the most recent
+    start of the same skill in that session. Both lookups are bisects.
+    """
+    def find_prompt(session, epoch):
+        if session in prompt_index:
+            epochs, texts, _ = prompt_index[session]
+            i = bisect_right(epochs, epoch) - 1
+            if i >= 0:
+                return epochs[i], texts[i]
+        return None
+
+    def find_start(session, skill, epoch):
+        start_epochs = start_index.get((session, skill))
+        if start_epochs:
+            i = bisect_right(start_epochs, epoch) - 1
+            if i >= 0:
+                return start_epochs[i]
+        return None
 
-    # Correlate skill events with nearest preceding prompt
-    correlated = []
     for event in skill_events:
-        if event['event'] != 'end':
-            continue
-
-        session = event['session']
-        skill_epoch = int(event['epoch'])
-
-        # Find the most recent prompt before this skill event
-        best_prompt = "Unknown prompt"
-        prompt_epoch = None
-        session_prompts = prompts_by_session.get(session, [])
-        for p in reversed(session_prompts):
-            if p['epoch'] <= skill_epoch:
-                best_prompt = p['prompt']
-                prompt_epoch = p['epoch']
-                break
-
-        # Get duration from the event, or calculate from start event
-        duration = event.get('duration_seconds', 'unknown')
-        if duration == 'unknown' or duration == '0' or duration == 0:
-            # Try to find matching start event
-            for key, start_epoch in start_events.items():
-                if key.startswith(f"{session}-{event['skill']}-"):
-                    if start_epoch <= skill_epoch:
-                        duration = skill_epoch - start_epoch
-                        break
-
-        # Calculate time from prompt to skill completion
-        prompt_to_completion = None
-        if prompt_epoch:
-            prompt_to_completion = skill_epoch - prompt_epoch
-
-        correlated.append({
-            'skill': event['skill'],
-            'prompt': best_prompt,
-            'duration': duration,
-            'prompt_to_completion': prompt_to_completion,
-            'timestamp': event['timestamp'],
-            'epoch': skill_epoch,
-            'session': session,
-            'input_tokens': event.get('input_tokens'),
-            'output_tokens': event.get('output_tokens'),
-            'total_tokens': event.get('total_tokens'),
-            'cache_read_tokens': event.get('cache_read_tokens'),
-            'cache_creation_tokens': event.get('cache_creation_tokens')
-        })
+        if event['event'] == 'end':
+            yield correlate_end_event(event, find_prompt, find_start)
 
-    return correlated
+def correlate_prompts_with_skills(prompts, skill_events):
+    """Match user prompts with skill invocations by session ID and timestamp."""
+    skill_events = list(skill_events)
+    prompt_index = build_prompt_index(prompts)
+    start_index = build_start_index(skill_events)
+    return list(iter_correlated(prompt_index, start_index, skill_events))
 
 
 def analyze_prompt_timing(prompts):
@@ -140,37 +225,140 @@ def analyze_prompt_timing(prompts):
 
     return timing_data
 
+def recent_prompt_timing(prompts, limit=RECENT_PROMPT_LIMIT):
+    """Return the last `limit` entries of analyze_prompt_timing using bounded memory.
+
+    Keeps only the latest limit+1 prompts (by epoch, ties in log order) in a heap.
+    """
+    latest = heapq.nlargest(
+        limit + 1,
+        ((int(p['epoch']), seq, p) for seq, p in enumerate(prompts)),
+        key=lambda x: (x[0], x[1])
+    )
+    latest.reverse()
+    return analyze_prompt_timing([p for _, _, p in latest])
+
+def token_count(value):
+    """Return a logged token count as an int, or 0 when missing/null."""
+    if value and value != 'null':
+        return int(value)
+    return 0
+
+def _new_skill_totals():
+    """Return an empty per-skill token/timing accumulator."""
+    return {
+        'input': 0, 'output': 0, 'total': 0,
+        'cache_read': 0, 'cache_creation': 0, 'count': 0,
+        'total_time': 0, 'time_count': 0
+    }
+
+def summarize_skill_usage(correlated, recent_limit=RECENT_SKILL_LIMIT):
+    """Fold correlated skill records into the aggregates the report needs.
+
+    Consumes any iterable (including a generator) in a single pass and keeps
+    only counters plus the `recent_limit` most recent records.
+    """
+    summary = {
+        'invocations': 0,
+        'skill_counts': Counter(),
+        'skill_tokens': defaultdict(_new_skill_totals),
+        'total_tokens': 0,
+        'total_cache_read': 0,
+        'total_cache_creation': 0,
+        'total_time': 0,
+        'timed_count': 0,
+        'prompt_counts': Counter(),
+        'recent': [],
+    }
+    skill_tokens = summary['skill_tokens']
+    recent_heap = []
+
+    for seq, entry in enumerate(correlated):
+        skill = entry['skill']
+        summary['invocations'] += 1
+        summary['skill_counts'][skill] += 1
+        skill_tokens[skill]['count'] += 1
+
+        tokens = token_count(entry.get('total_tokens'))
+        skill_tokens[skill]['total'] += tokens
+        summary['total_tokens'] += tokens
+
+        skill_tokens[skill]['input'] += token_count(entry.get('input_tokens'))
+        skill_tokens[skill]['output'] += token_count(entry.get('output_tokens'))
+
+        cache_read = token_count(entry.get('cache_read_tokens'))
+        skill_tokens[skill]['cache_read'] += cache_read
+        summary['total_cache_read'] += cache_read
+
+        cache_create = token_count(entry.get('cache_creation_tokens'))
+        skill_tokens[skill]['cache_creation'] += cache_create
+        summary['total_cache_creation'] += cache_create
+
+        # Track timing from prompt to completion
+        summary['total_time'] += entry.get('prompt_to_completion', 0) or 0
+        if entry.get('prompt_to_completion') and entry['prompt_to_completion'] > 0:
+            skill_tokens[skill]['total_time'] += entry['prompt_to_completion']
+            skill_tokens[skill]['time_count'] += 1
+            summary['timed_count'] += 1
+
+        if entry['prompt'] != "Unknown prompt":
+            summary['prompt_counts'][entry['prompt'][:100]] += 1
+
+        # Keep the most recent records; earlier log lines win timestamp ties
+        item = (entry['timestamp'], -seq, entry)
+        if len(recent_heap) < recent_limit:
+            heapq.heappush(recent_heap, item)
+        elif item > recent_heap[0]:
+            heapq.heapreplace(recent_heap, item)
+
+    summary['recent'] = [entry for _, _, entry in sorted(recent_heap, reverse=True)]
+    return summary
+
 def generate_report(log_dir, project_dir=None):
     """Generate skill usage report and return as string."""
     log_dir = Path(log_dir)
+    prompt_files, skill_files = log_files(log_dir)
+
+    if next(iter_log_records(skill_files), None) is None:
+        output = StringIO()
+        output.write("No skill usage data found yet.\n")
+        output.write(f"Logs will be created in: {log_dir}\n")
+        output.write("\nUse skills in Claude Code and they'll be tracked automatically.\n")
+        return output.getvalue(), False
+
+    # Stream the logs: index prompts and start events, then fold completions
+    with phase('aggregate'):
+        prompt_index = build_prompt_index(iter_log_records(prompt_files), PROMPT_SNIPPET_LENGTH)
+        start_index = build_start_index(iter_log_records(skill_files))
+        summary = summarize_skill_usage(iter_correlated(prompt_index, start_index, iter_log_records(skill_files)))
+        prompt_timing = recent_prompt_timing(iter_log_records(prompt_files))
+
+    with phase('render'):
+        return render_report(summary, prompt_timing, log_dir, project_dir), True
+
+def render_report(summary, prompt_timing, log_dir, project_dir=None):
+    """Render the markdown report from a summary built by summarize_skill_usage."""
     output = StringIO()
 
     def write(text=""):
         output.write(text + "\n")
 
-    # Load logs
-    prompts = load_jsonl(log_dir / "prompts.jsonl")
-    skill_events = load_jsonl(log_dir / "skill-usage.jsonl")
-
-    if not skill_events:
-        write("No skill usage data found yet.")
-        write(f"Logs will be created in: {log_dir}")
-        write("\nUse skills in Claude Code and they'll be tracked automatically.")
-        return output.getvalue(), False
-
-    # Correlate prompts with skills
-    correlated = correlate_prompts_with_skills(prompts, skill_events)
+    skill_counts = summary['skill_counts']
+    skill_tokens = summary['skill_tokens']
+    total_tokens_all = summary['total_tokens']
+    total_cache_read = summary['total_cache_read']
+    total_cache_creation = summary['total_cache_creation']
+    invocations = summary['invocations']
 
     write("# Skill Usage Report")
     write()
     write(f"**Project:** {project_dir.name if project_dir else 'Unknown'}<br/>")
     write(f"**Log directory:** `{log_dir}`<br/>")
-    write(f"**Total skill invocations:** {len(correlated)}<br/>")
+    write(f"**Total skill invocations:** {invocations}<br/>")
     write(f"**Report generated:** {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
     write()
 
     # Skill frequency analysis
-    skill_counts = Counter(entry['skill'] for entry in correlated)
     write("## Skill Usage Summary")
     write()
     for skill, count in skill_counts.most_common():
@@ -180,46 +368,6 @@ def generate_report(log_dir, project_dir=None):
     write()
     write("## Token Usage by Skill")
     write()
-    skill_tokens = defaultdict(lambda: {
-        'input': 0, 'output': 0, 'total': 0,
-        'cache_read': 0, 'cache_creation': 0, 'count': 0,
-        'total_time': 0, 'time_count': 0
-    })
-
-    total_tokens_all = 0
-    total_cache_read = 0
-    total_cache_creation = 0
-
-    for entry in correlated:
-        skill = entry['skill']
-        skill_tokens[skill]['count'] += 1
-
-        if entry.get('total_tokens') and entry['total_tokens'] != 'null':
-            tokens = int(entry['total_tokens'])
-            skill_tokens[skill]['total'] += tokens
-            total_tokens_all += tokens
-
-        if entry.get('input_tokens') and entry['input_tokens'] != 'null':
-            skill_tokens[skill]['input'] += int(entry['input_tokens'])
-
-        if entry.get('output_tokens') and entry['output_tokens'] != 'null':
-            skill_tokens[skill]['output'] += int(entry['output_tokens'])
-
-        if entry.get('cache_read_tokens') and entry['cache_read_tokens'] != 'null':
-            cache_read = int(entry['cache_read_tokens'])
-            skill_tokens[skill]['cache_read'] += cache_read
-            total_cache_read += cache_read
-
-        if entry.get('cache_creation_tokens') and entry['cache_creation_tokens'] != 'null':
-            cache_create = int(entry['cache_creation_tokens'])
-            skill_tokens[skill]['cache_creation'] += cache_create
-            total_cache_creation += cache_create
-
-        # Track timing from prompt to completion
-        if entry.get('prompt_to_completion') and entry['prompt_to_completion'] > 0:
-            skill_tokens[skill]['total_time'] += entry['prompt_to_completion']
-            skill_tokens[skill]['time_count'] += 1
-
     write("| Skill | Invocations | Total Tokens | Avg Time | Cache Read | Cache Creation |")
     write("|-------|-------------|--------------|----------|------------|----------------|")
 
@@ -244,10 +392,10 @@ def generate_report(log_dir, project_dir=None):
         write(f"| Estimated API cost | ${total_tokens_all * 0.000003:.2f} |")
 
     # Timing summary
-    total_time = sum(e.get('prompt_to_completion', 0) or 0 for e in correlated)
-    timed_skills = [e for e in correlated if e.get('prompt_to_completion') and e['prompt_to_completion'] > 0]
-    if timed_skills:
-        avg_time = total_time // len(timed_skills)
+    total_time = summary['total_time']
+    timed_count = summary['timed_count']
+    if timed_count:
+        avg_time = total_time // timed_count
         write()
         write("## Timing Summary")
         write()
@@ -255,13 +403,13 @@ def generate_report(log_dir, project_dir=None):
         write(f"|--------|-------|")
         write(f"| Total time in skills | {format_duration(total_time)} |")
         write(f"| Average time per skill | {format_duration(avg_time)} |")
-        write(f"| Skills with timing data | {len(timed_skills)} of {len(correlated)} |")
+        write(f"| Skills with timing data | {timed_count} of {invocations} |")
 
     # Common prompts that trigger skills
     write()
     write("## Common Prompts")
     write()
-    prompt_counts = Counter(entry['prompt'][:100] for entry in correlated if entry['prompt'] != "Unknown prompt")
+    prompt_counts = summary['prompt_counts']
     shown = 0
     for prompt, count in prompt_counts.most_common(10):
         if count > 1 or shown < 5:
@@ -277,21 +425,20 @@ def generate_report(log_dir, project_dir=None):
     write()
     write("| Timestamp | Skill | Tokens | Time from Prompt | Prompt (truncated) |")
     write("|-----------|-------|--------|------------------|---------------------|")
-    for entry in sorted(correlated, key=lambda x: x['timestamp'], reverse=True)[:20]:
+    for entry in summary['recent']:
         tokens = format_tokens(entry.get('total_tokens'))
         prompt_short = entry['prompt'][:50].replace('|', '\\|').replace('\n', ' ')
         time_from_prompt = format_duration(entry.get('prompt_to_completion')) if entry.get('prompt_to_completion') else 'N/A'
         write(f"| {entry['timestamp']} | {entry['skill']} | {tokens} | {time_from_prompt} | {prompt_short}... |")
 
     # Session activity timing
-    prompt_timing = analyze_prompt_timing(prompts)
     if prompt_timing:
         write()
         write("## Session Activity Timeline")
         write()
         write("| Timestamp | Time Since Previous | Prompt (truncated) |")
         write("|-----------|---------------------|---------------------|")
-        for entry in prompt_timing[-15:]:  # Last 15 entries
+        for entry in prompt_timing[-RECENT_PROMPT_LIMIT:]:  # Last 15 entries
             time_since = format_duration(entry['seconds_since_prev'])
             prompt_short = entry['prompt'][:60].replace('|', '\\|').replace('\n', ' ')
             write(f"| {entry['timestamp']} | {time_since} | {prompt_short}... |")
@@ -332,7 +479,315 @@ def generate_report(log_dir, project_dir=None):
         else:
             write(f"❌ Low cache utilization ({cache_hit_ratio:.1f}% cache hits)")
 
-    return output.getvalue(), True
+    return output.getvalue()
+
+class SkillUsageRollup:
+    """Incremental, append-only rollup store for skill usage logs (SQLite).
+
+    Each log file has a byte-offset checkpoint, so every ingest reads only the
+    lines appended since the previous run. Completed skill invocations are
+    folded into per-day/per-skill aggregates (counts, durations, tokens);
+    prompts and start events are kept in indexed tables for correlation.
+    Reports are rendered from the aggregates without touching the logs.
+
+    If a log file shrinks or is replaced (different inode), the store is
+    rebuilt from scratch, since its old contribution cannot be subtracted.
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS checkpoints (
+            file TEXT PRIMARY KEY,
+            inode INTEGER NOT NULL,
+            offset INTEGER NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS prompts (
+            id INTEGER PRIMARY KEY,
+            session TEXT NOT NULL,
+            epoch INTEGER NOT NULL,
+            timestamp TEXT NOT NULL,
+            prompt TEXT NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS prompts_by_session ON prompts (session, epoch);
+        CREATE INDEX IF NOT EXISTS prompts_by_epoch ON prompts (epoch);
+        CREATE TABLE IF NOT EXISTS starts (
+            session TEXT NOT NULL,
+            skill TEXT NOT NULL,
+            epoch INTEGER NOT NULL,
+            PRIMARY KEY (session, skill, epoch)
+        );
+        CREATE TABLE IF NOT EXISTS skills (
+            id INTEGER PRIMARY KEY,
+            skill TEXT NOT NULL UNIQUE
+        );
+        CREATE TABLE IF NOT EXISTS daily_skill (
+            day TEXT NOT NULL,
+            skill TEXT NOT NULL,
+            invocations INTEGER NOT NULL DEFAULT 0,
+            input_tokens INTEGER NOT NULL DEFAULT 0,
+            output_tokens INTEGER NOT NULL DEFAULT 0,
+            total_tokens INTEGER NOT NULL DEFAULT 0,
+            cache_read_tokens INTEGER NOT NULL DEFAULT 0,
+            cache_creation_tokens INTEGER NOT NULL DEFAULT 0,
+            prompt_time INTEGER NOT NULL DEFAULT 0,
+            prompt_time_count INTEGER NOT NULL DEFAULT 0,
+            duration INTEGER NOT NULL DEFAULT 0,
+            duration_count INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (day, skill)
+        );
+        CREATE TABLE IF NOT EXISTS prompt_counts (
+            id INTEGER PRIMARY KEY,
+            prompt TEXT NOT NULL UNIQUE,
+            count INTEGER NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS recent (
+            id INTEGER PRIMARY KEY,
+            timestamp TEXT NOT NULL,
+            skill TEXT NOT NULL,
+            total_tokens INTEGER,
+            prompt_to_completion INTEGER,
+            prompt TEXT NOT NULL
+        );
+    """
+
+    TABLES = ('checkpoints', 'prompts', 'starts', 'skills', 'daily_skill', 'prompt_counts', 'recent')
+
+    def __init__(self, db_path):
+        self.db_path = Path(db_path)
+        self.conn = sqlite3.connect(str(self.db_path))
+        self.conn.executescript(self.SCHEMA)
+
+    def close(self):
+        self.conn.close()
+
+    def reset(self):
+        """Drop all ingested data and checkpoints."""
+        with self.conn:
+            for table in self.TABLES:
+                self.conn.execute(f"DELETE FROM {table}")
+
+    def ingest(self, log_dir):
+        """Ingest lines appended to the logs in log_dir since the last run.
+
+        Reads the files from log_files(), prompts before skill usage so
+        completions can be matched to their prompts. Returns the number of
+        new records.
+        """
+        prompt_files, skill_files = log_files(log_dir)
+
+        if any(self._was_rewritten(f) for f in prompt_files + skill_files):
+            self.reset()
+
+        count = 0
+        with self.conn:
+            for path in prompt_files:
+                count += self._ingest_file(path, self._add_prompt)
+            for path in skill_files:
+                count += self._ingest_file(path, self._add_skill_event)
+            self.conn.execute(
+                "DELETE FROM recent WHERE id NOT IN "
+                "(SELECT id FROM recent ORDER BY timestamp DESC, id ASC LIMIT ?)",
+                (RECENT_SKILL_LIMIT,)
+            )
+        return count
+
+    def _was_rewritten(self, path):
+        """True if a checkpointed file shrank or was replaced since the last ingest."""
+        row = self.conn.execute(
+            "SELECT inode, offset FROM checkpoints WHERE file = ?", (str(path.resolve()),)
+        ).fetchone()
+        if row is None:
+            return False
+        stat = path.stat()
+        return stat.st_ino != row[0] or stat.st_size < row[1]
+
+    def _ingest_file(self, path, handler):
+        """Feed complete lines after the file's checkpoint to handler and advance it."""
+        key = str(path.resolve())
+        row = self.conn.execute("SELECT offset FROM checkpoints WHERE file = ?", (key,)).fetchone()
+        offset = row[0] if row else 0
+
+        count = 0
+        with open(path, 'rb') as f:
+            f.seek(offset)
+            for raw in f:
+                if not raw.endswith(b'\n'):
+                    # Partial line still being written; pick it up next run
+                    break
+                offset += len(raw)
+                if raw.strip():
+                    handler(json.loads(raw))
+                    count += 1
+
+        self.conn.execute(
+            "INSERT OR REPLACE INTO checkpoints (file, inode, offset) VALUES (?, ?, ?)",
+            (key, os.stat(path).st_ino, offset)
+        )
+        return count
+
+    def _add_prompt(self, prompt):
+        self.conn.execute(
+            "INSERT INTO prompts (session, epoch, timestamp, prompt) VALUES (?, ?, ?, ?)",
+            (prompt['session'], int(prompt['epoch']), prompt['timestamp'],
+             prompt['prompt'][:PROMPT_SNIPPET_LENGTH])
+        )
+
+    def _find_prompt(self, session, epoch):
+        return self.conn.execute(
+            "SELECT epoch, prompt FROM prompts WHERE session = ? AND epoch <= ? "
+            "ORDER BY epoch DESC, id DESC LIMIT 1",
+            (session, epoch)
+        ).fetchone()
+
+    def _find_start(self, session, skill, epoch):
+        row = self.conn.execute(
+            "SELECT MAX(epoch) FROM starts WHERE session = ? AND skill = ? AND epoch <= ?",
+            (session, skill, epoch)
+        ).fetchone()
+        return row[0]
+
+    def _add_skill_event(self, event):
+        if event['event'] == 'start':
+            self.conn.execute(
+                "INSERT OR IGNORE INTO starts (session, skill, epoch) VALUES (?, ?, ?)",
+                (event['session'], event['skill'], int(event['epoch']))
+            )
+        elif event['event'] == 'end':
+            self._add_completion(correlate_end_event(event, self._find_prompt, self._find_start))
+
+    def _add_completion(self, entry):
+        """Fold one correlated completion into the aggregates."""
+        skill = entry['skill']
+        prompt_time = entry['prompt_to_completion'] or 0
+        timed = 1 if prompt_time > 0 else 0
+        duration = entry['duration']
+        has_duration = isinstance(duration, int) or (isinstance(duration, str) and duration.isdigit())
+
+        self.conn.execute("INSERT OR IGNORE INTO skills (skill) VALUES (?)", (skill,))
+        self.conn.execute(
+            """INSERT INTO daily_skill (day, skill, invocations, input_tokens, output_tokens,
+                   total_tokens, cache_read_tokens, cache_creation_tokens,
+                   prompt_time, prompt_time_count, duration, duration_count)
+               VALUES (?, ?, 1, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+               ON CONFLICT (day, skill) DO UPDATE SET
+                   invocations = invocations + 1,
+                   input_tokens = input_tokens + excluded.input_tokens,
+                   output_tokens = output_tokens + excluded.output_tokens,
+                   total_tokens = total_tokens + excluded.total_tokens,
+                   cache_read_tokens = cache_read_tokens + excluded.cache_read_tokens,
+                   cache_creation_tokens = cache_creation_tokens + excluded.cache_creation_tokens,
+                   prompt_time = prompt_time + excluded.prompt_time,
+                   prompt_time_count = prompt_time_count + excluded.prompt_time_count,
+                   duration = duration + excluded.duration,
+                   duration_count = duration_count + excluded.duration_count""",
+            (entry['timestamp'][:10], skill,
+             token_count(entry.get('input_tokens')), token_count(entry.get('output_tokens')),
+             token_count(entry.get('total_tokens')), token_count(entry.get('cache_read_tokens')),
+             token_count(entry.get('cache_creation_tokens')),
+             prompt_time if timed else 0, timed,
+             int(duration) if has_duration else 0, 1 if has_duration else 0)
+        )
+
+        if entry['prompt'] != "Unknown prompt":
+            self.conn.execute(
+                "INSERT INTO prompt_counts (prompt, count) VALUES (?, 1) "
+                "ON CONFLICT (prompt) DO UPDATE SET count = count + 1",
+                (entry['prompt'][:100],)
+            )
+
+        self.conn.execute(
+            "INSERT INTO recent (timestamp, skill, total_tokens, prompt_to_completion, prompt) "
+            "VALUES (?, ?, ?, ?, ?)",
+            (entry['timestamp'], skill, entry.get('total_tokens'),
+             entry['prompt_to_completion'], entry['prompt'])
+        )
+
+    def has_data(self):
+        """True if any skill event has been ingested."""
+        return self.conn.execute(
+            "SELECT EXISTS (SELECT 1 FROM skills) OR EXISTS (SELECT 1 FROM starts)"
+        ).fetchone()[0] == 1
+
+    def summary(self):
+        """Return a summary in the format produced by summarize_skill_usage."""
+        summary = {
+            'invocations': 0,
+            'skill_counts': Counter(),
+            'skill_tokens': defaultdict(_new_skill_totals),
+            'total_tokens': 0,
+            'total_cache_read': 0,
+            'total_cache_creation': 0,
+            'total_time': 0,
+            'timed_count': 0,
+            'prompt_counts': Counter(),
+            'recent': [],
+        }
+
+        # Skills in first-seen order, matching the streaming summary
+        rows = self.conn.execute(
+            """SELECT s.skill, SUM(d.invocations), SUM(d.input_tokens), SUM(d.output_tokens),
+                      SUM(d.total_tokens), SUM(d.cache_read_tokens), SUM(d.cache_creation_tokens),
+                      SUM(d.prompt_time), SUM(d.prompt_time_count)
+               FROM skills s JOIN daily_skill d ON d.skill = s.skill
+               GROUP BY s.id ORDER BY s.id"""
+        )
+        for skill, count, input_tok, output_tok, total, cache_read, cache_create, ptime, ptime_count in rows:
+            summary['skill_counts'][skill] = count
+            summary['skill_tokens'][skill].update({
+                'input': input_tok, 'output': output_tok, 'total': total,
+                'cache_read': cache_read, 'cache_creation': cache_create, 'count': count,
+                'total_time': ptime, 'time_count': ptime_count
+            })
+            summary['invocations'] += count
+            summary['total_tokens'] += total
+            summary['total_cache_read'] += cache_read
+            summary['total_cache_creation'] += cache_create
+            summary['total_time'] += ptime
+            summary['timed_count'] += ptime_count
+
+        # Only the top prompts are rendered; ties keep first-seen order
+        for prompt, count in self.conn.execute(
+                "SELECT prompt, count FROM prompt_counts ORDER BY count DESC, id ASC LIMIT 10"):
+            summary['prompt_counts'][prompt] = count
+
+        summary['recent'] = [
+            {'timestamp': ts, 'skill': skill, 'total_tokens': tokens,
+             'prompt_to_completion': ptc, 'prompt': prompt}
+            for ts, skill, tokens, ptc, prompt in self.conn.execute(
+                "SELECT timestamp, skill, total_tokens, prompt_to_completion, prompt "
+                "FROM recent ORDER BY timestamp DESC, id ASC")
+        ]
+        return summary
+
+    def prompt_timing(self, limit=RECENT_PROMPT_LIMIT):
+        """Return the last `limit` session timeline entries from the prompts table."""
+        rows = self.conn.execute(
+            "SELECT epoch, timestamp, prompt, session FROM prompts "
+            "ORDER BY epoch DESC, id DESC LIMIT ?",
+            (limit + 1,)
+        ).fetchall()
+        rows.reverse()
+        return analyze_prompt_timing([
+            {'epoch': epoch, 'timestamp': ts, 'prompt': prompt, 'session': session}
+            for epoch, ts, prompt, session in rows
+        ])
+
+def generate_rollup_report(log_dir, project_dir=None, db_path=None):
+    """Ingest newly appended log lines into the rollup store and render the report from it."""
+    log_dir = Path(log_dir)
+    rollup = SkillUsageRollup(db_path or log_dir / ROLLUP_DB_NAME)
+    try:
+        with phase('aggregate'):
+            rollup.ingest(log_dir)
+        if not rollup.has_data():
+            output = StringIO()
+            output.write("No skill usage data found yet.\n")
+            output.write(f"Logs will be created in: {log_dir}\n")
+            output.write("\nUse skills in Claude Code and they'll be tracked automatically.\n")
+            return output.getvalue(), False
+        with phase('render'):
+            return render_report(rollup.summary(), rollup.prompt_timing(), log_dir, project_dir), True
+    finally:
+        rollup.close()
 
 def generate_html_report(markdown_content, project_name="Skill Usage"):
     """Convert markdown report to styled HTML."""
@@ -565,21 +1020,31 @@ def generate_html_report(markdown_content, project_name="Skill Usage"):
     return html
 
 
-def analyze_skill_usage(log_dir, output_file=None, project_dir=None, output_format='markdown'):
-    """Analyze skill usage patterns and generate report."""
-    report, success = generate_report(log_dir, project_dir)
+def analyze_skill_usage(log_dir, output_file=None, project_dir=None, output_format='markdown',
+                        rollup_db=None):
+    """Analyze skill usage patterns and generate report.
+
+    If rollup_db is given, only newly appended log lines are ingested into that
+    rollup store and the report is rendered from its aggregates.
+    """
+    if rollup_db:
+        report, success = generate_rollup_report(log_dir, project_dir, rollup_db)
+    else:
+        report, success = generate_report(log_dir, project_dir)
 
     # Generate HTML if requested
     if output_format == 'html':
         project_name = project_dir.name if project_dir else 'Unknown'
-        html_report = generate_html_report(report, project_name)
+        with phase('render'):
+            html_report = generate_html_report(report, project_name)
 
         # Write HTML to file
         if output_file:
             output_path = Path(output_file)
             output_path.parent.mkdir(parents=True, exist_ok=True)
-            with open(output_path, 'w') as f:
+            with phase('write'), open(output_path, 'w') as f:
                 f.write(html_report)
+                count_write(f.tell())
             print(f"📄 HTML report saved to: {output_path}")
 
         return success
@@ -591,8 +1056,9 @@ def analyze_skill_usage(log_dir, output_file=None, project_dir=None, output_form
     if output_file and success:
         output_path = Path(output_file)
         output_path.parent.mkdir(parents=True, exist_ok=True)
-        with open(output_path, 'w') as f:
+        with phase('write'), open(output_path, 'w') as f:
             f.write(report)
+            count_write(f.tell())
         print(f"\n📄 Report saved to: {output_path}")
 
     return success
@@ -606,8 +1072,13 @@ def main():
     parser.add_argument('-o', '--output', help='Output file path')
     parser.add_argument('-p', '--project', help='Project directory (for context)')
     parser.add_argument('--html', action='store_true', help='Generate HTML report instead of markdown')
+    parser.add_argument('--rollup', action='store_true',
+                        help=f'Use the incremental rollup store (<log_dir>/{ROLLUP_DB_NAME})')
+    parser.add_argument('--rollup-db', help='Path to the rollup store (implies --rollup)')
+    add_profile_argument(parser)
 
     args = parser.parse_args()
+    start_profile('analyze-skills', args.profile)
 
     # Determine log directory
     if args.log_dir:
@@ -642,7 +1113,12 @@ def main():
         return
 
     output_format = 'html' if args.html else 'markdown'
-    analyze_skill_usage(log_dir, output_file, project_dir, output_format)
+    rollup_db = None
+    if args.rollup_db:
+        rollup_db = Path(args.rollup_db)
+    elif args.rollup:
+        rollup_db = log_dir / ROLLUP_DB_NAME
+    analyze_skill_usage(log_dir, output_file, project_dir, output_format, rollup_db)
 
 if __name__ == "__main__":
     main()